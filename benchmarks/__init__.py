@@ -0,0 +1,4 @@
+"""Performance benchmarks for dataset_curator.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
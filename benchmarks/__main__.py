@@ -0,0 +1,62 @@
+"""Command-line entry point: ``python -m benchmarks``."""
+
+import argparse
+import dataclasses
+import json
+import sys
+
+from benchmarks.corpus import PRESETS
+from benchmarks.runner import (
+    DEFAULT_REPEAT,
+    DEFAULT_TOLERANCE,
+    INDEXES,
+    STAGES,
+    compare,
+    format_report,
+    load_report,
+    run_benchmarks,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and return the process exit code.
+
+    Returns:
+        0 on success, 1 if a regression against the baseline was found.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    parser.add_argument("--size", type=int, help="override the number of examples")
+    parser.add_argument("--seed", type=int, help="override the corpus seed")
+    parser.add_argument("--stage", action="append", choices=list(STAGES), dest="stages")
+    parser.add_argument("--index", choices=sorted(INDEXES), default="prefilter")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--no-isolate", action="store_true", help="run stages in-process")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="compare against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    spec = PRESETS[args.preset]
+    if args.size is not None:
+        spec = dataclasses.replace(spec, size=args.size)
+    if args.seed is not None:
+        spec = dataclasses.replace(spec, seed=args.seed)
+
+    report = run_benchmarks(spec, args.stages, args.index, args.repeat, not args.no_isolate)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.baseline:
+        regressions = compare(report, load_report(args.baseline), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Deterministic synthetic corpus generator for benchmarks."""
+
+import math
+import random
+from dataclasses import dataclass
+
+from dataset_curator.models import RawExample
+
+VOCABULARY: tuple[str, ...] = (
+    "data", "model", "training", "python", "function", "network", "value", "system",
+    "learning", "example", "question", "answer", "explain", "describe", "compare",
+    "history", "science", "energy", "language", "memory", "process", "result", "simple",
+    "between", "difference", "why", "how", "what", "when", "the", "a", "of", "and", "in",
+)  # fmt: skip
+UNICODE_FRAGMENTS: tuple[str, ...] = (
+    "ＡＢＣ",  # fullwidth letters, changed by NFKC
+    "café",  # decomposed accent
+    "½",  # vulgar fraction
+    "数据集",  # CJK
+    "данные",  # Cyrillic
+    "\U0001f600",  # emoji
+    "ﬁle",  # ligature
+)
+NEWLINE_RUN: str = "\n\n\n\n"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a synthetic corpus.
+
+    Lengths follow a log-normal distribution around mean_length, clipped to
+    [min_length, max_length]. Duplicate rates are fractions of the corpus.
+    """
+
+    size: int = 2_000
+    mean_length: int = 300
+    length_sigma: float = 0.8
+    min_length: int = 5
+    max_length: int = 12_000
+    exact_duplicate_rate: float = 0.10
+    near_duplicate_rate: float = 0.05
+    unicode_rate: float = 0.10
+    newline_rate: float = 0.10
+    sources: tuple[str, ...] = ("wiki", "forum", "api")
+    seed: int = 0
+
+
+PRESETS: dict[str, CorpusSpec] = {
+    "tiny": CorpusSpec(size=200),
+    "small": CorpusSpec(size=1_000),
+    "medium": CorpusSpec(size=10_000),
+    "unicode": CorpusSpec(size=2_000, unicode_rate=0.9),
+    "newlines": CorpusSpec(size=2_000, newline_rate=0.9),
+    "long": CorpusSpec(size=500, mean_length=5_000),
+}
+
+
+def _sample_length(rng: random.Random, spec: CorpusSpec) -> int:
+    """Draw a text length from the clipped log-normal distribution."""
+    mu = math.log(spec.mean_length) - spec.length_sigma**2 / 2
+    length = int(rng.lognormvariate(mu, spec.length_sigma))
+    return max(spec.min_length, min(spec.max_length, length))
+
+
+def _fresh_text(rng: random.Random, spec: CorpusSpec) -> str:
+    """Generate a new random text of sampled length."""
+    target = _sample_length(rng, spec)
+    unicode_heavy = rng.random() < spec.unicode_rate
+    newline_heavy = rng.random() < spec.newline_rate
+    parts: list[str] = []
+    size = 0
+    while size < target:
+        roll = rng.random()
+        if unicode_heavy and roll < 0.2:
+            part = rng.choice(UNICODE_FRAGMENTS)
+        elif newline_heavy and roll > 0.9:
+            part = NEWLINE_RUN
+        else:
+            part = rng.choice(VOCABULARY)
+        parts.append(part)
+        size += len(part) + 1
+    return " ".join(parts)[:target]
+
+
+def _near_duplicate(rng: random.Random, text: str) -> str:
+    """Apply one small edit to text."""
+    if not text:
+        return "x"
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[i + 1 :]
+
+
+def generate_corpus(spec: CorpusSpec) -> list[RawExample]:
+    """Generate a reproducible corpus for a spec.
+
+    Exact duplicates repeat an earlier text with different casing and
+    surrounding whitespace (identical after normalization); near duplicates
+    change one character of an earlier text.
+
+    Args:
+        spec: Corpus shape; the same spec always yields the same corpus.
+
+    Returns:
+        Raw examples in generation order.
+    """
+    rng = random.Random(spec.seed)
+    texts: list[str] = []
+    examples: list[RawExample] = []
+    for _ in range(spec.size):
+        roll = rng.random()
+        if texts and roll < spec.exact_duplicate_rate:
+            text = f"  {rng.choice(texts).upper()} "
+        elif texts and roll < spec.exact_duplicate_rate + spec.near_duplicate_rate:
+            text = _near_duplicate(rng, rng.choice(texts))
+        else:
+            text = _fresh_text(rng, spec)
+            texts.append(text)
+        examples.append(RawExample(source=rng.choice(spec.sources), content=text))
+    return examples
@@ -0,0 +1,244 @@
+"""Time every pipeline stage on a synthetic corpus and compare against a baseline."""
+
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import Any
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from dataset_curator.cleaner import DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.similarity import (
+    DEFAULT_NGRAM_SIZE,
+    ExhaustiveIndex,
+    MinHashLSHIndex,
+    PrefilterIndex,
+    SimilarityIndex,
+)
+
+DEFAULT_REPEAT: int = 3
+DEFAULT_TOLERANCE: float = 0.20
+INDEXES: dict[str, Callable[[], SimilarityIndex]] = {
+    "exhaustive": ExhaustiveIndex,
+    "minhash": MinHashLSHIndex,
+    "prefilter": PrefilterIndex,
+    "prefilter-ngram": partial(PrefilterIndex, ngram_size=DEFAULT_NGRAM_SIZE),
+}
+# ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+RSS_UNIT: int = 1024 if sys.platform == "darwin" else 1
+
+# A stage gets the corpus and returns a zero-argument callable to time plus
+# the number of items it processes; setup work is done outside the timing.
+Stage = Callable[[list[RawExample], str], tuple[Callable[[], object], int]]
+
+
+@dataclass
+class StageResult:
+    """Measurements of one benchmarked stage."""
+
+    name: str
+    seconds: float
+    items: int
+    items_per_second: float
+    peak_rss_kb: int
+
+
+def _stage_clean_batch(raws: list[RawExample], index: str) -> tuple[Callable[[], object], int]:
+    cleaner = DataCleaner()
+    texts = [raw.content for raw in raws]
+    return lambda: cleaner.clean_batch(texts), len(texts)
+
+
+def _stage_to_chat_batch(raws: list[RawExample], index: str) -> tuple[Callable[[], object], int]:
+    converter = FormatConverter()
+    return lambda: converter.to_chat_batch(raws), len(raws)
+
+
+def _stage_deduplicate(raws: list[RawExample], index: str) -> tuple[Callable[[], object], int]:
+    examples = FormatConverter().to_chat_batch(raws)
+    deduplicator = Deduplicator(index_factory=INDEXES[index])
+    return lambda: deduplicator.deduplicate(examples), len(examples)
+
+
+def _stage_to_jsonl(raws: list[RawExample], index: str) -> tuple[Callable[[], object], int]:
+    converter = FormatConverter()
+    examples = converter.to_chat_batch(raws)
+    return lambda: converter.to_jsonl(examples), len(examples)
+
+
+def _stage_pipeline_run(raws: list[RawExample], index: str) -> tuple[Callable[[], object], int]:
+    pipeline = CurationPipeline(
+        DataCleaner(), FormatConverter(), Deduplicator(index_factory=INDEXES[index])
+    )
+    return lambda: pipeline.run(raws), len(raws)
+
+
+STAGES: dict[str, Stage] = {
+    "clean_batch": _stage_clean_batch,
+    "to_chat_batch": _stage_to_chat_batch,
+    "deduplicate": _stage_deduplicate,
+    "to_jsonl": _stage_to_jsonl,
+    "pipeline.run": _stage_pipeline_run,
+}
+
+
+def _measure(stage: str, raws: list[RawExample], index: str, repeat: int) -> tuple[float, int, int]:
+    """Run a stage repeat times, returning (best seconds, items, peak RSS in KiB)."""
+    func, items = STAGES[stage](raws, index)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // RSS_UNIT
+    return best, items, peak
+
+
+def _measure_in_child(
+    stage: str, raws: list[RawExample], index: str, repeat: int, conn: Any
+) -> None:
+    """Measure a stage in a forked process and send the result back."""
+    conn.send(_measure(stage, raws, index, repeat))
+    conn.close()
+
+
+def run_stage(
+    stage: str,
+    raws: list[RawExample],
+    index: str = "prefilter",
+    repeat: int = DEFAULT_REPEAT,
+    isolate: bool = True,
+) -> StageResult:
+    """Benchmark one stage.
+
+    Args:
+        stage: Stage name, a key of ``STAGES``.
+        raws: Corpus to process.
+        index: Similarity index used by deduplicating stages, a key of ``INDEXES``.
+        repeat: Number of timed runs; the fastest is reported.
+        isolate: Run the stage in a forked process so its peak RSS is not
+            inflated by earlier stages. Ignored where fork is unavailable.
+
+    Returns:
+        The stage measurements.
+
+    Raises:
+        ValueError: If stage or index is unknown, or repeat is less than 1.
+    """
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r}; expected one of {sorted(STAGES)}")
+    if index not in INDEXES:
+        raise ValueError(f"Unknown index {index!r}; expected one of {sorted(INDEXES)}")
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+
+    if isolate and "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_measure_in_child, args=(stage, raws, index, repeat, sender)
+        )
+        process.start()
+        sender.close()
+        seconds, items, peak = receiver.recv()
+        process.join()
+    else:
+        seconds, items, peak = _measure(stage, raws, index, repeat)
+    throughput = items / seconds if seconds > 0 else float("inf")
+    return StageResult(stage, seconds, items, throughput, peak)
+
+
+def run_benchmarks(
+    spec: CorpusSpec,
+    stages: list[str] | None = None,
+    index: str = "prefilter",
+    repeat: int = DEFAULT_REPEAT,
+    isolate: bool = True,
+) -> dict[str, Any]:
+    """Benchmark stages on the corpus described by spec.
+
+    Args:
+        spec: Synthetic corpus shape.
+        stages: Stage names to run; defaults to every stage.
+        index: Similarity index used by deduplicating stages.
+        repeat: Number of timed runs per stage.
+        isolate: Run each stage in its own forked process.
+
+    Returns:
+        A JSON-serializable report with the spec, environment, and stage results.
+    """
+    raws = generate_corpus(spec)
+    results = [run_stage(stage, raws, index, repeat, isolate) for stage in (stages or list(STAGES))]
+    return {
+        # Round-trip through JSON so reports compare equal to loaded baselines
+        "spec": json.loads(json.dumps(asdict(spec))),
+        "index": index,
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "cpu_count": os.cpu_count(),
+        "stages": {result.name: asdict(result) for result in results},
+    }
+
+
+def compare(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float = DEFAULT_TOLERANCE
+) -> list[str]:
+    """Find stages that regressed against a baseline report.
+
+    A stage regresses when its throughput drops, or its peak RSS grows, by
+    more than tolerance relative to the baseline. Stages missing from either
+    report are ignored.
+
+    Args:
+        report: Report from ``run_benchmarks``.
+        baseline: Earlier report to compare against.
+        tolerance: Allowed relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        One human-readable message per regression; empty if none.
+    """
+    regressions: list[str] = []
+    if report.get("spec") != baseline.get("spec") or report.get("index") != baseline.get("index"):
+        regressions.append("corpus spec or index differs from the baseline")
+    for name, result in report["stages"].items():
+        base = baseline.get("stages", {}).get(name)
+        if base is None:
+            continue
+        floor = base["items_per_second"] * (1 - tolerance)
+        if result["items_per_second"] < floor:
+            regressions.append(
+                f"{name}: {result['items_per_second']:.0f} items/s, "
+                f"baseline {base['items_per_second']:.0f} items/s"
+            )
+        ceiling = base["peak_rss_kb"] * (1 + tolerance)
+        if result["peak_rss_kb"] > ceiling:
+            regressions.append(
+                f"{name}: peak RSS {result['peak_rss_kb']} KiB, baseline {base['peak_rss_kb']} KiB"
+            )
+    return regressions
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Render a report as a plain-text table."""
+    lines = [f"{'stage':<16}{'seconds':>10}{'items':>9}{'items/s':>12}{'peak RSS KiB':>14}"]
+    for result in report["stages"].values():
+        lines.append(
+            f"{result['name']:<16}{result['seconds']:>10.4f}{result['items']:>9}"
+            f"{result['items_per_second']:>12.0f}{result['peak_rss_kb']:>14}"
+        )
+    return "\n".join(lines)
+
+
+def load_report(path: str) -> dict[str, Any]:
+    """Read a report previously written as JSON."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
@@ -1,20 +1,143 @@
-"""Dataset Curator."""
+"""Dataset Curator.
+
+Public names are imported lazily on first access, so ``import
+dataset_curator`` stays cheap for short-lived worker processes that only
+need part of the package.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __all__ = [
+    "BloomDedupSession",
+    "BloomFilter",
+    "CacheEntry",
+    "CharacterEntropyScorer",
     "ChatMessage",
+    "CleanCache",
     "CurationPipeline",
     "DataCleaner",
     "DatasetStats",
+    "DedupSession",
     "Deduplicator",
+    "DuplicateCluster",
+    "ExampleRecord",
+    "ExhaustiveIndex",
     "FormatConverter",
+    "HashingVectorizer",
+    "JsonlReader",
+    "JsonlWriteResult",
+    "LanguageScorer",
+    "LengthScorer",
+    "MetricsCollector",
+    "MinHashLSHIndex",
+    "NgramPerplexityScorer",
+    "PackedDataset",
+    "PipelineCheckpoint",
+    "PipelineObserver",
+    "PrefilterIndex",
+    "QualityScorer",
     "RawExample",
+    "RepetitionScorer",
+    "ScoringEngine",
+    "SemanticIndex",
+    "ShardResult",
+    "SimilarityIndex",
+    "StageMetrics",
+    "StatsAccumulator",
     "TrainingExample",
 ]
 
-from .cleaner import DataCleaner
-from .converter import FormatConverter
-from .deduplicator import Deduplicator
-from .models import ChatMessage, DatasetStats, RawExample, TrainingExample
-from .pipeline import CurationPipeline
+# Public name -> submodule defining it
+_EXPORTS: dict[str, str] = {
+    "BloomFilter": "bloom",
+    "CacheEntry": "cache",
+    "CleanCache": "cache",
+    "DataCleaner": "cleaner",
+    "FormatConverter": "converter",
+    "BloomDedupSession": "deduplicator",
+    "DedupSession": "deduplicator",
+    "Deduplicator": "deduplicator",
+    "ChatMessage": "models",
+    "DatasetStats": "models",
+    "DuplicateCluster": "models",
+    "JsonlWriteResult": "models",
+    "PipelineCheckpoint": "models",
+    "RawExample": "models",
+    "ShardResult": "models",
+    "StageMetrics": "models",
+    "TrainingExample": "models",
+    "MetricsCollector": "observer",
+    "PipelineObserver": "observer",
+    "PackedDataset": "packed",
+    "CurationPipeline": "pipeline",
+    "JsonlReader": "reader",
+    "ExampleRecord": "records",
+    "CharacterEntropyScorer": "scoring",
+    "LanguageScorer": "scoring",
+    "LengthScorer": "scoring",
+    "NgramPerplexityScorer": "scoring",
+    "QualityScorer": "scoring",
+    "RepetitionScorer": "scoring",
+    "ScoringEngine": "scoring",
+    "HashingVectorizer": "semantic",
+    "SemanticIndex": "semantic",
+    "ExhaustiveIndex": "similarity",
+    "MinHashLSHIndex": "similarity",
+    "PrefilterIndex": "similarity",
+    "SimilarityIndex": "similarity",
+    "StatsAccumulator": "stats",
+}
+
+if TYPE_CHECKING:
+    from .bloom import BloomFilter
+    from .cache import CacheEntry, CleanCache
+    from .cleaner import DataCleaner
+    from .converter import FormatConverter
+    from .deduplicator import BloomDedupSession, Deduplicator, DedupSession
+    from .models import (
+        ChatMessage,
+        DatasetStats,
+        DuplicateCluster,
+        JsonlWriteResult,
+        PipelineCheckpoint,
+        RawExample,
+        ShardResult,
+        StageMetrics,
+        TrainingExample,
+    )
+    from .observer import MetricsCollector, PipelineObserver
+    from .packed import PackedDataset
+    from .pipeline import CurationPipeline
+    from .reader import JsonlReader
+    from .records import ExampleRecord
+    from .scoring import (
+        CharacterEntropyScorer,
+        LanguageScorer,
+        LengthScorer,
+        NgramPerplexityScorer,
+        QualityScorer,
+        RepetitionScorer,
+        ScoringEngine,
+    )
+    from .semantic import HashingVectorizer, SemanticIndex
+    from .similarity import ExhaustiveIndex, MinHashLSHIndex, PrefilterIndex, SimilarityIndex
+    from .stats import StatsAccumulator
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining a public name on first access."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    # Cache so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the public names alongside the module's own attributes."""
+    return sorted(set(globals()) | set(__all__))
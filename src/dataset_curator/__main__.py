@@ -0,0 +1,8 @@
+"""Command-line entry point: ``python -m dataset_curator``."""
+
+import sys
+
+from dataset_curator.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""Helpers for replacing output files atomically."""
+
+import os
+import secrets
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Mode of files created by open(), before the umask is applied
+DEFAULT_FILE_MODE: int = 0o666
+# Names tried before giving up, as in tempfile
+TEMP_ATTEMPTS: int = 10_000
+_TEMP_FLAGS: int = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def create_temp_beside(path: str | os.PathLike[str]) -> tuple[int, str]:
+    """Create a temporary file in the directory of path, to be renamed onto it.
+
+    Unlike ``mkstemp``, which creates files readable only by their owner,
+    the file is created with ``DEFAULT_FILE_MODE`` and the kernel applies
+    the umask, so a file renamed into place is as readable as one written
+    directly. The process umask is never changed.
+
+    Args:
+        path: Final destination of the file.
+
+    Returns:
+        A tuple of (open file descriptor, temporary file path).
+
+    Raises:
+        FileExistsError: If no unused temporary name was found.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    for _ in range(TEMP_ATTEMPTS):
+        tmp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(tmp_path, _TEMP_FLAGS, DEFAULT_FILE_MODE), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No unused temporary file name for {path}")
+
+
+def fsync_directory(path: str | os.PathLike[str]) -> None:
+    """Make renames and removals of entries in a directory durable.
+
+    Directories cannot be opened on Windows, where this does nothing.
+
+    Args:
+        path: Directory to flush.
+    """
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_replace(path: str | os.PathLike[str]) -> Iterator[int]:
+    """Write a file through a temporary file that replaces path on success.
+
+    The body receives the descriptor of the temporary file and owns it,
+    typically passing it to ``open``. Once the body returns, the data is
+    flushed to disk, the file is renamed onto path and the rename is
+    flushed too, so after a crash path holds either the old or the new
+    contents in full. If the body raises, the temporary file is removed and
+    path is left untouched.
+
+    Args:
+        path: Final destination of the file.
+
+    Yields:
+        An open file descriptor of the temporary file.
+    """
+    target = os.fspath(path)
+    fd, tmp_path = create_temp_beside(target)
+    # The body usually closes fd, so a duplicate is kept for the final fsync
+    sync_fd = os.dup(fd)
+    try:
+        yield fd
+        os.fsync(sync_fd)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    finally:
+        os.close(sync_fd)
+    fsync_directory(os.path.dirname(os.path.abspath(target)))
@@ -0,0 +1,79 @@
+"""Helpers for opening optionally compressed files by suffix."""
+
+import bz2
+import gzip
+import lzma
+import os
+from typing import BinaryIO
+
+try:  # Python 3.14+
+    from compression import zstd  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - depends on interpreter version
+    zstd = None
+
+FILE_BUFFER_SIZE: int = 1 << 20
+AUTO_COMPRESSION: str = "auto"
+
+COMPRESSION_SUFFIXES: dict[str, str] = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".lzma": "xz",
+    ".zst": "zstd",
+}
+
+
+def infer_compression(path: str | os.PathLike[str]) -> str | None:
+    """Guess the compression format from a file name suffix.
+
+    Args:
+        path: File path.
+
+    Returns:
+        A compression name, or None for uncompressed files.
+    """
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(os.fspath(path))[1].lower())
+
+
+def resolve_compression(path: str | os.PathLike[str], compression: str | None) -> str | None:
+    """Resolve ``auto`` to the compression implied by the path suffix.
+
+    Args:
+        path: File path.
+        compression: Requested compression, ``auto``, or None.
+
+    Returns:
+        A compression name, or None for uncompressed files.
+    """
+    if compression == AUTO_COMPRESSION:
+        return infer_compression(path)
+    return compression
+
+
+def wrap_compressed(raw: BinaryIO, mode: str, compression: str | None) -> BinaryIO:
+    """Wrap a binary file object in a (de)compressing stream.
+
+    Args:
+        raw: Underlying binary file object.
+        mode: ``"rb"`` or ``"wb"``.
+        compression: One of ``gzip``, ``bz2``, ``xz``, ``zstd``, or None.
+
+    Returns:
+        A binary file object reading or writing uncompressed bytes.
+
+    Raises:
+        ValueError: If the compression format is unknown or unavailable.
+    """
+    if compression is None:
+        return raw
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode=mode, filename="")  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.BZ2File(raw, mode)  # type: ignore[return-value]
+    if compression == "xz":
+        return lzma.LZMAFile(raw, mode)  # type: ignore[return-value]
+    if compression == "zstd":
+        if zstd is None:
+            raise ValueError("zstd compression requires Python 3.14 or newer")
+        return zstd.ZstdFile(raw, mode)  # type: ignore[no-any-return]
+    raise ValueError(f"Unknown compression: {compression!r}")
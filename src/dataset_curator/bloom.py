@@ -0,0 +1,191 @@
+"""Fixed-size Bloom filter over content hashes for bounded-memory dedup.
+
+The filter answers "seen before?" for fixed-width digests with no false
+negatives and a tunable false-positive rate, in a bit array whose size is
+fixed up front. Saved filters are memory-mapped copy-on-write when loaded,
+so resuming costs no up-front read and the file is never modified.
+"""
+
+import math
+import mmap
+import os
+import struct
+
+from dataset_curator._atomic import atomic_replace
+
+MAGIC: bytes = b"DCBLOOM1"
+FORMAT_VERSION: int = 1
+DEFAULT_ERROR_RATE: float = 0.001
+# Each digest must supply two independent 64-bit hashes
+MIN_DIGEST_SIZE: int = 16
+
+# magic, version, hash count, bit count, items added, bits set
+_HEADER = struct.Struct("<8sIIQQQ")
+
+
+def optimal_parameters(capacity: int, error_rate: float) -> tuple[int, int]:
+    """Size a Bloom filter for a number of items and a false-positive rate.
+
+    Args:
+        capacity: Number of items the filter should hold at error_rate.
+        error_rate: Target false-positive probability once full.
+
+    Returns:
+        A tuple of (number of bits, number of hash functions).
+
+    Raises:
+        ValueError: If capacity is less than 1 or error_rate is not in (0, 1).
+    """
+    if capacity < 1:
+        raise ValueError(f"capacity must be at least 1, got {capacity}")
+    if not 0.0 < error_rate < 1.0:
+        raise ValueError(f"error_rate must be between 0 and 1, got {error_rate}")
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Bloom filter over fixed-width digests, e.g. ``content_hash`` values.
+
+    Bit positions come from double hashing of the digest's first two 64-bit
+    words, so no extra hashing is done per lookup. Memory is fixed at
+    construction; adding more than ``capacity`` items keeps working but
+    raises the false-positive rate, which ``false_positive_rate`` reports
+    from the actual fill ratio.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_ERROR_RATE) -> None:
+        """Allocate an empty filter.
+
+        Args:
+            capacity: Number of items the filter should hold at error_rate.
+            error_rate: Target false-positive probability once full.
+
+        Raises:
+            ValueError: If capacity is less than 1 or error_rate is not in (0, 1).
+        """
+        self.num_bits, self.num_hashes = optimal_parameters(capacity, error_rate)
+        self.count = 0
+        self.bits_set = 0
+        self._bits: bytearray | memoryview = bytearray((self.num_bits + 7) // 8)
+        # Map the bits are read from when loaded, released by close()
+        self._mmap: mmap.mmap | None = None
+
+    @property
+    def size_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self._bits)
+
+    def false_positive_rate(self) -> float:
+        """Probability that an unseen digest is reported as present right now."""
+        return (self.bits_set / self.num_bits) ** self.num_hashes
+
+    def _positions(self, digest: bytes) -> list[int]:
+        """Compute the bit positions of a digest."""
+        if len(digest) < MIN_DIGEST_SIZE:
+            raise ValueError(f"digest must be at least {MIN_DIGEST_SIZE} bytes")
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def __contains__(self, digest: object) -> bool:
+        """Check whether digest may have been added (no false negatives)."""
+        bits = self._bits
+        return all(
+            bits[p >> 3] & (1 << (p & 7))
+            for p in self._positions(digest)  # type: ignore[arg-type]
+        )
+
+    def add(self, digest: bytes) -> bool:
+        """Add a digest.
+
+        Args:
+            digest: Fixed-width hash of at least ``MIN_DIGEST_SIZE`` bytes.
+
+        Returns:
+            True if the digest may already have been present, False if it
+            was definitely new.
+        """
+        bits = self._bits
+        present = True
+        for p in self._positions(digest):
+            byte, mask = p >> 3, 1 << (p & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                self.bits_set += 1
+                present = False
+        if not present:
+            self.count += 1
+        return present
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Write the filter to a file, atomically.
+
+        Args:
+            path: Destination file; may be the file the filter was loaded from.
+        """
+        with atomic_replace(path) as fd, open(fd, "wb") as out:
+            out.write(
+                _HEADER.pack(
+                    MAGIC,
+                    FORMAT_VERSION,
+                    self.num_hashes,
+                    self.num_bits,
+                    self.count,
+                    self.bits_set,
+                )
+            )
+            out.write(self._bits)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "BloomFilter":
+        """Open a saved filter.
+
+        The bit array is mapped copy-on-write: pages are read on demand and
+        later additions stay private to this process until ``save``.
+
+        Args:
+            path: File written by ``save``.
+
+        Returns:
+            The filter, ready for lookups and additions.
+
+        Raises:
+            ValueError: If the file is not a saved Bloom filter.
+        """
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{os.fspath(path)}: not a Bloom filter file")
+            header = _HEADER.unpack(f.read(_HEADER.size))
+            magic, version, num_hashes, num_bits, count, bits_set = header
+            if magic != MAGIC:
+                raise ValueError(f"{os.fspath(path)}: not a Bloom filter file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{os.fspath(path)}: unsupported Bloom filter version {version}")
+            if size != _HEADER.size + (num_bits + 7) // 8:
+                raise ValueError(f"{os.fspath(path)}: truncated Bloom filter file")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        bloom = cls.__new__(cls)
+        bloom.num_bits = num_bits
+        bloom.num_hashes = num_hashes
+        bloom.count = count
+        bloom.bits_set = bits_set
+        bloom._bits = memoryview(mapped)[_HEADER.size :]
+        bloom._mmap = mapped
+        return bloom
+
+    def close(self) -> None:
+        """Release the memory map of a loaded filter; it must not be used afterwards.
+
+        Closing a filter that was not loaded, or closing it twice, does nothing.
+        """
+        mapped, self._mmap = self._mmap, None
+        if mapped is None:
+            return
+        bits, self._bits = self._bits, bytearray()
+        if isinstance(bits, memoryview):
+            bits.release()
+        mapped.close()
@@ -0,0 +1,184 @@
+"""Persistent content-addressed cache of per-example cleaning and dedup results."""
+
+import hashlib
+import os
+import sqlite3
+from collections.abc import Iterable
+from typing import NamedTuple
+
+DEFAULT_MAX_ENTRIES: int = 1_000_000
+CACHE_KEY_SIZE: int = 16
+SQLITE_MAX_VARIABLES: int = 900
+# Pending last-used updates written in one transaction once this many accumulate
+LRU_FLUSH_SIZE: int = 10_000
+# Stored in PRAGMA user_version; a database with another version is rebuilt
+SCHEMA_VERSION: int = 2
+
+
+class CacheEntry(NamedTuple):
+    """Cached result of preparing one raw text; cleaned is empty for invalid texts.
+
+    fingerprint is the ``content_hash`` of the normalized text and sketch its
+    ``SimilarityIndex.sketch`` (empty for indexes with nothing to cache).
+    """
+
+    cleaned: str
+    valid: bool
+    fingerprint: bytes
+    sketch: bytes = b""
+
+
+class CleanCache:
+    """SQLite-backed cache of cleaned text, validity, and dedup fingerprints.
+
+    Entries are keyed by a hash of the raw content together with a namespace
+    describing the cleaner, deduplicator, and similarity index
+    configuration, so changing the configuration never serves stale
+    results. Once the cache holds more than max_entries rows, the least
+    recently used ones are evicted.
+
+    Lookups do not write: the last-used times of hits are batched in memory
+    and written with the next ``put_many`` (or ``flush``), and the row count
+    checked for eviction is tracked in memory rather than counted per write.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        """Open (or create) a cache database.
+
+        Args:
+            path: SQLite database file.
+            max_entries: Maximum number of entries kept after each write.
+
+        Raises:
+            ValueError: If max_entries is less than 1.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # Entries are cheap to recompute, so older layouts are dropped
+            self._conn.execute("DROP TABLE IF EXISTS entries")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key BLOB PRIMARY KEY,"
+            " cleaned TEXT NOT NULL,"
+            " valid INTEGER NOT NULL,"
+            " fingerprint BLOB NOT NULL,"
+            " sketch BLOB NOT NULL,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+        row = self._conn.execute("SELECT MAX(last_used), COUNT(*) FROM entries").fetchone()
+        self._clock = row[0] or 0
+        self._count: int = row[1]
+        self._touched: dict[bytes, int] = {}
+
+    @staticmethod
+    def key(namespace: str, content: str) -> bytes:
+        """Compute the cache key of a raw text.
+
+        Args:
+            namespace: Description of the configuration that produced the entry.
+            content: Raw text content.
+
+        Returns:
+            A BLAKE2b digest of the namespace and content.
+        """
+        digest = hashlib.blake2b(namespace.encode(), digest_size=CACHE_KEY_SIZE)
+        digest.update(b"\0")
+        digest.update(content.encode())
+        return digest.digest()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_many(self, keys: list[bytes]) -> list[CacheEntry | None]:
+        """Look up several keys and mark the found entries as recently used.
+
+        Args:
+            keys: Cache keys.
+
+        Returns:
+            One entry per key, or None where the key is not cached.
+        """
+        found: dict[bytes, CacheEntry] = {}
+        for start in range(0, len(keys), SQLITE_MAX_VARIABLES):
+            part = keys[start : start + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(part))
+            query = (
+                "SELECT key, cleaned, valid, fingerprint, sketch FROM entries"
+                f" WHERE key IN ({placeholders})"
+            )
+            rows = self._conn.execute(query, part)
+            for key, cleaned, valid, fingerprint, sketch in rows:
+                found[key] = CacheEntry(cleaned, bool(valid), fingerprint, sketch)
+        if found:
+            self._clock += 1
+            self._touched.update(dict.fromkeys(found, self._clock))
+            if len(self._touched) >= LRU_FLUSH_SIZE:
+                self.flush()
+        entries = [found.get(key) for key in keys]
+        misses = entries.count(None)
+        self.hits += len(keys) - misses
+        self.misses += misses
+        return entries
+
+    def _write_touched(self) -> None:
+        """Write pending last-used times inside the current transaction."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(clock, key) for key, clock in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def flush(self) -> None:
+        """Write the last-used times of recent hits to the database."""
+        with self._conn:
+            self._write_touched()
+
+    def put_many(self, items: Iterable[tuple[bytes, CacheEntry]]) -> None:
+        """Store entries, then evict the least recently used beyond max_entries.
+
+        Args:
+            items: Pairs of (key, entry).
+        """
+        self._clock += 1
+        rows = [
+            (key, e.cleaned, int(e.valid), e.fingerprint, e.sketch, self._clock) for key, e in items
+        ]
+        with self._conn:
+            self._write_touched()
+            changes = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO entries VALUES (?, ?, ?, ?, ?, ?)", rows)
+            inserted = self._conn.total_changes - changes
+            if inserted < len(rows):
+                # Some keys were already cached: overwrite them in place
+                self._conn.executemany(
+                    "UPDATE entries SET cleaned = ?, valid = ?, fingerprint = ?, sketch = ?,"
+                    " last_used = ? WHERE key = ?",
+                    [(*row[1:], row[0]) for row in rows],
+                )
+            self._count += inserted
+            excess = self._count - self.max_entries
+            if excess > 0:
+                deleted = self._conn.execute(
+                    "DELETE FROM entries WHERE key IN"
+                    " (SELECT key FROM entries ORDER BY last_used LIMIT ?)",
+                    (excess,),
+                ).rowcount
+                self._count -= deleted
+
+    def close(self) -> None:
+        """Write pending last-used times and close the database connection."""
+        self.flush()
+        self._conn.close()
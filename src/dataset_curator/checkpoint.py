@@ -0,0 +1,67 @@
+"""On-disk checkpoints for resuming long pipeline runs.
+
+A checkpoint directory holds ``checkpoint.json``, which records how far a run
+got, and the dedup session saved at that point. Each checkpoint saves the
+session to a new file and flushes it to disk before the JSON file is
+atomically replaced, and only then removes the previous session file, so a
+crash at any moment leaves a checkpoint whose files agree with each other.
+"""
+
+import json
+import os
+
+from dataset_curator._atomic import atomic_replace
+from dataset_curator.models import PipelineCheckpoint
+
+CHECKPOINT_NAME: str = "checkpoint.json"
+CHECKPOINT_VERSION: int = 1
+
+
+def dedup_file_name(generation: int) -> str:
+    """Name the dedup session file saved by a checkpoint.
+
+    Args:
+        generation: Number of the checkpoint, starting at 1.
+
+    Returns:
+        A file name such as ``dedup-000001.bin``.
+    """
+    return f"dedup-{generation:06d}.bin"
+
+
+def load_checkpoint(directory: str | os.PathLike[str]) -> PipelineCheckpoint | None:
+    """Read the latest checkpoint of a run.
+
+    Args:
+        directory: Checkpoint directory.
+
+    Returns:
+        The checkpoint, or None if the directory holds none.
+
+    Raises:
+        ValueError: If the checkpoint file has an unsupported version.
+    """
+    path = os.path.join(directory, CHECKPOINT_NAME)
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    version = data.pop("version", None)
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: unsupported checkpoint version {version}")
+    return PipelineCheckpoint.model_validate(data)
+
+
+def save_checkpoint(directory: str | os.PathLike[str], checkpoint: PipelineCheckpoint) -> None:
+    """Write a checkpoint atomically, replacing the previous one.
+
+    Args:
+        directory: Checkpoint directory; must exist.
+        checkpoint: Progress to record. Its dedup file must already be saved
+            durably, e.g. through ``atomic_replace``.
+    """
+    path = os.path.join(directory, CHECKPOINT_NAME)
+    with atomic_replace(path) as fd, open(fd, "w", encoding="utf-8") as f:
+        json.dump({"version": CHECKPOINT_VERSION, **checkpoint.model_dump()}, f, indent=2)
+        f.write("\n")
@@ -2,10 +2,23 @@
 
 import re
 import unicodedata
+from collections.abc import Iterable
 
 DEFAULT_MIN_LENGTH: int = 10
 DEFAULT_MAX_LENGTH: int = 10000
 MAX_CONSECUTIVE_NEWLINES: int = 3
+NEWLINE_RUN_PATTERN: re.Pattern[str] = re.compile(rf"\n{{{MAX_CONSECUTIVE_NEWLINES},}}")
+# NFKC composes at most this many code points into one (e.g. U+1F82)
+NFKC_MAX_CONTRACTION: int = 4
+
+_NEWLINE_RUN = "\n" * MAX_CONSECUTIVE_NEWLINES
+
+
+def _collapse_newlines(text: str) -> str:
+    """Replace runs of MAX_CONSECUTIVE_NEWLINES or more newlines with a blank line."""
+    if _NEWLINE_RUN in text:
+        return NEWLINE_RUN_PATTERN.sub("\n\n", text)
+    return text
 
 
 class DataCleaner:
@@ -20,10 +33,10 @@ class DataCleaner:
         Returns:
             Cleaned and normalized text.
         """
-        text = unicodedata.normalize("NFKC", text)
-        text = text.strip()
-        text = re.sub(rf"\n{{{MAX_CONSECUTIVE_NEWLINES},}}", "\n\n", text)
-        return text
+        # ASCII text is already in NFKC form
+        if not text.isascii():
+            text = unicodedata.normalize("NFKC", text)
+        return _collapse_newlines(text.strip())
 
     def is_valid(
         self,
@@ -43,6 +56,40 @@ class DataCleaner:
         """
         return min_length <= len(text) <= max_length
 
+    def clean_and_validate(
+        self,
+        texts: Iterable[str],
+        min_length: int = DEFAULT_MIN_LENGTH,
+        max_length: int = DEFAULT_MAX_LENGTH,
+    ) -> list[str | None]:
+        """Clean and validate texts in a single pass.
+
+        Equivalent to ``clean`` followed by ``is_valid`` for each text, but
+        non-ASCII texts that are still far longer than max_length after
+        stripping are rejected without being normalized.
+
+        Args:
+            texts: Raw input texts.
+            min_length: Minimum acceptable character count after cleaning.
+            max_length: Maximum acceptable character count after cleaning.
+
+        Returns:
+            One entry per text: the cleaned text if it is valid, otherwise None.
+        """
+        # Post-normalization stripping may drop one more character per end
+        limit = NFKC_MAX_CONTRACTION * (max_length + 2)
+        results: list[str | None] = []
+        for text in texts:
+            if text.isascii():
+                cleaned = _collapse_newlines(text.strip())
+            elif len(text) > limit and len(_collapse_newlines(text.strip())) > limit:
+                results.append(None)
+                continue
+            else:
+                cleaned = _collapse_newlines(unicodedata.normalize("NFKC", text).strip())
+            results.append(cleaned if min_length <= len(cleaned) <= max_length else None)
+        return results
+
     def clean_batch(self, texts: list[str]) -> list[str]:
         """Clean a batch of texts, discarding any that fail validation.
 
@@ -52,9 +99,4 @@ class DataCleaner:
         Returns:
             List of cleaned, valid text strings.
         """
-        results: list[str] = []
-        for text in texts:
-            cleaned = self.clean(text)
-            if self.is_valid(cleaned):
-                results.append(cleaned)
-        return results
+        return [cleaned for cleaned in self.clean_and_validate(texts) if cleaned is not None]
@@ -0,0 +1,361 @@
+"""Command-line interface: curate JSONL files as parallel shards.
+
+Every input file is curated independently into its own output file, so
+shards run in parallel processes and a run can resume after interruption:
+a manifest in the output directory records each finished shard, and shards
+whose input has not changed since are skipped on the next run. Near
+duplicates are only removed within a shard.
+
+Example::
+
+    dataset-curator "raw/*.jsonl.gz" -o curated/ --workers 8 --system-prompt "Be concise."
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from time import perf_counter
+from typing import Any
+
+from dataset_curator._atomic import atomic_replace
+from dataset_curator.bloom import DEFAULT_ERROR_RATE
+from dataset_curator.cleaner import DEFAULT_MAX_LENGTH, DEFAULT_MIN_LENGTH, DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import DEFAULT_SIMILARITY_THRESHOLD, Deduplicator
+from dataset_curator.models import ShardResult
+from dataset_curator.observer import MetricsCollector
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.reader import JsonlReader
+from dataset_curator.scoring import SCORERS, ScoringEngine, create_scorer
+from dataset_curator.stats import StatsAccumulator
+
+MANIFEST_NAME: str = "manifest.json"
+MANIFEST_VERSION: int = 1
+COMPRESSION_CHOICES: tuple[str, ...] = ("gzip", "bz2", "xz", "zstd")
+OUTPUT_SUFFIXES: dict[str | None, str] = {
+    None: ".jsonl",
+    "gzip": ".jsonl.gz",
+    "bz2": ".jsonl.bz2",
+    "xz": ".jsonl.xz",
+    "zstd": ".jsonl.zst",
+}
+OUTPUT_ID_LENGTH: int = 12
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[str]:
+    """Expand glob patterns into a sorted list of unique file paths.
+
+    Args:
+        patterns: Glob patterns or plain paths; ``**`` matches recursively.
+
+    Returns:
+        Matching regular files, sorted.
+
+    Raises:
+        ValueError: If a pattern matches no file.
+    """
+    paths: set[str] = set()
+    for pattern in patterns:
+        matches = [path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)]
+        if not matches:
+            raise ValueError(f"No input files match {pattern!r}")
+        paths.update(os.path.normpath(path) for path in matches)
+    return sorted(paths)
+
+
+def shard_output_name(input_path: str, compression: str | None) -> str:
+    """Name the output file of a shard after its input.
+
+    The name keeps the input's base name and adds a digest of its absolute
+    path, so inputs with the same base name in different directories, and
+    inputs added between resumed runs, never share an output file.
+
+    Args:
+        input_path: Path of the input file.
+        compression: Compression of the output, or None.
+
+    Returns:
+        A file name such as ``part-0-1a2b3c4d5e6f.jsonl.gz``.
+    """
+    stem = os.path.basename(input_path)
+    for suffix in (*OUTPUT_SUFFIXES.values(), ".json"):
+        if stem.endswith(suffix):
+            stem = stem[: -len(suffix)]
+            break
+    digest = hashlib.sha256(os.path.abspath(input_path).encode()).hexdigest()
+    return f"{stem}-{digest[:OUTPUT_ID_LENGTH]}{OUTPUT_SUFFIXES[compression]}"
+
+
+def curate_shard(input_path: str, output_path: str, options: dict[str, Any]) -> ShardResult:
+    """Curate one JSONL file into another, streaming records through the pipeline.
+
+    Module-level so it can be pickled and run in worker processes. The
+    output file is written atomically, so an interrupted shard leaves no
+    partial output behind.
+
+    Args:
+        input_path: Raw JSONL input.
+        output_path: Destination of the curated JSONL.
+        options: Curation options, as recorded in the manifest.
+
+    Returns:
+        The shard's statistics and per-stage metrics.
+    """
+    started = perf_counter()
+    status = os.stat(input_path)
+    reader = JsonlReader(
+        source_field=options["source_field"], content_field=options["content_field"]
+    )
+    converter = FormatConverter()
+    collector = MetricsCollector()
+    pipeline = CurationPipeline(
+        DataCleaner(),
+        converter,
+        Deduplicator(
+            threshold=options["threshold"],
+            bloom_capacity=options["bloom_capacity"],
+            bloom_error_rate=options["bloom_error_rate"],
+        ),
+        observer=collector,
+        min_length=options["min_length"],
+        max_length=options["max_length"],
+        scorer=ScoringEngine(
+            [create_scorer(name) for name in options["scorers"]], options["min_quality"]
+        ),
+    )
+    stats = StatsAccumulator()
+    curated = pipeline.run_stream(reader.read(input_path), options["system_prompt"], stats)
+    converter.write_jsonl(curated, output_path, options["compression"])
+    return ShardResult(
+        input=input_path,
+        output=output_path,
+        input_size=status.st_size,
+        input_mtime_ns=status.st_mtime_ns,
+        seconds=perf_counter() - started,
+        stats=stats.to_stats(),
+        stages=list(collector.stages.values()),
+    )
+
+
+def load_manifest(path: str, options: dict[str, Any]) -> dict[str, ShardResult]:
+    """Read the shards completed by an earlier run with the same options.
+
+    Args:
+        path: Manifest file.
+        options: Options of the current run.
+
+    Returns:
+        Completed shards by input path; empty if the manifest is missing or
+        was written with different options.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("options") != options:
+        return {}
+    return {
+        shard["input"]: ShardResult.model_validate(shard) for shard in manifest.get("shards", [])
+    }
+
+
+def save_manifest(path: str, options: dict[str, Any], shards: Iterable[ShardResult]) -> None:
+    """Write the manifest atomically, so an interruption never corrupts it.
+
+    Args:
+        path: Manifest file.
+        options: Options of the current run.
+        shards: Every completed shard.
+    """
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "options": options,
+        "shards": [shard.model_dump() for shard in sorted(shards, key=lambda s: s.input)],
+    }
+    with atomic_replace(path) as fd, open(fd, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+def _is_current(shard: ShardResult) -> bool:
+    """Check that a completed shard's input is unchanged and its output still exists."""
+    try:
+        status = os.stat(shard.input)
+    except FileNotFoundError:
+        return False
+    return (
+        status.st_size == shard.input_size
+        and status.st_mtime_ns == shard.input_mtime_ns
+        and os.path.exists(shard.output)
+    )
+
+
+def run_shards(
+    jobs: Sequence[tuple[str, str]],
+    options: dict[str, Any],
+    workers: int,
+    on_done: Callable[[ShardResult], None],
+) -> None:
+    """Curate shards, in parallel processes when workers is above 1.
+
+    Args:
+        jobs: Pairs of (input path, output path).
+        options: Curation options passed to ``curate_shard``.
+        workers: Number of shards curated at once.
+        on_done: Called in this process as each shard finishes.
+    """
+    if workers == 1:
+        for input_path, output_path in jobs:
+            on_done(curate_shard(input_path, output_path, options))
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures: list[Future[ShardResult]] = [
+            pool.submit(curate_shard, input_path, output_path, options)
+            for input_path, output_path in jobs
+        ]
+        for future in as_completed(futures):
+            on_done(future.result())
+    finally:
+        # On failure or interruption, drop queued shards but let running ones finish
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser of the ``dataset-curator`` command."""
+    parser = argparse.ArgumentParser(
+        prog="dataset-curator",
+        description="Clean, convert, deduplicate, and score JSONL files in parallel shards.",
+    )
+    parser.add_argument("inputs", nargs="+", help="input JSONL files or glob patterns")
+    parser.add_argument("-o", "--output-dir", required=True, help="directory for curated shards")
+    parser.add_argument("--system-prompt", default="", help="system message for every example")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_SIMILARITY_THRESHOLD,
+        help="similarity at or above which examples are duplicates",
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        help="exact dedup only, in fixed memory: Bloom filter sized for this many examples",
+    )
+    parser.add_argument(
+        "--bloom-error-rate",
+        type=float,
+        default=DEFAULT_ERROR_RATE,
+        help="false-positive rate of the Bloom filter at capacity",
+    )
+    parser.add_argument("--min-length", type=int, default=DEFAULT_MIN_LENGTH)
+    parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH)
+    parser.add_argument(
+        "--scorer",
+        action="append",
+        choices=sorted(SCORERS),
+        dest="scorers",
+        help="quality scorer to apply; repeat to combine (default: length)",
+    )
+    parser.add_argument(
+        "--min-quality",
+        type=float,
+        default=0.0,
+        help="drop examples whose combined quality score is below this floor",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="number of shards curated in parallel"
+    )
+    parser.add_argument("--content-field", default="content", help="input key of the text")
+    parser.add_argument("--source-field", default="source", help="input key of the source")
+    parser.add_argument(
+        "--compression", choices=COMPRESSION_CHOICES, help="compression of the output shards"
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="ignore the manifest and curate every shard"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``dataset-curator`` command and return the process exit code."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error(f"--workers must be at least 1, got {args.workers}")
+    if not 0.0 < args.threshold <= 1.0:
+        parser.error(f"--threshold must be in (0, 1], got {args.threshold}")
+    if args.min_length > args.max_length:
+        parser.error("--min-length must not exceed --max-length")
+    if args.bloom_capacity is not None and args.bloom_capacity < 1:
+        parser.error("--bloom-capacity must be at least 1")
+    if not 0.0 < args.bloom_error_rate < 1.0:
+        parser.error("--bloom-error-rate must be between 0 and 1")
+    if not 0.0 <= args.min_quality <= 1.0:
+        parser.error("--min-quality must be between 0 and 1")
+    try:
+        inputs = expand_inputs(args.inputs)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    options = {
+        "system_prompt": args.system_prompt,
+        "threshold": args.threshold,
+        "bloom_capacity": args.bloom_capacity,
+        "bloom_error_rate": args.bloom_error_rate,
+        "min_length": args.min_length,
+        "max_length": args.max_length,
+        "scorers": sorted(set(args.scorers or ["length"])),
+        "min_quality": args.min_quality,
+        "content_field": args.content_field,
+        "source_field": args.source_field,
+        "compression": args.compression,
+    }
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest_path = os.path.join(args.output_dir, MANIFEST_NAME)
+    completed = {} if args.restart else load_manifest(manifest_path, options)
+    completed = {path: shard for path, shard in completed.items() if _is_current(shard)}
+
+    jobs = [
+        (path, os.path.join(args.output_dir, shard_output_name(path, args.compression)))
+        for path in inputs
+        if path not in completed
+    ]
+    skipped = len(inputs) - len(jobs)
+    collector = MetricsCollector()
+
+    def on_done(shard: ShardResult) -> None:
+        completed[shard.input] = shard
+        save_manifest(manifest_path, options, completed.values())
+        for metrics in shard.stages:
+            collector.on_stage(metrics)
+        print(
+            f"{shard.input} -> {shard.output}: {shard.stats.total_examples} examples "
+            f"in {shard.seconds:.2f}s",
+            file=sys.stderr,
+        )
+
+    started = perf_counter()
+    run_shards(jobs, options, args.workers, on_done)
+    elapsed = perf_counter() - started
+
+    totals = StatsAccumulator()
+    # The manifest may also list shards of inputs not named in this run
+    for path in inputs:
+        totals.merge(completed[path].stats)
+    print(totals.to_stats().model_dump_json(indent=2))
+    print(collector.report(), file=sys.stderr)
+    read = collector.stages["clean"].items_in
+    rate = read / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{len(jobs)} shards curated, {skipped} skipped; "
+        f"{read} examples read in {elapsed:.2f}s ({rate:.0f} examples/s)",
+        file=sys.stderr,
+    )
+    return 0
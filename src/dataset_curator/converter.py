@@ -1,8 +1,23 @@
 """Format conversion utilities for dataset curation."""
 
+import io
 import json
+import os
+from collections.abc import Iterable, Iterator
+from typing import IO
 
-from dataset_curator.models import ChatMessage, RawExample, TrainingExample
+from pydantic import ValidationError
+
+from dataset_curator._atomic import atomic_replace
+from dataset_curator._compression import (
+    AUTO_COMPRESSION,
+    FILE_BUFFER_SIZE,
+    resolve_compression,
+    wrap_compressed,
+)
+from dataset_curator.models import ChatMessage, JsonlWriteResult, RawExample, TrainingExample
+from dataset_curator.packed import PackedDataset, write_packed
+from dataset_curator.records import ExampleRecord, RecordBatch
 
 
 class FormatConverter:
@@ -25,6 +40,38 @@ class FormatConverter:
         messages.append(ChatMessage(role="assistant", content=""))
         return TrainingExample(messages=messages, source=raw.source)
 
+    def to_record(self, raw: RawExample, system_prompt: str = "") -> ExampleRecord:
+        """Convert a raw example into the pipeline's compact internal record.
+
+        The record is equivalent to ``to_chat_format`` but skips building and
+        validating pydantic models; use ``ExampleRecord.to_training_example``
+        to obtain the public form.
+
+        Args:
+            raw: The raw example to convert.
+            system_prompt: Optional system message prepended to the conversation.
+
+        Returns:
+            A slotted record holding the source, user content, and system prompt.
+        """
+        return ExampleRecord(source=raw.source, content=raw.content, system_prompt=system_prompt)
+
+    def to_record_batch(self, raws: list[RawExample], system_prompt: str = "") -> RecordBatch:
+        """Convert raw examples into a column-oriented record batch.
+
+        Args:
+            raws: List of raw examples.
+            system_prompt: Optional system message shared by every row.
+
+        Returns:
+            A batch with source and content columns.
+        """
+        return RecordBatch(
+            sources=[raw.source for raw in raws],
+            contents=[raw.content for raw in raws],
+            system_prompt=system_prompt,
+        )
+
     def to_chat_batch(
         self, raws: list[RawExample], system_prompt: str = ""
     ) -> list[TrainingExample]:
@@ -50,5 +97,170 @@ class FormatConverter:
         """
         if not examples:
             return ""
-        lines = [json.dumps(ex.model_dump(), ensure_ascii=False) for ex in examples]
+        lines = [self._serialize(ex) for ex in examples]
         return "\n".join(lines)
+
+    def _serialize(self, example: TrainingExample) -> str:
+        """Serialize one training example to a single JSON line (without newline)."""
+        return json.dumps(example.model_dump(), ensure_ascii=False)
+
+    def _write_lines(self, examples: Iterable[TrainingExample], out: IO) -> JsonlWriteResult:
+        """Write one JSON line per example to an open text or binary file."""
+        text_mode = isinstance(out, io.TextIOBase)
+        lines = 0
+        size = 0
+        for example in examples:
+            line = self._serialize(example) + "\n"
+            data = line.encode()
+            out.write(line if text_mode else data)
+            lines += 1
+            size += len(data)
+        return JsonlWriteResult(lines_written=lines, bytes_written=size)
+
+    def _write_file(
+        self, examples: Iterable[TrainingExample], file: str | int, compression: str | None
+    ) -> JsonlWriteResult:
+        """Write examples to a path or file descriptor through a large buffer."""
+        with (
+            open(file, "wb", buffering=FILE_BUFFER_SIZE) as raw,
+            wrap_compressed(raw, "wb", compression) as out,
+        ):
+            return self._write_lines(examples, out)
+
+    def write_jsonl(
+        self,
+        examples: Iterable[TrainingExample],
+        file_or_path: str | os.PathLike[str] | IO,
+        compression: str | None = AUTO_COMPRESSION,
+        atomic: bool = True,
+    ) -> JsonlWriteResult:
+        """Stream training examples to a JSONL file one line at a time.
+
+        Unlike ``to_jsonl``, nothing is accumulated in memory, so examples can
+        come from a generator such as ``CurationPipeline.run_stream``. Every
+        line, including the last, ends with a newline.
+
+        Args:
+            examples: Training examples to serialize.
+            file_or_path: Destination path, or an open text or binary file
+                object that is written to and left open.
+            compression: ``gzip``, ``bz2``, ``xz``, ``zstd`` (Python 3.14+),
+                None for plain text, or ``auto`` to infer it from the path
+                suffix. Ignored for file objects.
+            atomic: When writing to a path, write to a temporary file in the
+                same directory and rename it into place on success.
+
+        Returns:
+            The number of lines and uncompressed bytes written.
+        """
+        if not isinstance(file_or_path, str | os.PathLike):
+            return self._write_lines(examples, file_or_path)
+
+        path = os.fspath(file_or_path)
+        compression = resolve_compression(path, compression)
+        if not atomic:
+            return self._write_file(examples, path, compression)
+
+        with atomic_replace(path) as fd:
+            return self._write_file(examples, fd, compression)
+
+    def read_jsonl(
+        self, path: str | os.PathLike[str], compression: str | None = AUTO_COMPRESSION
+    ) -> Iterator[TrainingExample]:
+        """Lazily read training examples from a JSONL file written by ``write_jsonl``.
+
+        Blank lines are skipped.
+
+        Args:
+            path: Path of the JSONL file.
+            compression: Compression name, None, or ``auto`` to infer it
+                from the path suffix.
+
+        Yields:
+            One validated training example per line, in file order.
+
+        Raises:
+            ValueError: If a line is not a valid training example.
+        """
+        compression = resolve_compression(path, compression)
+        with (
+            open(path, "rb", buffering=FILE_BUFFER_SIZE) as raw,
+            wrap_compressed(raw, "rb", compression) as lines,
+        ):
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    example = TrainingExample.model_validate_json(line)
+                except ValidationError as exc:
+                    raise ValueError(f"{os.fspath(path)}:{line_number}: invalid record") from exc
+                yield example
+
+    def write_packed(
+        self, examples: Iterable[TrainingExample], path: str | os.PathLike[str]
+    ) -> int:
+        """Write training examples to a memory-mappable packed binary file.
+
+        Packed files hold the same fields as JSONL but can be opened with
+        ``read_packed`` for constant-time access to any example, without
+        parsing the rest of the file.
+
+        Args:
+            examples: Training examples, e.g. from ``CurationPipeline.run_stream``.
+            path: Destination file, replaced atomically.
+
+        Returns:
+            The number of examples written.
+        """
+        return write_packed(examples, path)
+
+    def read_packed(self, path: str | os.PathLike[str]) -> PackedDataset:
+        """Open a packed file as a memory-mapped sequence of training examples.
+
+        Args:
+            path: File written by ``write_packed``.
+
+        Returns:
+            A read-only sequence supporting ``len``, indexing, and iteration.
+
+        Raises:
+            ValueError: If the file is not a packed dataset.
+        """
+        return PackedDataset(path)
+
+    def jsonl_to_packed(
+        self,
+        jsonl_path: str | os.PathLike[str],
+        packed_path: str | os.PathLike[str],
+        compression: str | None = AUTO_COMPRESSION,
+    ) -> int:
+        """Convert a JSONL file of training examples into a packed file.
+
+        Args:
+            jsonl_path: Source JSONL file.
+            packed_path: Destination packed file.
+            compression: Compression of the JSONL file (see ``read_jsonl``).
+
+        Returns:
+            The number of examples converted.
+        """
+        return self.write_packed(self.read_jsonl(jsonl_path, compression), packed_path)
+
+    def packed_to_jsonl(
+        self,
+        packed_path: str | os.PathLike[str],
+        jsonl_path: str | os.PathLike[str],
+        compression: str | None = AUTO_COMPRESSION,
+    ) -> JsonlWriteResult:
+        """Convert a packed file back into JSONL.
+
+        Args:
+            packed_path: Source packed file.
+            jsonl_path: Destination JSONL file.
+            compression: Compression of the JSONL file (see ``write_jsonl``).
+
+        Returns:
+            The number of lines and uncompressed bytes written.
+        """
+        with self.read_packed(packed_path) as dataset:
+            return self.write_jsonl(dataset, jsonl_path, compression)
@@ -0,0 +1,384 @@
+"""Memory-mappable on-disk format for deduplication sessions.
+
+A saved session lets an append-only dataset be deduplicated batch by batch:
+each new batch is checked against everything accepted in earlier runs without
+reprocessing it. The file holds, after a small JSON header:
+
+* the sorted content hashes of every text seen, searched by bisection;
+* the persisted LSH buckets, one (key, position) table per band sorted by
+  key (MinHash indexes only);
+* the text lengths as one (length, position) table sorted by length
+  (``PrefilterIndex`` only), so the length window of a lookup is found by
+  bisection without decoding any text;
+* the accepted normalized texts as one UTF-8 blob plus an offset table,
+  needed to verify candidates with the exact similarity ratio.
+
+Nothing is loaded eagerly; lookups read straight from the memory map.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from itertools import groupby
+from typing import TYPE_CHECKING, Any, BinaryIO, overload
+
+from dataset_curator._atomic import atomic_replace
+from dataset_curator.similarity import MinHashLSHIndex, PrefilterIndex, TextStore
+
+if TYPE_CHECKING:
+    from dataset_curator.deduplicator import Deduplicator, DedupSession
+
+MAGIC: bytes = b"DCDEDUP1"
+FORMAT_VERSION: int = 1
+ALIGNMENT: int = 8
+_PREAMBLE = struct.Struct("<8sQ")
+
+
+def _padding(size: int) -> int:
+    """Number of bytes needed to align size to ALIGNMENT."""
+    return -size % ALIGNMENT
+
+
+class MappedDigests(Sequence[bytes]):
+    """Sorted fixed-width content hashes read from a memory map."""
+
+    def __init__(self, buffer: memoryview, digest_size: int) -> None:
+        """Wrap a buffer of concatenated, sorted digests."""
+        self._buffer = buffer
+        self._size = digest_size
+        self._count = len(buffer) // digest_size
+
+    def __len__(self) -> int:
+        """Return the number of digests."""
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> bytes: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[bytes]: ...
+
+    def __getitem__(self, index: int | slice) -> bytes | Sequence[bytes]:
+        """Return the digest at index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start = index * self._size
+        return self._buffer[start : start + self._size].tobytes()
+
+    def __contains__(self, digest: object) -> bool:
+        """Check membership by bisection."""
+        i = bisect_left(self, digest)  # type: ignore[arg-type]
+        return i < self._count and self[i] == digest
+
+
+class MappedTexts(Sequence[str]):
+    """UTF-8 texts read lazily from a blob and an offset table."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        """Wrap an offset table of len(texts) + 1 entries and the text blob."""
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        """Return the number of texts."""
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | Sequence[str]:
+        """Decode the text at index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return str(self._blob[self._offsets[index] : self._offsets[index + 1]], "utf-8")
+
+
+class MappedBands:
+    """Persisted LSH buckets: per band, keys sorted with their positions."""
+
+    def __init__(self, tables: list[tuple[memoryview, memoryview]]) -> None:
+        """Wrap one (keys, positions) pair of columns per band."""
+        self._tables = tables
+
+    def lookup(self, band: int, key: int) -> Iterator[int]:
+        """Yield the positions stored under key in a band."""
+        keys, positions = self._tables[band]
+        i = bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            yield positions[i]
+            i += 1
+
+    def entries(self, band: int) -> Iterator[tuple[int, int]]:
+        """Yield every (key, position) pair of a band."""
+        keys, positions = self._tables[band]
+        return zip(keys, positions, strict=True)
+
+
+class MappedLengths:
+    """Persisted text lengths, sorted with the positions of their texts."""
+
+    def __init__(self, lengths: memoryview, positions: memoryview) -> None:
+        """Wrap the sorted lengths column and the matching positions."""
+        self._lengths = lengths
+        self._positions = positions
+
+    def window(self, shortest: int, longest: int) -> memoryview:
+        """Return the positions of texts whose length lies in [shortest, longest]."""
+        lengths = self._lengths
+        return self._positions[bisect_left(lengths, shortest) : bisect_right(lengths, longest)]
+
+    def entries(self) -> Iterator[tuple[int, int]]:
+        """Yield every (length, position) pair, sorted."""
+        return zip(self._lengths, self._positions, strict=True)
+
+
+@dataclass
+class _Section:
+    """One section of a file being saved: history columns plus new items.
+
+    History is written straight from its buffer (typically the memory map
+    of the file being replaced), so saving never copies it into Python
+    objects.
+    """
+
+    history: memoryview
+    added: bytes
+    # For sorted columns, the number of history items preceding each added
+    # item; None appends the added bytes after the history
+    cuts: list[int] | None = None
+    itemsize: int = 1
+
+    @property
+    def size(self) -> int:
+        """Total number of bytes in the section."""
+        return len(self.history) + len(self.added)
+
+    def write(self, out: BinaryIO) -> None:
+        """Write the section, merging the added items into the history."""
+        if self.cuts is None:
+            out.write(self.history)
+            out.write(self.added)
+            return
+        width = self.itemsize
+        added = memoryview(self.added)
+        previous = written = 0
+        # Added items sharing a cut are written as one run
+        for cut, run in groupby(self.cuts):
+            count = sum(1 for _ in run)
+            out.write(self.history[previous * width : cut * width])
+            out.write(added[written * width : (written + count) * width])
+            previous, written = cut, written + count
+        out.write(self.history[previous * width :])
+
+
+def _pair_columns(entries: Iterable[tuple[int, int]]) -> tuple[memoryview, memoryview]:
+    """Build sorted (key, position) columns from persisted pairs held elsewhere."""
+    pairs = sorted(entries)
+    keys = array("q", (key for key, _ in pairs))
+    positions = array("Q", (position for _, position in pairs))
+    return memoryview(keys), memoryview(positions)
+
+
+def _pair_sections(
+    name: str,
+    history: tuple[memoryview, memoryview],
+    added: Iterable[tuple[int, int]],
+) -> dict[str, _Section]:
+    """Merge new (key, position) pairs into sorted history columns.
+
+    New positions always follow the historical ones, so each pair goes after
+    every history entry with the same key.
+    """
+    keys, positions = history
+    pairs = sorted(added)
+    cuts = [bisect_right(keys, key) for key, _ in pairs]
+    added_keys = array("q", (key for key, _ in pairs)).tobytes()
+    added_positions = array("Q", (position for _, position in pairs)).tobytes()
+    return {
+        f"{name}.keys": _Section(keys.cast("B"), added_keys, cuts, 8),
+        f"{name}.positions": _Section(positions.cast("B"), added_positions, cuts, 8),
+    }
+
+
+def save_session(session: "DedupSession", path: str | os.PathLike[str]) -> None:
+    """Write everything a session has seen to a file, atomically.
+
+    History attached from a saved file is streamed from its memory map into
+    the new file, and only what was added since is sorted and merged in, so
+    appending a batch costs time proportional to the history size but no
+    memory for it. A session loaded from path can therefore be saved back
+    to the same path once a new batch has been appended.
+
+    Args:
+        session: Session to persist.
+        path: Destination file.
+
+    Raises:
+        TypeError: If the session's similarity index does not support persistence.
+    """
+    index = session.index
+    params = index.params()
+    sections: dict[str, _Section] = {}
+
+    history_digests = session.history_digests
+    added_digests = sorted(session.added_digests())
+    if isinstance(history_digests, MappedDigests):
+        digest_buffer, digest_size = history_digests._buffer, history_digests._size
+    else:
+        digest_buffer = memoryview(b"".join(history_digests))
+        digest_size = len(history_digests[0]) if history_digests else 0
+    digest_size = digest_size or (len(added_digests[0]) if added_digests else 0)
+    sections["digests"] = _Section(
+        digest_buffer,
+        b"".join(added_digests),
+        [bisect_left(history_digests, digest) for digest in added_digests],
+        digest_size,
+    )
+
+    texts: TextStore = index.texts  # type: ignore[attr-defined]
+    if isinstance(texts.history, MappedTexts):
+        history_offsets, history_blob = texts.history._offsets, texts.history._blob
+    else:
+        encoded = [text.encode() for text in texts.history]
+        offsets = array("Q", [0])
+        for blob in encoded:
+            offsets.append(offsets[-1] + len(blob))
+        history_offsets, history_blob = memoryview(offsets), memoryview(b"".join(encoded))
+    blobs = [text.encode() for text in texts.added]
+    added_offsets = array("Q")
+    end = history_offsets[-1]
+    for blob in blobs:
+        end += len(blob)
+        added_offsets.append(end)
+    sections["offsets"] = _Section(history_offsets.cast("B"), added_offsets.tobytes())
+
+    if isinstance(index, MinHashLSHIndex):
+        history_bands = index.history_bands
+        for band in range(index.bands):
+            if isinstance(history_bands, MappedBands):
+                columns = history_bands._tables[band]
+            else:
+                columns = _pair_columns(history_bands.entries(band) if history_bands else ())
+            sections.update(_pair_sections(f"band{band}", columns, index.band_entries(band)))
+    elif isinstance(index, PrefilterIndex):
+        history_lengths = index.history_lengths
+        if isinstance(history_lengths, MappedLengths):
+            columns = (history_lengths._lengths, history_lengths._positions)
+        else:
+            columns = _pair_columns(history_lengths.entries() if history_lengths else ())
+        sections.update(_pair_sections("lengths", columns, index.length_entries()))
+
+    sections["blob"] = _Section(history_blob, b"".join(blobs))
+
+    layout: dict[str, list[int]] = {}
+    cursor = 0
+    for name, section in sections.items():
+        layout[name] = [cursor, section.size]
+        cursor += section.size + _padding(section.size)
+
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "digest_size": digest_size,
+            "index": type(index).__name__,
+            "params": params,
+            "sections": layout,
+        }
+    ).encode()
+    header += b" " * _padding(_PREAMBLE.size + len(header))
+
+    with atomic_replace(path) as fd, open(fd, "wb") as out:
+        out.write(_PREAMBLE.pack(MAGIC, len(header)))
+        out.write(header)
+        for section in sections.values():
+            section.write(out)
+            out.write(b"\0" * _padding(section.size))
+
+
+def _read_header(buffer: mmap.mmap) -> tuple[dict[str, Any], int]:
+    """Parse and validate the header, returning it with the data start offset."""
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError("Not a dedup index file")
+    magic, header_size = _PREAMBLE.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("Not a dedup index file")
+    header = json.loads(buffer[_PREAMBLE.size : _PREAMBLE.size + header_size])
+    if header["version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dedup index version {header['version']}")
+    if header["byteorder"] != sys.byteorder:
+        raise ValueError("Dedup index was written on a machine with a different byte order")
+    return header, _PREAMBLE.size + header_size
+
+
+def load_session(deduplicator: "Deduplicator", path: str | os.PathLike[str]) -> "DedupSession":
+    """Open a saved session so new examples are checked against its history.
+
+    Args:
+        deduplicator: Deduplicator whose index configuration matches the file.
+        path: File written by ``save_session``.
+
+    Returns:
+        A session whose history is memory-mapped from path; ``close`` it
+        to release the map.
+
+    Raises:
+        ValueError: If the file is invalid or was written with a different
+            similarity index configuration.
+    """
+    session = deduplicator.session()
+    index = session.index
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        header, start = _read_header(buffer)
+        if header["index"] != type(index).__name__ or header["params"] != index.params():
+            raise ValueError(
+                f"Dedup index was saved with {header['index']}({header['params']}), "
+                f"not {type(index).__name__}({index.params()})"
+            )
+    except BaseException:
+        buffer.close()
+        raise
+
+    view = memoryview(buffer)
+
+    def section(name: str) -> memoryview:
+        offset, size = header["sections"][name]
+        return view[start + offset : start + offset + size]
+
+    texts = MappedTexts(section("offsets").cast("Q"), section("blob"))
+    bands = None
+    if isinstance(index, MinHashLSHIndex):
+        bands = MappedBands(
+            [
+                (section(f"band{b}.keys").cast("q"), section(f"band{b}.positions").cast("Q"))
+                for b in range(index.bands)
+            ]
+        )
+    lengths = None
+    if "lengths.keys" in header["sections"]:
+        lengths = MappedLengths(
+            section("lengths.keys").cast("q"), section("lengths.positions").cast("Q")
+        )
+    digest_size = header["digest_size"]
+    digests = MappedDigests(section("digests"), digest_size) if digest_size else ()
+    session.attach_history(digests, texts, bands, lengths, mapping=buffer)
+    return session
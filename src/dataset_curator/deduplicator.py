@@ -1,23 +1,358 @@
 """Deduplication utilities for dataset curation."""
 
+import hashlib
+import mmap
+import os
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from difflib import SequenceMatcher
+from typing import Any, Self
 
-from dataset_curator.models import TrainingExample
+from dataset_curator.bloom import DEFAULT_ERROR_RATE, BloomFilter, optimal_parameters
+from dataset_curator.dedup_store import load_session, save_session
+from dataset_curator.models import DuplicateCluster, TrainingExample
+from dataset_curator.records import ExampleFeatures, ExampleRecord
+from dataset_curator.similarity import (
+    DEFAULT_SEED,
+    BandLookup,
+    LengthLookup,
+    MinHashLSHIndex,
+    PrefilterIndex,
+    SimilarityIndex,
+)
 
 DEFAULT_SIMILARITY_THRESHOLD: float = 0.95
+CONTENT_HASH_SIZE: int = 16
+PARTITIONS_PER_WORKER: int = 4
+
+
+def content_hash(text: str) -> bytes:
+    """Compute the fingerprint used to detect exact repeats of a text.
+
+    Args:
+        text: Normalized text.
+
+    Returns:
+        A BLAKE2b digest of the UTF-8 encoded text.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=CONTENT_HASH_SIZE).digest()
+
+
+def _deduplicate_partition(
+    deduplicator: "Deduplicator", items: list[tuple[int, str]]
+) -> tuple[list[int], dict[int, int]]:
+    """Deduplicate one partition of normalized texts in a worker process.
+
+    Returns:
+        A tuple of (positions of the texts kept, in input order; position
+        of each near duplicate -> position of the kept text it matched).
+        Exact repeats appear in neither.
+    """
+    session = deduplicator.session()
+    kept: list[int] = []
+    accepted: dict[str, int] = {}
+    matches: dict[int, int] = {}
+    for position, text in items:
+        if session.check_text(text):
+            kept.append(position)
+            accepted[text] = position
+        elif session.last_match is not None:
+            matches[position] = accepted[session.last_match]
+    return kept, matches
+
+
+class DedupSession:
+    """Incremental deduplication state for one pass over a dataset.
+
+    Each text is first looked up by its content hash, so byte-identical
+    repeats are dropped in constant time. Only texts with an unseen hash go
+    through the similarity index and the exact similarity ratio.
+    """
+
+    # Attributes reported by ``counters``; ``save`` does not persist them
+    COUNTERS: tuple[str, ...] = ("exact_removed", "near_removed", "comparisons")
+
+    def __init__(self, deduplicator: "Deduplicator") -> None:
+        """Initialize an empty session.
+
+        Args:
+            deduplicator: Deduplicator providing threshold, index and similarity.
+        """
+        self.deduplicator = deduplicator
+        self.index = deduplicator.index_factory()
+        self.exact_removed = 0
+        self.near_removed = 0
+        self.comparisons = 0
+        # Stored text the last near duplicate matched, for cluster reporting
+        self.last_match: str | None = None
+        self._hashes: set[bytes] = set()
+        # Sorted hashes of earlier runs, when attached from a saved session
+        self.history_digests: Sequence[bytes] = ()
+        # Memory map the attached history is read from, released by close()
+        self._history_map: mmap.mmap | None = None
+
+    @property
+    def removed(self) -> int:
+        """Total number of duplicates dropped so far."""
+        return self.exact_removed + self.near_removed
+
+    @property
+    def estimated_false_drop_rate(self) -> float:
+        """Expected fraction of unique texts wrongly dropped; always 0.0 here."""
+        return 0.0
+
+    def added_digests(self) -> Iterator[bytes]:
+        """Iterate over the content hashes seen since the history was attached."""
+        return iter(self._hashes)
+
+    def attach_history(
+        self,
+        digests: Sequence[bytes],
+        texts: Sequence[str],
+        bands: BandLookup | None = None,
+        lengths: LengthLookup | None = None,
+        mapping: mmap.mmap | None = None,
+    ) -> None:
+        """Seed an empty session with the state of earlier runs.
+
+        Args:
+            digests: Sorted content hashes of every text seen before.
+            texts: Accepted normalized texts, in acceptance order.
+            bands: Persisted LSH buckets, for indexes that use them.
+            lengths: Persisted text lengths, for indexes that use them.
+            mapping: Memory map the history is read from, closed by ``close``.
+        """
+        self.history_digests = digests
+        self.index.attach_history(texts, bands, lengths)
+        self._history_map = mapping
+
+    def close(self) -> None:
+        """Release the memory map of a loaded history.
+
+        The session must not be used afterwards. Closing a session that was
+        not loaded from a file, or closing it twice, does nothing.
+        """
+        mapping, self._history_map = self._history_map, None
+        if mapping is None:
+            return
+        # Views into the map must be dropped before it can be closed
+        self.history_digests = ()
+        self.index = self.deduplicator.index_factory()
+        mapping.close()
+
+    def __enter__(self) -> Self:
+        """Return the session for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the session."""
+        self.close()
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Persist everything seen so far; see ``Deduplicator.load_session``.
+
+        Args:
+            path: Destination file, replaced atomically.
+        """
+        save_session(self, path)
+
+    def counters(self) -> dict[str, float]:
+        """Return the running counters, e.g. to store next to a saved session.
+
+        Returns:
+            The value of every attribute named in ``COUNTERS``.
+        """
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def restore_counters(self, counters: Mapping[str, float]) -> None:
+        """Continue counting from values returned by ``counters``.
+
+        Args:
+            counters: Counter values by attribute name.
+
+        Raises:
+            ValueError: If counters names an attribute not in ``COUNTERS``.
+        """
+        unknown = set(counters) - set(self.COUNTERS)
+        if unknown:
+            raise ValueError(f"Unknown session counters: {sorted(unknown)}")
+        for name, value in counters.items():
+            setattr(self, name, type(getattr(self, name))(value))
+
+    def check(self, example: TrainingExample | ExampleRecord) -> bool:
+        """Check an example and remember it if it is unique.
+
+        Args:
+            example: Training example or pipeline record to check.
+
+        Returns:
+            True if the example is unique and should be kept.
+        """
+        features = self.deduplicator.features(example)
+        return self.check_text(features.normalized, features.digest)
+
+    def prepare(self, texts: Sequence[str]) -> None:
+        """Let the index precompute its per-text data for a batch about to be checked.
+
+        Args:
+            texts: Normalized texts, in the order they will be checked.
+        """
+        self.index.prepare(texts)
+
+    def _compare(self, a: str, b: str) -> float:
+        """Compute a similarity ratio, counting it in ``comparisons``."""
+        self.comparisons += 1
+        return self.deduplicator._similarity(a, b)
+
+    def check_text(self, text: str, digest: bytes | None = None, sketch: bytes = b"") -> bool:
+        """Check a normalized text and remember it if it is unique.
+
+        Args:
+            text: Normalized user text of an example.
+            digest: Precomputed ``content_hash`` of text, e.g. from a cache.
+            sketch: Precomputed ``SimilarityIndex.sketch`` of text, e.g. from
+                a cache.
+
+        Returns:
+            True if the text is unique and should be kept.
+        """
+        self.last_match = None
+        if digest is None:
+            digest = content_hash(text)
+        # An identical text has ratio 1.0, so a threshold above that keeps
+        # even exact repeats, as the pairwise scan always did
+        exact = self.deduplicator.threshold <= 1.0
+        if exact and (digest in self._hashes or digest in self.history_digests):
+            self.exact_removed += 1
+            return False
+        # Rejected texts are hashed too: a later identical copy would be
+        # rejected against the same accepted text anyway.
+        self._hashes.add(digest)
+        if sketch:
+            self.index.prime(text, sketch)
+        scored = self.index.scored
+        match = self.index.find_duplicate(text, self.deduplicator.threshold, self._compare)
+        self.comparisons += self.index.scored - scored
+        if match is not None:
+            self.near_removed += 1
+            self.last_match = match
+            return False
+        self.index.add(text)
+        return True
+
+
+class BloomDedupSession(DedupSession):
+    """Exact deduplication of normalized texts in fixed memory.
+
+    Content hashes go into a Bloom filter instead of a set, and texts are
+    never stored, so memory stays at the filter size however many examples
+    are checked. Near duplicates are not detected. A unique text is wrongly
+    dropped when all its filter bits happen to be set already; the chance
+    of that at each check is summed into ``estimated_false_drop_rate``.
+    """
+
+    COUNTERS = (*DedupSession.COUNTERS, "checks", "_false_drop_sum")
+
+    def __init__(self, deduplicator: "Deduplicator", seen: BloomFilter | None = None) -> None:
+        """Initialize a session.
+
+        Args:
+            deduplicator: Deduplicator providing the filter size and error rate.
+            seen: Filter to continue from, e.g. one loaded from disk; a new
+                empty filter by default.
+
+        Raises:
+            ValueError: If seen is None and the deduplicator has no bloom_capacity.
+        """
+        super().__init__(deduplicator)
+        if seen is None:
+            if deduplicator.bloom_capacity is None:
+                raise ValueError("A Bloom filter session needs a Deduplicator with bloom_capacity")
+            seen = BloomFilter(deduplicator.bloom_capacity, deduplicator.bloom_error_rate)
+        self.seen = seen
+        self.checks = 0
+        self._false_drop_sum = 0.0
+
+    @property
+    def estimated_false_drop_rate(self) -> float:
+        """Expected fraction of unique texts wrongly dropped as repeats so far."""
+        return self._false_drop_sum / self.checks if self.checks else 0.0
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Persist the filter; see ``Deduplicator.load_session``.
+
+        Args:
+            path: Destination file, replaced atomically.
+        """
+        self.seen.save(path)
+
+    def prepare(self, texts: Sequence[str]) -> None:
+        """Do nothing: the filter needs no per-text data beyond the content hash."""
+
+    def close(self) -> None:
+        """Release the memory map of a loaded filter; the session must not be used afterwards."""
+        self.seen.close()
+
+    def check_text(self, text: str, digest: bytes | None = None, sketch: bytes = b"") -> bool:
+        """Check a normalized text against the filter and add it.
+
+        Args:
+            text: Normalized user text of an example.
+            digest: Precomputed ``content_hash`` of text.
+            sketch: Unused; the filter has no similarity index.
+
+        Returns:
+            True if the text was not seen before and should be kept.
+        """
+        if digest is None:
+            digest = content_hash(text)
+        self.checks += 1
+        self._false_drop_sum += self.seen.false_positive_rate()
+        if self.seen.add(digest):
+            self.exact_removed += 1
+            return False
+        return True
 
 
 class Deduplicator:
     """Removes near-duplicate training examples using sequence similarity."""
 
-    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD) -> None:
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        index_factory: Callable[[], SimilarityIndex] = PrefilterIndex,
+        bloom_capacity: int | None = None,
+        bloom_error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
         """Initialize the deduplicator.
 
         Args:
             threshold: Similarity ratio at or above which two texts are
                 considered duplicates.
+            index_factory: Callable creating the similarity index that supplies
+                comparison candidates, e.g. ``MinHashLSHIndex``. Candidates are
+                always verified with the exact similarity ratio. The default
+                ``PrefilterIndex`` gives the same results as an exhaustive
+                scan without per-n-gram postings, keeping memory proportional
+                to the stored texts; pass ``ExhaustiveIndex`` when overriding
+                ``_similarity``.
+            bloom_capacity: Opt into bounded-memory exact deduplication with
+                a Bloom filter sized for this many unique texts (see
+                ``BloomDedupSession``). None keeps every text in memory and
+                also removes near duplicates.
+            bloom_error_rate: False-positive rate of the filter once it holds
+                bloom_capacity texts.
+
+        Raises:
+            ValueError: If bloom_capacity is less than 1 or bloom_error_rate
+                is not between 0 and 1.
         """
+        if bloom_capacity is not None:
+            optimal_parameters(bloom_capacity, bloom_error_rate)
         self.threshold = threshold
+        self.index_factory = index_factory
+        self.bloom_capacity = bloom_capacity
+        self.bloom_error_rate = bloom_error_rate
 
     def _normalize(self, text: str) -> str:
         """Lowercase and strip whitespace from text."""
@@ -27,14 +362,59 @@ class Deduplicator:
         """Compute the similarity ratio between two strings."""
         return SequenceMatcher(None, a, b).ratio()
 
-    def _extract_text(self, example: TrainingExample) -> str:
+    def _extract_text(self, example: TrainingExample | ExampleRecord) -> str:
         """Extract concatenated user message content from a training example."""
+        if isinstance(example, ExampleRecord):
+            return example.content
         user_msgs = [m.content for m in example.messages if m.role == "user"]
         return " ".join(user_msgs)
 
-    def deduplicate(
-        self, examples: list[TrainingExample]
-    ) -> tuple[list[TrainingExample], int]:
+    def features(self, example: TrainingExample | ExampleRecord) -> ExampleFeatures:
+        """Compute the normalized user text of an example and its hash.
+
+        Args:
+            example: Training example or pipeline record.
+
+        Returns:
+            The features used by deduplication.
+        """
+        normalized = self._normalize(self._extract_text(example))
+        return ExampleFeatures(normalized, content_hash(normalized))
+
+    def session(self) -> DedupSession:
+        """Start an incremental deduplication session.
+
+        Returns:
+            A new session with no examples seen yet; a ``BloomDedupSession``
+            when bloom_capacity is set.
+        """
+        if self.bloom_capacity is not None:
+            return BloomDedupSession(self)
+        return DedupSession(self)
+
+    def load_session(self, path: str | os.PathLike[str]) -> DedupSession:
+        """Resume deduplication against examples accepted in earlier runs.
+
+        The saved content hashes, LSH buckets, and texts are memory-mapped
+        rather than loaded, so each new example costs about the same as in a
+        fresh session. With bloom_capacity set, the file is a saved Bloom
+        filter, mapped copy-on-write. Call ``DedupSession.save`` after the
+        batch to append its accepted examples to the file.
+
+        Args:
+            path: File written by ``DedupSession.save``.
+
+        Returns:
+            A session that treats the saved examples as already seen.
+
+        Raises:
+            ValueError: If the file was saved with a different index configuration.
+        """
+        if self.bloom_capacity is not None:
+            return BloomDedupSession(self, BloomFilter.load(path))
+        return load_session(self, path)
+
+    def deduplicate(self, examples: list[TrainingExample]) -> tuple[list[TrainingExample], int]:
         """Remove near-duplicate examples from a list.
 
         Args:
@@ -46,19 +426,143 @@ class Deduplicator:
         if not examples:
             return [], 0
 
-        unique: list[TrainingExample] = []
-        seen_texts: list[str] = []
-
-        for example in examples:
-            text = self._normalize(self._extract_text(example))
-            is_dup = False
-            for seen in seen_texts:
-                if self._similarity(text, seen) >= self.threshold:
-                    is_dup = True
-                    break
-            if not is_dup:
-                unique.append(example)
-                seen_texts.append(text)
-
-        removed = len(examples) - len(unique)
-        return unique, removed
+        session = self.session()
+        features = [self.features(example) for example in examples]
+        session.prepare([f.normalized for f in features])
+        unique = [
+            example
+            for example, f in zip(examples, features, strict=True)
+            if session.check_text(f.normalized, f.digest)
+        ]
+        return unique, session.removed
+
+    def cluster(
+        self,
+        examples: list[TrainingExample],
+        key: Callable[[TrainingExample], Any] | None = None,
+    ) -> tuple[list[TrainingExample], list[DuplicateCluster]]:
+        """Group duplicate examples into clusters and keep the best of each.
+
+        Examples go through one session pass, exactly as in ``deduplicate``,
+        and each rejected example is linked to the example it matched: the
+        first one with the same content hash, or the stored text returned by
+        the similarity index. Clusters are the connected components of these
+        links, built with union-find, so no pairs beyond those the index
+        already compared are scored.
+
+        Args:
+            examples: List of training examples to deduplicate.
+            key: Ranks the members of a cluster, e.g. ``lambda e:
+                e.quality_score``; the member with the highest key is kept
+                and ties go to the earliest. None keeps the earliest member,
+                like ``deduplicate``.
+
+        Returns:
+            A tuple of (kept examples in input order, clusters with more
+            than one member in order of their first member).
+        """
+        parent = list(range(len(examples)))
+
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        session = self.session()
+        first_by_digest: dict[bytes, int] = {}
+        accepted: dict[str, int] = {}
+        for position, example in enumerate(examples):
+            features = self.features(example)
+            if session.check_text(features.normalized, features.digest):
+                accepted[features.normalized] = position
+            elif features.digest in first_by_digest:
+                parent[find(position)] = find(first_by_digest[features.digest])
+            elif session.last_match is not None:
+                parent[find(position)] = find(accepted[session.last_match])
+            # Otherwise a Bloom filter false positive: the example stands alone
+            first_by_digest.setdefault(features.digest, position)
+
+        components: dict[int, list[int]] = {}
+        for position in range(len(examples)):
+            components.setdefault(find(position), []).append(position)
+
+        kept: list[int] = []
+        clusters: list[DuplicateCluster] = []
+        for members in components.values():
+            if key is None:
+                representative = members[0]
+            else:
+                representative = max(members, key=lambda i: key(examples[i]))
+            kept.append(representative)
+            if len(members) > 1:
+                clusters.append(DuplicateCluster(representative=representative, members=members))
+        return [examples[i] for i in sorted(kept)], clusters
+
+    def deduplicate_parallel(
+        self,
+        examples: list[TrainingExample],
+        workers: int = 2,
+        partitions: int | None = None,
+        seed: int = DEFAULT_SEED,
+    ) -> tuple[list[TrainingExample], int]:
+        """Remove near-duplicate examples using sharded worker processes.
+
+        Examples are partitioned by a seeded single-permutation MinHash of
+        their text, so similar texts tend to land in the same partition and
+        identical texts always do. Each partition is deduplicated in its own
+        process, then the results are merged in input order: survivors are
+        checked against each other to resolve duplicates that were split
+        across partitions, and a near duplicate whose partition match was
+        dropped by the merge is checked again, since it may not duplicate
+        anything that was kept (A similar to B, B similar to C, A not
+        similar to C).
+
+        The result is the same as ``deduplicate``: the earliest occurrence
+        of a duplicate always wins.
+
+        Args:
+            examples: List of training examples to deduplicate.
+            workers: Number of worker processes.
+            partitions: Number of partitions; defaults to a few per worker.
+            seed: Seed of the partitioning hash.
+
+        Returns:
+            A tuple of (unique examples, number of duplicates removed).
+        """
+        if not examples:
+            return [], 0
+        if partitions is None:
+            partitions = workers * PARTITIONS_PER_WORKER
+
+        partitioner = MinHashLSHIndex(num_perm=1, bands=1, seed=seed)
+        features = [self.features(example) for example in examples]
+        shards: list[list[tuple[int, str]]] = [[] for _ in range(partitions)]
+        for position, feature in enumerate(features):
+            text = feature.normalized
+            shards[partitioner.signature(text)[0] % partitions].append((position, text))
+
+        survivors: list[int] = []
+        matches: dict[int, int] = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_deduplicate_partition, self, shard) for shard in shards if shard
+            ]
+            for future in futures:
+                kept, partition_matches = future.result()
+                survivors.extend(kept)
+                matches.update(partition_matches)
+
+        # Merge in input order. A near duplicate stays dropped if the text it
+        # matched is kept (that match precedes it); otherwise it is rechecked.
+        # Exact repeats share a partition with their first copy and stay dropped.
+        session = self.session()
+        kept_mask = bytearray(len(examples))
+        for i in sorted([*survivors, *matches]):
+            if i in matches and kept_mask[matches[i]]:
+                continue
+            kept_mask[i] = session.check_text(features[i].normalized, features[i].digest)
+        unique = [example for example, kept in zip(examples, kept_mask, strict=True) if kept]
+        return unique, len(examples) - len(unique)
@@ -19,9 +19,7 @@ class RawExample(BaseModel):
 class ChatMessage(BaseModel):
     """A single message within a multi-turn chat conversation."""
 
-    role: Literal["system", "user", "assistant"] = Field(
-        description="Role of the message author"
-    )
+    role: Literal["system", "user", "assistant"] = Field(description="Role of the message author")
     content: str = Field(description="Text content of the message")
 
 
@@ -42,9 +40,76 @@ class DatasetStats(BaseModel):
 
     total_examples: int = Field(description="Number of examples after curation")
     avg_quality: float = Field(description="Mean quality score across all examples")
-    sources: dict[str, int] = Field(
-        description="Mapping of source identifiers to example counts"
-    )
+    sources: dict[str, int] = Field(description="Mapping of source identifiers to example counts")
     duplicates_removed: int = Field(
         default=0, description="Number of duplicate examples removed during curation"
     )
+    exact_duplicates_removed: int = Field(
+        default=0, description="Duplicates removed because their normalized text was identical"
+    )
+    near_duplicates_removed: int = Field(
+        default=0, description="Duplicates removed by the similarity threshold"
+    )
+    low_quality_removed: int = Field(
+        default=0, description="Examples removed for scoring below the quality floor"
+    )
+    estimated_false_drop_rate: float = Field(
+        default=0.0,
+        description="Expected fraction of unique examples wrongly dropped by Bloom filter dedup",
+    )
+
+
+class DuplicateCluster(BaseModel):
+    """A group of examples that duplicate each other, with the one kept."""
+
+    representative: int = Field(description="Input position of the example kept")
+    members: list[int] = Field(description="Input positions of all examples, in order")
+
+
+class JsonlWriteResult(BaseModel):
+    """Summary of a streamed JSONL export."""
+
+    lines_written: int = Field(description="Number of JSONL lines written")
+    bytes_written: int = Field(description="Number of uncompressed bytes written")
+
+
+class StageMetrics(BaseModel):
+    """Wall time and item counts of one pipeline stage."""
+
+    stage: str = Field(description="Stage name: clean, convert, dedup, score, or stats")
+    seconds: float = Field(default=0.0, description="Wall time spent in the stage")
+    items_in: int = Field(default=0, description="Number of items entering the stage")
+    items_out: int = Field(default=0, description="Number of items leaving the stage")
+    comparisons: int = Field(default=0, description="Similarity ratios computed (dedup stage only)")
+
+    @property
+    def throughput(self) -> float:
+        """Items processed per second, or 0.0 if no time was measured."""
+        return self.items_in / self.seconds if self.seconds > 0 else 0.0
+
+
+class ShardResult(BaseModel):
+    """Outcome of curating one input file as a shard of a larger run."""
+
+    input: str = Field(description="Path of the input JSONL file")
+    output: str = Field(description="Path of the curated JSONL file")
+    input_size: int = Field(description="Size of the input file in bytes when it was curated")
+    input_mtime_ns: int = Field(description="Modification time of the input file in nanoseconds")
+    seconds: float = Field(description="Wall time spent curating the shard")
+    stats: DatasetStats = Field(description="Statistics of the curated shard")
+    stages: list[StageMetrics] = Field(
+        default_factory=list, description="Per-stage metrics of the shard"
+    )
+
+
+class PipelineCheckpoint(BaseModel):
+    """Progress of a checkpointed pipeline run, enough to resume it after a crash."""
+
+    config: str = Field(description="Pipeline configuration the run was started with")
+    generation: int = Field(description="Number of checkpoints saved so far")
+    input_offset: int = Field(description="Number of raw examples fully processed")
+    output_position: int = Field(description="Size of the output file in bytes")
+    dedup_file: str = Field(description="Saved dedup session, relative to the checkpoint directory")
+    dedup_counters: dict[str, float] = Field(description="Running counters of the dedup session")
+    stats: DatasetStats = Field(description="Statistics of the examples written so far")
+    quality_sum: float = Field(description="Unrounded sum of the quality scores written so far")
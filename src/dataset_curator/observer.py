@@ -0,0 +1,55 @@
+"""Observer hooks that receive per-stage timings from a running pipeline."""
+
+from dataset_curator.models import StageMetrics
+
+STAGES: tuple[str, ...] = ("clean", "convert", "dedup", "score", "stats")
+
+
+class PipelineObserver:
+    """Receives stage metrics from ``CurationPipeline``.
+
+    The pipeline reports every stage once per processed batch (once per
+    record for ``run_stream`` with a single worker). Subclass and override
+    ``on_stage``; the default implementation ignores the metrics.
+    """
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        """Handle the metrics of one stage for one batch.
+
+        Args:
+            metrics: Wall time and item counts of the stage.
+        """
+
+
+class MetricsCollector(PipelineObserver):
+    """Observer that sums the metrics of each stage over a run."""
+
+    def __init__(self) -> None:
+        """Initialize with zeroed metrics for every stage."""
+        self.stages: dict[str, StageMetrics] = {
+            stage: StageMetrics(stage=stage) for stage in STAGES
+        }
+
+    def on_stage(self, metrics: StageMetrics) -> None:
+        """Add the metrics of one batch to the stage totals."""
+        total = self.stages.setdefault(metrics.stage, StageMetrics(stage=metrics.stage))
+        total.seconds += metrics.seconds
+        total.items_in += metrics.items_in
+        total.items_out += metrics.items_out
+        total.comparisons += metrics.comparisons
+
+    @property
+    def comparisons(self) -> int:
+        """Total number of similarity ratios computed during deduplication."""
+        return self.stages["dedup"].comparisons
+
+    def report(self) -> str:
+        """Render the totals as a plain-text table, one row per stage."""
+        lines = [f"{'stage':<8}{'seconds':>10}{'in':>10}{'out':>10}{'items/s':>12}"]
+        for m in self.stages.values():
+            lines.append(
+                f"{m.stage:<8}{m.seconds:>10.4f}{m.items_in:>10}{m.items_out:>10}"
+                f"{m.throughput:>12.0f}"
+            )
+        lines.append(f"similarity comparisons: {self.comparisons}")
+        return "\n".join(lines)
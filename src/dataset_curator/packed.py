@@ -0,0 +1,188 @@
+"""Packed binary file format for curated training examples.
+
+A packed file lets trainers open a curated dataset once and fetch any
+example by index without parsing the rest of the file. Layout, all
+integers little-endian:
+
+* a fixed header: magic, format version, example count, and the file
+  offset of the index;
+* the records, one after another. Each record is a fixed part (quality
+  score, message count, source length), one (role, content length) entry
+  per message, then the UTF-8 source followed by each message's content;
+* the index: count + 1 unsigned 64-bit record offsets, the last one being
+  the end of the records.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator, Sequence
+from typing import BinaryIO, Self, overload
+
+from dataset_curator._atomic import atomic_replace
+from dataset_curator._compression import FILE_BUFFER_SIZE
+from dataset_curator.models import ChatMessage, TrainingExample
+
+MAGIC: bytes = b"DCPACK01"
+FORMAT_VERSION: int = 1
+ROLES: tuple[str, ...] = ("system", "user", "assistant")
+
+_HEADER = struct.Struct("<8sIQQ")
+_RECORD = struct.Struct("<dII")
+_MESSAGE = struct.Struct("<BI")
+_OFFSET = struct.Struct("<Q")
+_ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+
+
+def _encode(example: TrainingExample) -> bytes:
+    """Serialize one training example as a packed record."""
+    source = example.source.encode()
+    contents = [message.content.encode() for message in example.messages]
+    parts = [_RECORD.pack(example.quality_score, len(contents), len(source))]
+    for message, content in zip(example.messages, contents, strict=True):
+        parts.append(_MESSAGE.pack(_ROLE_CODES[message.role], len(content)))
+    parts.append(source)
+    parts.extend(contents)
+    return b"".join(parts)
+
+
+def _write(examples: Iterable[TrainingExample], out: BinaryIO) -> int:
+    """Write the header, records, and index to a seekable file; return the count."""
+    out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+    offsets = [_HEADER.size]
+    for example in examples:
+        record = _encode(example)
+        out.write(record)
+        offsets.append(offsets[-1] + len(record))
+    index_offset = offsets[-1]
+    out.writelines(_OFFSET.pack(offset) for offset in offsets)
+    out.seek(0)
+    out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(offsets) - 1, index_offset))
+    return len(offsets) - 1
+
+
+def write_packed(examples: Iterable[TrainingExample], path: str | os.PathLike[str]) -> int:
+    """Write training examples to a packed file, atomically.
+
+    Args:
+        examples: Training examples, e.g. a generator; consumed once.
+        path: Destination file.
+
+    Returns:
+        The number of examples written.
+    """
+    with atomic_replace(path) as fd, open(fd, "wb", buffering=FILE_BUFFER_SIZE) as out:
+        return _write(examples, out)
+
+
+class PackedDataset(Sequence[TrainingExample]):
+    """Read-only, memory-mapped view of a packed file.
+
+    Lookups by index read one offset from the index and decode only that
+    record, so they take constant time regardless of file size. The
+    mapping is shared with the OS page cache: opening a dataset reads
+    nothing, and ``record_bytes`` exposes a record without copying it.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open and validate a packed file.
+
+        Args:
+            path: File written by ``write_packed``.
+
+        Raises:
+            ValueError: If the file is not a packed dataset or has an
+                unsupported format version.
+        """
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"{self.path}: not a packed dataset")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, index_offset = _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path}: not a packed dataset")
+        if version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path}: unsupported packed format version {version}")
+        self._count = count
+        self._index_offset = index_offset
+        self._view = memoryview(self._mmap)
+
+    def __len__(self) -> int:
+        """Return the number of examples."""
+        return self._count
+
+    def _span(self, index: int) -> tuple[int, int]:
+        """Return the start and end offsets of a record."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        position = self._index_offset + index * _OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._mmap, position)
+        return start, end
+
+    def record_bytes(self, index: int) -> memoryview:
+        """Return the encoded record at index as a zero-copy view of the file.
+
+        Args:
+            index: Example position; negative values count from the end.
+
+        Returns:
+            A memoryview into the mapping; valid until ``close``.
+
+        Raises:
+            IndexError: If index is out of range.
+        """
+        start, end = self._span(index)
+        return self._view[start:end]
+
+    @overload
+    def __getitem__(self, index: int) -> TrainingExample: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TrainingExample]: ...
+
+    def __getitem__(self, index: int | slice) -> TrainingExample | list[TrainingExample]:
+        """Decode the example at index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        start, _ = self._span(index)
+        data = self._view
+        quality_score, message_count, source_length = _RECORD.unpack_from(data, start)
+        position = start + _RECORD.size
+        entries = []
+        for _ in range(message_count):
+            entries.append(_MESSAGE.unpack_from(data, position))
+            position += _MESSAGE.size
+        source = str(data[position : position + source_length], "utf-8")
+        position += source_length
+        messages = []
+        for role, length in entries:
+            content = str(data[position : position + length], "utf-8")
+            messages.append(ChatMessage.model_construct(role=ROLES[role], content=content))
+            position += length
+        # Records were validated when written
+        return TrainingExample.model_construct(
+            messages=messages, quality_score=quality_score, source=source
+        )
+
+    def __iter__(self) -> Iterator[TrainingExample]:
+        """Iterate over the examples in file order."""
+        for index in range(self._count):
+            yield self[index]
+
+    def close(self) -> None:
+        """Release the memory mapping; views from ``record_bytes`` must be released first."""
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        """Return the dataset for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the dataset."""
+        self.close()
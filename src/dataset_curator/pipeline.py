@@ -1,15 +1,206 @@
 """Main curation pipeline orchestrating all processing steps."""
 
-from collections import Counter
+import asyncio
+import os
+import unicodedata
+from array import array
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Generator,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from itertools import islice
+from time import perf_counter
+from typing import Any, BinaryIO
 
+from dataset_curator import cleaner as cleaner_module
+from dataset_curator._compression import FILE_BUFFER_SIZE
+from dataset_curator.cache import CacheEntry, CleanCache
+from dataset_curator.checkpoint import dedup_file_name, load_checkpoint, save_checkpoint
 from dataset_curator.cleaner import DataCleaner
 from dataset_curator.converter import FormatConverter
-from dataset_curator.deduplicator import Deduplicator
-from dataset_curator.models import DatasetStats, RawExample, TrainingExample
+from dataset_curator.deduplicator import (
+    CONTENT_HASH_SIZE,
+    Deduplicator,
+    DedupSession,
+    content_hash,
+)
+from dataset_curator.models import (
+    DatasetStats,
+    PipelineCheckpoint,
+    RawExample,
+    StageMetrics,
+    TrainingExample,
+)
+from dataset_curator.observer import PipelineObserver
+from dataset_curator.records import RecordBatch
+from dataset_curator.scoring import ScoringEngine
+from dataset_curator.stats import StatsAccumulator
 
-MAX_QUALITY_SCORE: float = 1.0
-QUALITY_NORMALIZATION_LENGTH: int = 500
-QUALITY_SCORE_PRECISION: int = 4
+DEFAULT_CHUNK_SIZE: int = 1000
+CHUNKS_IN_FLIGHT_PER_WORKER: int = 2
+DEFAULT_QUEUE_SIZE: int = 4
+DEFAULT_CHECKPOINT_INTERVAL: int = 100_000
+
+_END_OF_STAGE = object()
+
+# (raw examples in, clean seconds, convert seconds), or None when not timed
+ChunkTimings = tuple[int, float, float] | None
+
+
+def _no_clock() -> float:
+    """Stand-in for perf_counter when no observer is attached."""
+    return 0.0
+
+
+def _prepare_chunk(
+    cleaner: DataCleaner,
+    converter: FormatConverter,
+    deduplicator: Deduplicator,
+    raws: list[RawExample],
+    system_prompt: str,
+    cached: list[CacheEntry | None] | None = None,
+    timed: bool = False,
+    min_length: int = cleaner_module.DEFAULT_MIN_LENGTH,
+    max_length: int = cleaner_module.DEFAULT_MAX_LENGTH,
+) -> tuple[RecordBatch, list[CacheEntry], ChunkTimings]:
+    """Clean, validate, and convert a chunk of raw examples into a record batch.
+
+    The batch's normalized text and fingerprint columns are filled here, so
+    the deduplication stage reuses them instead of recomputing them per row.
+    Module-level so it can be pickled and run in worker processes.
+
+    Args:
+        cleaner: Text cleaner.
+        converter: Format converter.
+        deduplicator: Deduplicator whose normalization defines fingerprints.
+        raws: Raw examples of the chunk.
+        system_prompt: Optional system message for chat formatting.
+        cached: Cache lookups aligned with raws, or None when no cache is used.
+        timed: Whether to time the clean and convert stages.
+        min_length: Minimum character count of a valid cleaned text.
+        max_length: Maximum character count of a valid cleaned text.
+
+    Returns:
+        A tuple of (batch of valid records, entries computed for cache misses,
+        stage timings or None when not timed).
+    """
+    clock = perf_counter if timed else _no_clock
+    started = clock()
+    computed: list[CacheEntry] = []
+    if cached is None:
+        cleaned = cleaner.clean_and_validate([raw.content for raw in raws], min_length, max_length)
+        valid = [raw for raw, text in zip(raws, cleaned, strict=True) if text is not None]
+        cleaned_at = clock()
+        batch = converter.to_record_batch(valid, system_prompt)
+        batch.normalized = [deduplicator._normalize(content) for content in batch.contents]
+        batch.fingerprints = [content_hash(text) for text in batch.normalized]
+    else:
+        misses = [raw.content for raw, entry in zip(raws, cached, strict=True) if entry is None]
+        cleaned_misses = iter(cleaner.clean_and_validate(misses, min_length, max_length))
+        # Only computes sketches; identically configured to the session's index
+        index = deduplicator.index_factory() if misses else None
+        valid = []
+        fingerprints: list[bytes] = []
+        normalized: list[str] = []
+        sketches: list[bytes] = []
+        for raw, entry in zip(raws, cached, strict=True):
+            text = None
+            if entry is None:
+                cleaned_text = next(cleaned_misses)
+                text = deduplicator._normalize(raw.content)
+                entry = CacheEntry(
+                    cleaned_text or "",
+                    cleaned_text is not None,
+                    content_hash(text),
+                    index.sketch(text) if index is not None and cleaned_text is not None else b"",
+                )
+                computed.append(entry)
+            if entry.valid:
+                valid.append(raw)
+                fingerprints.append(entry.fingerprint)
+                normalized.append(deduplicator._normalize(raw.content) if text is None else text)
+                sketches.append(entry.sketch)
+        cleaned_at = clock()
+        batch = converter.to_record_batch(valid, system_prompt)
+        batch.fingerprints = fingerprints
+        batch.normalized = normalized
+        batch.sketches = sketches
+    if not timed:
+        return batch, computed, None
+    return batch, computed, (len(raws), cleaned_at - started, clock() - cleaned_at)
+
+
+def _cache_namespace(
+    cleaner: DataCleaner, deduplicator: Deduplicator, min_length: int, max_length: int
+) -> str:
+    """Describe the configuration that cached cleaning results depend on."""
+    index = deduplicator.index_factory()
+    try:
+        index_params = sorted(index.params().items())
+    except TypeError:
+        index_params = []
+    return "|".join(
+        [
+            f"{type(cleaner).__module__}.{type(cleaner).__qualname__}",
+            repr(sorted(vars(cleaner).items())),
+            f"{min_length}-{max_length}",
+            str(cleaner_module.MAX_CONSECUTIVE_NEWLINES),
+            unicodedata.unidata_version,
+            f"{type(deduplicator).__module__}.{type(deduplicator).__qualname__}",
+            str(CONTENT_HASH_SIZE),
+            f"{type(index).__module__}.{type(index).__qualname__}{index_params}",
+        ]
+    )
+
+
+def _chunked(raws: Iterable[RawExample], size: int) -> Iterator[list[RawExample]]:
+    """Split an iterable into lists of at most size items."""
+    iterator = iter(raws)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _achunked(
+    raws: AsyncIterable[RawExample] | Iterable[RawExample], size: int
+) -> AsyncIterator[list[RawExample]]:
+    """Split an async or regular iterable into lists of at most size items."""
+    if not isinstance(raws, AsyncIterable):
+        for chunk in _chunked(raws, size):
+            yield chunk
+        return
+    chunk: list[RawExample] = []
+    async for raw in raws:
+        chunk.append(raw)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def _run_stage(stage: Awaitable[None], output: "asyncio.Queue[object]") -> None:
+    """Run an async stage, then mark its output queue as finished or failed."""
+    try:
+        await stage
+    except Exception as exc:  # noqa: BLE001 - re-raised by the consuming stage
+        await output.put(exc)
+    else:
+        await output.put(_END_OF_STAGE)
+
+
+async def _drain(queue: "asyncio.Queue[object]") -> AsyncIterator[Any]:
+    """Yield items from a stage's output queue until it finishes, re-raising failures."""
+    while (item := await queue.get()) is not _END_OF_STAGE:
+        if isinstance(item, Exception):
+            raise item
+        yield item
 
 
 class CurationPipeline:
@@ -20,6 +211,13 @@ class CurationPipeline:
         cleaner: DataCleaner,
         converter: FormatConverter,
         deduplicator: Deduplicator,
+        workers: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache: CleanCache | None = None,
+        observer: PipelineObserver | None = None,
+        min_length: int = cleaner_module.DEFAULT_MIN_LENGTH,
+        max_length: int = cleaner_module.DEFAULT_MAX_LENGTH,
+        scorer: ScoringEngine | None = None,
     ) -> None:
         """Initialize the pipeline with its processing components.
 
@@ -27,10 +225,348 @@ class CurationPipeline:
             cleaner: Text cleaner for normalization and validation.
             converter: Format converter for chat-style output.
             deduplicator: Deduplicator for removing near-duplicate examples.
+            workers: Number of processes used for the clean, validate, and
+                convert stages. 1 runs them serially in the calling process.
+            chunk_size: Number of raw examples sent to a worker at a time.
+            cache: Optional persistent cache of cleaning results and dedup
+                fingerprints, consulted before cleaning each raw example.
+            observer: Optional observer receiving the wall time and item
+                counts of every stage. Stages are only timed when one is set.
+            min_length: Minimum character count of a cleaned example to keep.
+            max_length: Maximum character count of a cleaned example to keep.
+            scorer: Quality scoring engine; defaults to length-based scores
+                with no score floor.
+
+        Raises:
+            ValueError: If workers or chunk_size is less than 1, or
+                min_length is greater than max_length.
         """
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        if min_length > max_length:
+            raise ValueError(
+                f"min_length must not exceed max_length, got {min_length} and {max_length}"
+            )
         self.cleaner = cleaner
         self.converter = converter
         self.deduplicator = deduplicator
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.observer = observer
+        self.min_length = min_length
+        self.max_length = max_length
+        self.scorer = scorer if scorer is not None else ScoringEngine()
+
+    def _chunk_jobs(
+        self, chunks: Iterable[list[RawExample]], system_prompt: str
+    ) -> Iterator[tuple[list[bytes], tuple]]:
+        """Look chunks up in the cache and build the arguments of ``_prepare_chunk``.
+
+        Yields:
+            Pairs of (cache keys of the misses, ``_prepare_chunk`` arguments).
+        """
+        cache = self.cache
+        namespace = ""
+        if cache is not None:
+            namespace = _cache_namespace(
+                self.cleaner, self.deduplicator, self.min_length, self.max_length
+            )
+        for chunk in chunks:
+            miss_keys: list[bytes] = []
+            cached = None
+            if cache is not None:
+                keys = [cache.key(namespace, raw.content) for raw in chunk]
+                cached = cache.get_many(keys)
+                miss_keys = [key for key, hit in zip(keys, cached, strict=True) if hit is None]
+            timed = self.observer is not None
+            args = (
+                self.cleaner,
+                self.converter,
+                self.deduplicator,
+                chunk,
+                system_prompt,
+                cached,
+                timed,
+                self.min_length,
+                self.max_length,
+            )
+            yield miss_keys, args
+
+    def _store(self, miss_keys: list[bytes], computed: list[CacheEntry]) -> None:
+        """Write the entries computed for cache misses back to the cache."""
+        if self.cache is not None and computed:
+            self.cache.put_many(zip(miss_keys, computed, strict=True))
+
+    def _emit(
+        self, stage: str, seconds: float, items_in: int, items_out: int, comparisons: int = 0
+    ) -> None:
+        """Report the metrics of one stage to the observer."""
+        if self.observer is not None:
+            self.observer.on_stage(
+                StageMetrics(
+                    stage=stage,
+                    seconds=seconds,
+                    items_in=items_in,
+                    items_out=items_out,
+                    comparisons=comparisons,
+                )
+            )
+
+    def _prepare(
+        self, chunks: Iterable[list[RawExample]], system_prompt: str
+    ) -> Iterator[RecordBatch]:
+        """Clean, validate, and convert chunks of raw examples, preserving order.
+
+        With several workers, chunks are prepared on a process pool. At most
+        a few chunks per worker are in flight, so memory stays bounded for
+        arbitrarily long inputs. The cache is only accessed from this
+        process; workers compute the misses. Clean and convert timings are
+        measured where the chunk is prepared, so with several workers they
+        add up time spent across processes.
+        """
+        jobs = self._chunk_jobs(chunks, system_prompt)
+        if self.workers == 1:
+            for miss_keys, args in jobs:
+                yield self._finish_chunk(miss_keys, *_prepare_chunk(*args))
+            return
+
+        max_in_flight = self.workers * CHUNKS_IN_FLIGHT_PER_WORKER
+        pending: deque[
+            tuple[list[bytes], Future[tuple[RecordBatch, list[CacheEntry], ChunkTimings]]]
+        ]
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                for miss_keys, args in islice(jobs, max_in_flight - len(pending)):
+                    pending.append((miss_keys, pool.submit(_prepare_chunk, *args)))
+                if not pending:
+                    return
+                miss_keys, future = pending.popleft()
+                yield self._finish_chunk(miss_keys, *future.result())
+
+    def _finish_chunk(
+        self,
+        miss_keys: list[bytes],
+        batch: RecordBatch,
+        computed: list[CacheEntry],
+        timings: ChunkTimings,
+    ) -> RecordBatch:
+        """Store cache misses and report clean and convert metrics of a prepared chunk."""
+        self._store(miss_keys, computed)
+        if timings is not None:
+            raw_count, clean_seconds, convert_seconds = timings
+            self._emit("clean", clean_seconds, raw_count, len(batch))
+            self._emit("convert", convert_seconds, len(batch), len(batch))
+        return batch
+
+    def run_stream(
+        self,
+        raws: Iterable[RawExample],
+        system_prompt: str = "",
+        stats: StatsAccumulator | None = None,
+        session: DedupSession | None = None,
+    ) -> Generator[TrainingExample, None, DatasetStats]:
+        """Curate raw examples lazily, yielding each one as it passes every stage.
+
+        Only the deduplication index grows with the input; everything else is
+        processed one example (or, with several workers, a few chunks) at a time.
+
+        Args:
+            raws: Iterable of raw examples, consumed lazily.
+            system_prompt: Optional system message for chat formatting.
+            stats: Optional accumulator updated as examples are yielded, so
+                statistics can be read once the stream is exhausted.
+            session: Optional dedup session to continue, e.g. one loaded with
+                ``Deduplicator.load_session`` to skip examples kept in earlier runs.
+
+        Yields:
+            Curated, scored training examples in input order.
+
+        Returns:
+            The final dataset statistics.
+        """
+        if stats is None:
+            stats = StatsAccumulator()
+        if session is None:
+            session = self.deduplicator.session()
+
+        # With a single worker and no cache, records flow through one at a
+        # time; cache lookups are batched per chunk to amortize queries.
+        single = self.workers == 1 and self.cache is None
+        chunks = _chunked(raws, 1 if single else self.chunk_size)
+        # Clean, validate, and convert to compact records (possibly on a process pool)
+        for batch in self._prepare(chunks, system_prompt):
+            # Public pydantic models are only built at the API boundary
+            for record in self._curate(batch, stats, session).records():
+                yield record.to_training_example()
+
+        return stats.to_stats()
+
+    def run_batches(
+        self,
+        batches: Iterable[list[RawExample]],
+        system_prompt: str = "",
+        stats: StatsAccumulator | None = None,
+        session: DedupSession | None = None,
+    ) -> Generator[list[TrainingExample], None, DatasetStats]:
+        """Curate raw examples batch by batch using columnar stages.
+
+        Each batch is held as a RecordBatch. Validity filtering, quality
+        scoring, and statistics each make one pass over a column, and only
+        deduplication visits rows individually. Results match ``run_stream``.
+
+        Args:
+            batches: Iterable of raw example lists, consumed lazily.
+            system_prompt: Optional system message for chat formatting.
+            stats: Optional accumulator updated after every batch.
+            session: Optional dedup session to continue (see ``run_stream``).
+
+        Yields:
+            The curated, scored training examples of each input batch.
+
+        Returns:
+            The final dataset statistics.
+        """
+        if stats is None:
+            stats = StatsAccumulator()
+        if session is None:
+            session = self.deduplicator.session()
+
+        for batch in self._prepare(batches, system_prompt):
+            yield self._curate_batch(batch, stats, session)
+
+        return stats.to_stats()
+
+    def _curate(
+        self, batch: RecordBatch, stats: StatsAccumulator, session: DedupSession
+    ) -> RecordBatch:
+        """Deduplicate, score, and count a prepared batch, column by column.
+
+        Returns:
+            The rows that passed every stage, with their quality scores.
+        """
+        clock = perf_counter if self.observer is not None else _no_clock
+        started = clock()
+        comparisons = session.comparisons
+        sketches = batch.sketches or [b""] * len(batch)
+        session.prepare(batch.normalized)
+        unique = batch.select(
+            [
+                session.check_text(text, digest, sketch)
+                for text, digest, sketch in zip(
+                    batch.normalized, batch.fingerprints, sketches, strict=True
+                )
+            ]
+        )
+        deduped = clock()
+        scores = self.scorer.score_batch(unique.contents)
+        kept = unique.select([score is not None for score in scores])
+        kept.scores = array("d", [score for score in scores if score is not None])
+        scored = clock()
+        stats.record_duplicates(session)
+        stats.record_rejected(len(unique) - len(kept))
+        stats.add_batch(kept)
+        if self.observer is not None:
+            comparisons = session.comparisons - comparisons
+            self._emit("dedup", deduped - started, len(batch), len(unique), comparisons)
+            self._emit("score", scored - deduped, len(unique), len(kept))
+            self._emit("stats", clock() - scored, len(kept), len(kept))
+        return kept
+
+    def _curate_batch(
+        self, batch: RecordBatch, stats: StatsAccumulator, session: DedupSession
+    ) -> list[TrainingExample]:
+        """Curate a prepared batch and build the public examples of its kept rows."""
+        return self._curate(batch, stats, session).to_training_examples()
+
+    async def run_async(
+        self,
+        raws: AsyncIterable[RawExample] | Iterable[RawExample],
+        system_prompt: str = "",
+        stats: StatsAccumulator | None = None,
+        session: DedupSession | None = None,
+        executor: Executor | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> AsyncGenerator[list[TrainingExample], None]:
+        """Curate raw examples from an async source as a chain of concurrent stages.
+
+        Ingestion, cleaning and conversion, and deduplication run as separate
+        tasks joined by bounded queues, so a slow stage makes the ones before
+        it wait instead of buffering without limit. Cleaning and conversion
+        run on an executor, several chunks at a time; deduplication, scoring,
+        and statistics run on the event loop's default thread pool, one chunk
+        at a time in input order. The event loop stays free to read input and
+        to let the caller write output while chunks are processed. Results
+        match ``run_batches`` over chunks of ``chunk_size``.
+
+        Args:
+            raws: Async or regular iterable of raw examples, consumed lazily.
+            system_prompt: Optional system message for chat formatting.
+            stats: Optional accumulator updated after every chunk; read it
+                for the final statistics once iteration ends.
+            session: Optional dedup session to continue (see ``run_stream``).
+            executor: Executor for cleaning and conversion. Defaults to a
+                process pool of ``workers`` processes when workers > 1, and
+                to the event loop's default thread pool otherwise.
+            queue_size: Maximum number of chunks waiting between two stages.
+
+        Yields:
+            The curated, scored training examples of each chunk, in input order.
+
+        Raises:
+            ValueError: If queue_size is less than 1.
+        """
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        if stats is None:
+            stats = StatsAccumulator()
+        if session is None:
+            session = self.deduplicator.session()
+
+        loop = asyncio.get_running_loop()
+        own_executor = None
+        if executor is None and self.workers > 1:
+            executor = own_executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunks: asyncio.Queue[object] = asyncio.Queue(queue_size)
+        prepared: asyncio.Queue[object] = asyncio.Queue(queue_size)
+        curated: asyncio.Queue[object] = asyncio.Queue(queue_size)
+
+        async def ingest() -> None:
+            async for chunk in _achunked(raws, self.chunk_size):
+                await chunks.put(chunk)
+
+        async def prepare() -> None:
+            async for chunk in _drain(chunks):
+                miss_keys, args = next(self._chunk_jobs([chunk], system_prompt))
+                # Queued as a future so several chunks are prepared at once
+                await prepared.put(
+                    (miss_keys, loop.run_in_executor(executor, _prepare_chunk, *args))
+                )
+
+        async def curate() -> None:
+            async for miss_keys, future in _drain(prepared):
+                batch = self._finish_chunk(miss_keys, *await future)
+                examples = await loop.run_in_executor(
+                    None, self._curate_batch, batch, stats, session
+                )
+                await curated.put(examples)
+
+        tasks = [
+            asyncio.create_task(_run_stage(stage(), output))
+            for stage, output in ((ingest, chunks), (prepare, prepared), (curate, curated))
+        ]
+        try:
+            async for examples in _drain(curated):
+                yield examples
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if own_executor is not None:
+                own_executor.shutdown(cancel_futures=True)
 
     def run(
         self, raws: list[RawExample], system_prompt: str = ""
@@ -44,42 +580,150 @@ class CurationPipeline:
         Returns:
             A tuple of (curated training examples, dataset statistics).
         """
-        if not raws:
-            return [], DatasetStats(
-                total_examples=0, avg_quality=0.0, sources={}, duplicates_removed=0
-            )
+        stats = StatsAccumulator()
+        examples: list[TrainingExample] = []
+        for batch in self.run_batches(_chunked(raws, self.chunk_size), system_prompt, stats):
+            examples.extend(batch)
+        return examples, stats.to_stats()
 
-        # Clean: filter out invalid content
-        cleaned_raws = [
-            raw for raw in raws if self.cleaner.is_valid(self.cleaner.clean(raw.content))
-        ]
+    def _checkpoint_config(self, system_prompt: str) -> str:
+        """Describe the configuration a checkpointed run must be resumed with."""
+        deduplicator = self.deduplicator
+        factory = deduplicator.index_factory
+        return "|".join(
+            [
+                _cache_namespace(self.cleaner, deduplicator, self.min_length, self.max_length),
+                f"{deduplicator.threshold}",
+                getattr(factory, "__qualname__", type(factory).__qualname__),
+                f"{deduplicator.bloom_capacity}-{deduplicator.bloom_error_rate}",
+                ",".join(type(scorer).__qualname__ for scorer in self.scorer.scorers),
+                f"{self.scorer.floor}",
+                repr(system_prompt),
+            ]
+        )
 
-        # Convert to chat format
-        examples = self.converter.to_chat_batch(cleaned_raws, system_prompt)
+    def _save_checkpoint(
+        self,
+        directory: str,
+        previous: PipelineCheckpoint | None,
+        config: str,
+        input_offset: int,
+        out: BinaryIO,
+        session: DedupSession,
+        stats: StatsAccumulator,
+    ) -> PipelineCheckpoint:
+        """Make the output durable, then save the session and a new checkpoint.
 
-        # Deduplicate
-        unique_examples, duplicates_removed = self.deduplicator.deduplicate(examples)
+        ``DedupSession.save`` writes through ``atomic_replace``, so the new
+        session file and its directory entry are on disk before the
+        checkpoint that refers to it. The previous session file is only
+        removed once the new checkpoint, which no longer refers to it, has
+        replaced the old one.
+        """
+        out.flush()
+        os.fsync(out.fileno())
+        generation = previous.generation + 1 if previous is not None else 1
+        dedup_file = dedup_file_name(generation)
+        session.save(os.path.join(directory, dedup_file))
+        checkpoint = PipelineCheckpoint(
+            config=config,
+            generation=generation,
+            input_offset=input_offset,
+            output_position=out.tell(),
+            dedup_file=dedup_file,
+            dedup_counters=session.counters(),
+            stats=stats.to_stats(),
+            quality_sum=stats.quality_sum,
+        )
+        save_checkpoint(directory, checkpoint)
+        if previous is not None:
+            os.remove(os.path.join(directory, previous.dedup_file))
+        return checkpoint
 
-        # Compute quality scores based on content length (simple heuristic)
-        for ex in unique_examples:
-            user_content = " ".join(m.content for m in ex.messages if m.role == "user")
-            ex.quality_score = min(
-                len(user_content) / QUALITY_NORMALIZATION_LENGTH, MAX_QUALITY_SCORE
-            )
+    def run_checkpointed(
+        self,
+        raws: Iterable[RawExample],
+        output: str | os.PathLike[str],
+        checkpoint_dir: str | os.PathLike[str],
+        system_prompt: str = "",
+        interval: int = DEFAULT_CHECKPOINT_INTERVAL,
+    ) -> DatasetStats:
+        """Curate raw examples into a JSONL file, saving progress for crash recovery.
 
-        # Compute stats
-        source_counts = dict(Counter(ex.source for ex in unique_examples))
-        avg_quality = (
-            sum(ex.quality_score for ex in unique_examples) / len(unique_examples)
-            if unique_examples
-            else 0.0
-        )
+        Whenever at least interval more raw examples have been processed,
+        the output is flushed to disk and a checkpoint is saved in
+        checkpoint_dir: the number of raw examples consumed, the size of the
+        output file, the dedup session, and the statistics so far. Calling
+        this method again after an interruption truncates the output to the
+        last checkpoint, skips the raw examples it covers without cleaning or
+        deduplicating them, and carries on; calling it again once the run
+        has finished writes nothing. The output and statistics match ``run``
+        on the same input.
 
-        stats = DatasetStats(
-            total_examples=len(unique_examples),
-            avg_quality=round(avg_quality, QUALITY_SCORE_PRECISION),
-            sources=source_counts,
-            duplicates_removed=duplicates_removed,
-        )
+        Args:
+            raws: The whole input, in the same order on every attempt.
+            output: Destination of the curated JSONL, written uncompressed.
+            checkpoint_dir: Directory for the checkpoint files, created if missing.
+            system_prompt: Optional system message for chat formatting.
+            interval: Minimum number of raw examples between checkpoints.
+
+        Returns:
+            The statistics of the whole run, including earlier attempts.
+
+        Raises:
+            ValueError: If interval is less than 1, the checkpoint was saved
+                with a different configuration, or the output file is
+                shorter than the checkpoint records.
+            TypeError: If the similarity index does not support persistence.
+        """
+        if interval < 1:
+            raise ValueError(f"interval must be at least 1, got {interval}")
+        directory = os.fspath(checkpoint_dir)
+        os.makedirs(directory, exist_ok=True)
+        config = self._checkpoint_config(system_prompt)
+        checkpoint = load_checkpoint(directory)
+        stats = StatsAccumulator()
+        offset = 0
+        if checkpoint is None:
+            session = self.deduplicator.session()
+        else:
+            if checkpoint.config != config:
+                raise ValueError(
+                    f"{directory}: checkpoint was saved with a different pipeline configuration"
+                )
+            session = self.deduplicator.load_session(os.path.join(directory, checkpoint.dedup_file))
+            session.restore_counters(checkpoint.dedup_counters)
+            stats.merge(checkpoint.stats)
+            stats.quality_sum = checkpoint.quality_sum
+            offset = checkpoint.input_offset
+
+        chunk_sizes: deque[int] = deque()
+
+        def chunks() -> Iterator[list[RawExample]]:
+            for chunk in _chunked(islice(raws, offset, None), self.chunk_size):
+                chunk_sizes.append(len(chunk))
+                yield chunk
 
-        return unique_examples, stats
+        # Closing the session releases the memory map of a loaded one
+        with (
+            session,
+            open(output, "wb" if checkpoint is None else "r+b", buffering=FILE_BUFFER_SIZE) as out,
+        ):
+            if checkpoint is not None:
+                if os.fstat(out.fileno()).st_size < checkpoint.output_position:
+                    raise ValueError(f"{os.fspath(output)}: shorter than its checkpoint")
+                out.seek(checkpoint.output_position)
+                out.truncate()
+            saved_offset = offset
+            for batch in self._prepare(chunks(), system_prompt):
+                curated = self._curate(batch, stats, session).to_training_examples()
+                self.converter.write_jsonl(curated, out)
+                offset += chunk_sizes.popleft()
+                if offset - saved_offset >= interval:
+                    checkpoint = self._save_checkpoint(
+                        directory, checkpoint, config, offset, out, session, stats
+                    )
+                    saved_offset = offset
+            if checkpoint is None or offset > saved_offset:
+                self._save_checkpoint(directory, checkpoint, config, offset, out, session, stats)
+        return stats.to_stats()
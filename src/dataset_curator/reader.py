@@ -0,0 +1,122 @@
+"""Streaming JSONL ingestion into RawExample batches."""
+
+import json
+import os
+from collections.abc import Iterator
+from itertools import islice
+from typing import Any
+
+from dataset_curator._compression import (
+    AUTO_COMPRESSION,
+    FILE_BUFFER_SIZE,
+    resolve_compression,
+    wrap_compressed,
+)
+from dataset_curator.models import RawExample
+
+DEFAULT_BATCH_SIZE: int = 1000
+
+
+class JsonlReader:
+    """Reads (optionally compressed) JSONL files as RawExample objects.
+
+    Records are parsed lazily, so files of any size can be fed straight into
+    ``CurationPipeline.run_stream``::
+
+        pipeline.run_stream(JsonlReader(content_field="text").read("data.jsonl.gz"))
+    """
+
+    def __init__(
+        self,
+        source_field: str | None = "source",
+        content_field: str = "content",
+        metadata_field: str | None = "metadata",
+        default_source: str = "",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        validate: bool = True,
+        compression: str | None = AUTO_COMPRESSION,
+    ) -> None:
+        """Initialize the reader.
+
+        Args:
+            source_field: Record key mapped to ``RawExample.source``, or None
+                to use default_source for every record.
+            content_field: Record key mapped to ``RawExample.content``.
+            metadata_field: Record key mapped to ``RawExample.metadata``, or
+                None to collect every other key of the record as metadata.
+            default_source: Source used when the source field is absent.
+            batch_size: Number of examples per batch from ``read_batches``.
+            validate: Validate records with pydantic. Disable only for
+                trusted inputs; records are then built with ``model_construct``.
+            compression: ``gzip``, ``bz2``, ``xz``, ``zstd``, None, or ``auto``
+                to infer it from each path suffix.
+
+        Raises:
+            ValueError: If batch_size is less than 1.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.source_field = source_field
+        self.content_field = content_field
+        self.metadata_field = metadata_field
+        self.default_source = default_source
+        self.batch_size = batch_size
+        self.validate = validate
+        self.compression = compression
+
+    def _to_example(self, record: dict[str, Any]) -> RawExample:
+        """Map a decoded JSON record onto a RawExample."""
+        source = self.default_source
+        if self.source_field is not None:
+            source = record.get(self.source_field, self.default_source)
+        content = record[self.content_field]
+        if self.metadata_field is None:
+            skip = {self.source_field, self.content_field}
+            metadata = {k: v for k, v in record.items() if k not in skip}
+        else:
+            metadata = record.get(self.metadata_field) or {}
+        if self.validate:
+            return RawExample(source=source, content=content, metadata=metadata)
+        return RawExample.model_construct(source=source, content=content, metadata=metadata)
+
+    def read(self, path: str | os.PathLike[str]) -> Iterator[RawExample]:
+        """Lazily read every record of a JSONL file.
+
+        Blank lines are skipped.
+
+        Args:
+            path: Path of the JSONL file.
+
+        Yields:
+            One RawExample per record, in file order.
+
+        Raises:
+            ValueError: If a line is not valid JSON, is not an object, or
+                lacks the content field.
+        """
+        compression = resolve_compression(path, self.compression)
+        with (
+            open(path, "rb", buffering=FILE_BUFFER_SIZE) as raw,
+            wrap_compressed(raw, "rb", compression) as lines,
+        ):
+            for line_number, line in enumerate(lines, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    example = self._to_example(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError, AttributeError) as exc:
+                    raise ValueError(f"{os.fspath(path)}:{line_number}: invalid record") from exc
+                yield example
+
+    def read_batches(self, path: str | os.PathLike[str]) -> Iterator[list[RawExample]]:
+        """Lazily read a JSONL file in lists of up to batch_size examples.
+
+        Args:
+            path: Path of the JSONL file.
+
+        Yields:
+            Lists of RawExample objects, in file order.
+        """
+        examples = self.read(path)
+        while batch := list(islice(examples, self.batch_size)):
+            yield batch
@@ -0,0 +1,110 @@
+"""Compact internal records used on the pipeline hot path."""
+
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+
+from dataset_curator.models import ChatMessage, TrainingExample
+
+
+@dataclass(slots=True)
+class ExampleRecord:
+    """Slotted stand-in for a chat-formatted TrainingExample.
+
+    Holds only what the pipeline stages need and is never validated. It is
+    turned into a public ``TrainingExample`` at the API boundary.
+    """
+
+    source: str
+    content: str
+    system_prompt: str = ""
+    quality_score: float = 0.0
+
+    def to_training_example(self) -> TrainingExample:
+        """Build the equivalent chat-formatted TrainingExample.
+
+        Fields are already well-typed, so models are built without validation.
+
+        Returns:
+            A training example with optional system, user, and empty assistant messages.
+        """
+        messages: list[ChatMessage] = []
+        if self.system_prompt:
+            messages.append(ChatMessage.model_construct(role="system", content=self.system_prompt))
+        messages.append(ChatMessage.model_construct(role="user", content=self.content))
+        messages.append(ChatMessage.model_construct(role="assistant", content=""))
+        return TrainingExample.model_construct(
+            messages=messages, quality_score=self.quality_score, source=self.source
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ExampleFeatures:
+    """Dedup features of one example, computed once and shared by every stage.
+
+    Exact and near-duplicate checks need the normalized user text and its
+    hash; computing them together avoids extracting and normalizing the user
+    text once per check.
+    """
+
+    normalized: str
+    digest: bytes
+
+
+@dataclass(slots=True)
+class RecordBatch:
+    """Column-oriented batch of records sharing one system prompt.
+
+    Per-example numbers live in typed ``array`` columns so pipeline stages
+    can score, filter, and aggregate a whole batch in a single pass. The
+    ``normalized`` and ``fingerprints`` columns hold the ``ExampleFeatures``
+    of each row once the batch has been prepared; ``sketches`` holds cached
+    similarity-index sketches and stays empty when no cache is used.
+    """
+
+    sources: list[str]
+    contents: list[str]
+    scores: array = field(default_factory=lambda: array("d"))
+    system_prompt: str = ""
+    fingerprints: list[bytes] = field(default_factory=list)
+    normalized: list[str] = field(default_factory=list)
+    sketches: list[bytes] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Return the number of examples in the batch."""
+        return len(self.contents)
+
+    def select(self, mask: Iterable[bool]) -> "RecordBatch":
+        """Keep only the rows whose mask entry is true.
+
+        Args:
+            mask: One flag per row.
+
+        Returns:
+            A new batch with the selected rows of every column.
+        """
+        mask = list(mask)
+        return RecordBatch(
+            sources=list(compress(self.sources, mask)),
+            contents=list(compress(self.contents, mask)),
+            scores=array("d", compress(self.scores, mask)),
+            system_prompt=self.system_prompt,
+            fingerprints=list(compress(self.fingerprints, mask)),
+            normalized=list(compress(self.normalized, mask)),
+            sketches=list(compress(self.sketches, mask)),
+        )
+
+    def records(self) -> Iterator[ExampleRecord]:
+        """Yield the rows of the batch as individual records."""
+        scores = self.scores or repeat(0.0)
+        for source, content, score in zip(self.sources, self.contents, scores, strict=False):
+            yield ExampleRecord(source, content, self.system_prompt, score)
+
+    def to_training_examples(self) -> list[TrainingExample]:
+        """Build the public TrainingExample for every row.
+
+        Returns:
+            Training examples in batch order.
+        """
+        return [record.to_training_example() for record in self.records()]
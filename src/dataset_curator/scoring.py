@@ -0,0 +1,336 @@
+"""Pluggable quality scoring with batched scorers and early rejection."""
+
+import math
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Iterable, Sequence
+
+MAX_QUALITY_SCORE: float = 1.0
+QUALITY_NORMALIZATION_LENGTH: int = 500
+DEFAULT_REPETITION_NGRAM_SIZE: int = 3
+# Bits of character-class entropy at which prose scores 1.0; English text
+# (letters, spaces, some punctuation) typically reaches 0.8-1.0.
+TARGET_CLASS_ENTROPY: float = 0.8
+MIN_MEAN_WORD_LENGTH: float = 3.0
+MAX_MEAN_WORD_LENGTH: float = 10.0
+WORD_LENGTH_PENALTY: float = 0.5
+DEFAULT_PERPLEXITY_ORDER: int = 3
+DEFAULT_SMOOTHING: float = 1.0
+
+
+class QualityScorer(ABC):
+    """Scores whole batches of user texts in [0, 1], higher meaning better.
+
+    Subclasses set ``name`` and ``cost`` and override ``score_batch``.
+    ``cost`` is a relative per-example cost used by ``ScoringEngine`` to
+    run cheap scorers first.
+    """
+
+    name: str = ""
+    cost: float = 1.0
+
+    @abstractmethod
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score a batch of texts.
+
+        Args:
+            texts: User texts of the examples.
+
+        Returns:
+            One score in [0, 1] per text.
+        """
+
+
+class LengthScorer(QualityScorer):
+    """Longer texts score higher, up to a normalization length."""
+
+    name = "length"
+    cost = 0.0
+
+    def __init__(self, normalization_length: int = QUALITY_NORMALIZATION_LENGTH) -> None:
+        """Initialize the scorer.
+
+        Args:
+            normalization_length: Length at and above which texts score 1.0.
+
+        Raises:
+            ValueError: If normalization_length is less than 1.
+        """
+        if normalization_length < 1:
+            raise ValueError(f"normalization_length must be at least 1, got {normalization_length}")
+        self.normalization_length = normalization_length
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score each text by its length relative to the normalization length."""
+        n = self.normalization_length
+        return [min(len(text) / n, MAX_QUALITY_SCORE) for text in texts]
+
+
+class RepetitionScorer(QualityScorer):
+    """Penalizes texts that repeat the same word n-grams."""
+
+    name = "repetition"
+    cost = 2.0
+
+    def __init__(self, ngram_size: int = DEFAULT_REPETITION_NGRAM_SIZE) -> None:
+        """Initialize the scorer.
+
+        Args:
+            ngram_size: Number of words per n-gram.
+
+        Raises:
+            ValueError: If ngram_size is less than 1.
+        """
+        if ngram_size < 1:
+            raise ValueError(f"ngram_size must be at least 1, got {ngram_size}")
+        self.ngram_size = ngram_size
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score each text by the fraction of its word n-grams that are distinct."""
+        size = self.ngram_size
+        scores = []
+        for text in texts:
+            words = text.lower().split()
+            ngrams = [tuple(words[i : i + size]) for i in range(len(words) - size + 1)]
+            scores.append(len(set(ngrams)) / len(ngrams) if ngrams else MAX_QUALITY_SCORE)
+        return scores
+
+
+class CharacterEntropyScorer(QualityScorer):
+    """Penalizes texts made of a single kind of character, e.g. digit dumps.
+
+    Characters are grouped by their Unicode major category (letter, number,
+    punctuation, symbol, separator, mark, other; whitespace counts as a
+    separator) and the Shannon entropy of the group distribution is compared
+    with a target.
+    """
+
+    name = "entropy"
+    cost = 3.0
+
+    def __init__(self, target: float = TARGET_CLASS_ENTROPY) -> None:
+        """Initialize the scorer.
+
+        Args:
+            target: Entropy in bits at and above which texts score 1.0.
+
+        Raises:
+            ValueError: If target is not positive.
+        """
+        if target <= 0:
+            raise ValueError(f"target must be positive, got {target}")
+        self.target = target
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score each text by the entropy of its character classes."""
+        scores = []
+        for text in texts:
+            classes = Counter(
+                "Z" if char.isspace() else unicodedata.category(char)[0] for char in text
+            )
+            total = len(text)
+            entropy = -sum(n / total * math.log2(n / total) for n in classes.values())
+            scores.append(min(entropy / self.target, MAX_QUALITY_SCORE))
+        return scores
+
+
+class LanguageScorer(QualityScorer):
+    """Rewards texts that look like natural language.
+
+    The score is the fraction of words containing a letter, halved when the
+    mean word length falls outside the range typical of prose.
+    """
+
+    name = "language"
+    cost = 1.0
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score each text by its alphabetic word ratio and mean word length."""
+        scores = []
+        for text in texts:
+            words = text.split()
+            if not words:
+                scores.append(0.0)
+                continue
+            alphabetic = sum(1 for word in words if any(char.isalpha() for char in word))
+            score = alphabetic / len(words)
+            mean_length = sum(map(len, words)) / len(words)
+            if not MIN_MEAN_WORD_LENGTH <= mean_length <= MAX_MEAN_WORD_LENGTH:
+                score *= WORD_LENGTH_PENALTY
+            scores.append(score)
+        return scores
+
+
+class NgramPerplexityScorer(QualityScorer):
+    """Scores texts by their perplexity under a local character n-gram model.
+
+    The model is trained on reference texts of the desired quality, with
+    add-k smoothing. A text scores 1.0 when it is at most as surprising as
+    the reference corpus itself and proportionally less the more surprising
+    it is.
+    """
+
+    name = "perplexity"
+    cost = 10.0
+
+    def __init__(
+        self,
+        reference: Iterable[str],
+        order: int = DEFAULT_PERPLEXITY_ORDER,
+        smoothing: float = DEFAULT_SMOOTHING,
+    ) -> None:
+        """Train the model.
+
+        Args:
+            reference: Texts representative of good examples.
+            order: Number of characters per n-gram, context included.
+            smoothing: Pseudo-count added to every n-gram.
+
+        Raises:
+            ValueError: If order is less than 1, smoothing is not positive,
+                or reference is empty.
+        """
+        if order < 1:
+            raise ValueError(f"order must be at least 1, got {order}")
+        if smoothing <= 0:
+            raise ValueError(f"smoothing must be positive, got {smoothing}")
+        self.order = order
+        self.smoothing = smoothing
+        self._ngrams: Counter[str] = Counter()
+        self._contexts: Counter[str] = Counter()
+        vocabulary: set[str] = set()
+        texts = list(reference)
+        for text in texts:
+            padded = self._pad(text)
+            vocabulary.update(text)
+            for i in range(order - 1, len(padded)):
+                self._ngrams[padded[i - order + 1 : i + 1]] += 1
+                self._contexts[padded[i - order + 1 : i]] += 1
+        if not self._ngrams:
+            raise ValueError("reference must contain at least one non-empty text")
+        # One extra symbol for characters never seen in the reference
+        self._vocabulary_size = len(vocabulary) + 1
+        self.reference_perplexity = math.exp(sum(map(self._log_loss, texts)) / sum(map(len, texts)))
+
+    def _pad(self, text: str) -> str:
+        """Prefix text with start symbols so its first characters have a context."""
+        return "\0" * (self.order - 1) + text
+
+    def _log_loss(self, text: str) -> float:
+        """Total negative log-likelihood of text's characters, in nats."""
+        padded = self._pad(text)
+        k = self.smoothing
+        denominator = k * self._vocabulary_size
+        loss = 0.0
+        for i in range(self.order - 1, len(padded)):
+            count = self._ngrams.get(padded[i - self.order + 1 : i + 1], 0)
+            context = self._contexts.get(padded[i - self.order + 1 : i], 0)
+            loss -= math.log((count + k) / (context + denominator))
+        return loss
+
+    def perplexity(self, text: str) -> float:
+        """Per-character perplexity of text under the model (1.0 for empty text)."""
+        return math.exp(self._log_loss(text) / len(text)) if text else 1.0
+
+    def score_batch(self, texts: Sequence[str]) -> list[float]:
+        """Score each text by the reference perplexity relative to its own."""
+        reference = self.reference_perplexity
+        return [min(reference / self.perplexity(text), MAX_QUALITY_SCORE) for text in texts]
+
+
+# Scorer name -> factory; factories are called without arguments
+SCORERS: dict[str, Callable[[], QualityScorer]] = {
+    LengthScorer.name: LengthScorer,
+    RepetitionScorer.name: RepetitionScorer,
+    CharacterEntropyScorer.name: CharacterEntropyScorer,
+    LanguageScorer.name: LanguageScorer,
+}
+
+
+def register_scorer(name: str, factory: Callable[[], QualityScorer]) -> None:
+    """Make a scorer available by name, e.g. to ``create_scorer`` and the CLI.
+
+    Args:
+        name: Registry name.
+        factory: Zero-argument callable returning a scorer.
+
+    Raises:
+        ValueError: If name is already registered.
+    """
+    if name in SCORERS:
+        raise ValueError(f"Scorer {name!r} is already registered")
+    SCORERS[name] = factory
+
+
+def create_scorer(name: str) -> QualityScorer:
+    """Create a registered scorer.
+
+    Args:
+        name: Registry name, a key of ``SCORERS``.
+
+    Returns:
+        A new scorer.
+
+    Raises:
+        ValueError: If name is not registered.
+    """
+    if name not in SCORERS:
+        raise ValueError(f"Unknown scorer {name!r}; expected one of {sorted(SCORERS)}")
+    return SCORERS[name]()
+
+
+class ScoringEngine:
+    """Combines scorers into one quality score, rejecting weak examples early.
+
+    The quality score of an example is the product of its scorer scores.
+    Scorers run from cheapest to most expensive, each on a whole batch.
+    Because every score is at most 1.0, the running product only falls: as
+    soon as it drops below the floor the example is rejected and later,
+    more expensive scorers never see it.
+    """
+
+    def __init__(self, scorers: Sequence[QualityScorer] | None = None, floor: float = 0.0) -> None:
+        """Initialize the engine.
+
+        Args:
+            scorers: Scorers to combine; defaults to a ``LengthScorer``.
+            floor: Minimum quality score of a kept example. 0.0 keeps everything.
+
+        Raises:
+            ValueError: If floor is outside [0, 1] or scorers is empty.
+        """
+        if not 0.0 <= floor <= MAX_QUALITY_SCORE:
+            raise ValueError(f"floor must be between 0 and 1, got {floor}")
+        if scorers is None:
+            scorers = [LengthScorer()]
+        if not scorers:
+            raise ValueError("At least one scorer is required")
+        self.scorers = sorted(scorers, key=lambda scorer: scorer.cost)
+        self.floor = floor
+
+    def score_batch(self, texts: Sequence[str]) -> list[float | None]:
+        """Score a batch of texts.
+
+        Args:
+            texts: User texts of the examples.
+
+        Returns:
+            One quality score per text, or None for texts rejected below the floor.
+        """
+        scores: list[float | None] = [MAX_QUALITY_SCORE] * len(texts)
+        alive = list(range(len(texts)))
+        for scorer in self.scorers:
+            if not alive:
+                break
+            survivors = []
+            batch_scores = scorer.score_batch([texts[i] for i in alive])
+            for i, score in zip(alive, batch_scores, strict=True):
+                combined = scores[i] * score  # type: ignore[operator]
+                if combined < self.floor:
+                    scores[i] = None
+                else:
+                    scores[i] = combined
+                    survivors.append(i)
+            alive = survivors
+        return scores
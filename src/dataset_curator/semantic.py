@@ -0,0 +1,230 @@
+"""Embedding-based similarity index for catching paraphrased duplicates.
+
+Requires numpy, available through the ``semantic`` extra.
+"""
+
+import re
+import zlib
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+from dataset_curator.similarity import DEFAULT_SEED, SimilarityIndex, TextStore
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None
+
+DEFAULT_EMBEDDING_DIM: int = 512
+DEFAULT_CHAR_NGRAM_SIZE: int = 3
+DEFAULT_COSINE_THRESHOLD: float = 0.9
+DEFAULT_HASH_BITS: int = 10
+DEFAULT_HASH_TABLES: int = 16
+INITIAL_CAPACITY: int = 1024
+
+_WORD = re.compile(r"\w+")
+
+# Maps a batch of texts to an array of shape (len(texts), dim)
+Embedder = Callable[[Sequence[str]], Any]
+
+
+def _require_numpy() -> None:
+    """Raise a helpful error when the optional numpy dependency is missing."""
+    if np is None:
+        raise ImportError(
+            "Semantic deduplication requires numpy; install dataset-curator[semantic]"
+        )
+
+
+class HashingVectorizer:
+    """Local embedding function: hashed bag of words and character n-grams.
+
+    Each word and each character n-gram of each word is hashed to one of dim
+    signed buckets, and every vector is scaled to unit length. Texts that
+    reuse the same words in a different order or form get close vectors,
+    without any model download, network access, or GPU.
+    """
+
+    def __init__(
+        self, dim: int = DEFAULT_EMBEDDING_DIM, ngram_size: int = DEFAULT_CHAR_NGRAM_SIZE
+    ) -> None:
+        """Initialize the vectorizer.
+
+        Args:
+            dim: Number of dimensions of the vectors.
+            ngram_size: Length of the character n-grams taken from each word.
+
+        Raises:
+            ImportError: If numpy is not installed.
+            ValueError: If dim or ngram_size is less than 1.
+        """
+        _require_numpy()
+        if dim < 1 or ngram_size < 1:
+            raise ValueError(f"dim and ngram_size must be positive, got {dim} and {ngram_size}")
+        self.dim = dim
+        self.ngram_size = ngram_size
+
+    def _features(self, text: str) -> Iterable[str]:
+        """Yield the words of text and the character n-grams of each word."""
+        size = self.ngram_size
+        for word in _WORD.findall(text.lower()):
+            yield word
+            padded = f"<{word}>"
+            for i in range(len(padded) - size + 1):
+                yield padded[i : i + size]
+
+    def __call__(self, texts: Sequence[str]) -> "np.ndarray":
+        """Embed a batch of texts.
+
+        Args:
+            texts: Texts to embed.
+
+        Returns:
+            A float32 array of shape (len(texts), dim) with unit-length rows
+            (all-zero rows for texts without words).
+        """
+        rows: list[int] = []
+        columns: list[int] = []
+        signs: list[float] = []
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                h = zlib.crc32(feature.encode())
+                rows.append(row)
+                columns.append(h % self.dim)
+                signs.append(1.0 if h >> 31 else -1.0)
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (rows, columns), signs)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class SemanticIndex(SimilarityIndex):
+    """Cosine-similarity index over text embeddings with random-projection LSH.
+
+    Each vector is hashed by the signs of its projections onto random
+    hyperplanes, split into tables of bits hyperplanes each. A lookup only
+    scores the stored vectors sharing a bucket with the query in at least
+    one table, so its cost grows with the bucket sizes rather than with
+    the number of stored texts. Candidates are scored exactly, with one
+    matrix product per lookup; ``prepare`` embeds and hashes a whole batch
+    at once.
+
+    Duplicates are decided by the cosine threshold of this index; the
+    deduplicator's character-level threshold and similarity are not used.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder | None = None,
+        threshold: float = DEFAULT_COSINE_THRESHOLD,
+        bits: int = DEFAULT_HASH_BITS,
+        tables: int = DEFAULT_HASH_TABLES,
+        seed: int = DEFAULT_SEED,
+    ) -> None:
+        """Initialize an empty index.
+
+        Args:
+            embedder: Function mapping a batch of texts to an array of
+                vectors; defaults to a ``HashingVectorizer``.
+            threshold: Cosine similarity at or above which texts are duplicates.
+            bits: Number of hyperplanes per hash table. More bits make
+                buckets smaller and lookups faster but lower recall.
+            tables: Number of hash tables. More tables raise recall.
+            seed: Seed for the random hyperplanes.
+
+        Raises:
+            ImportError: If numpy is not installed.
+            ValueError: If bits or tables is less than 1.
+        """
+        _require_numpy()
+        if bits < 1 or tables < 1:
+            raise ValueError(f"bits and tables must be positive, got {bits} and {tables}")
+        self.embedder = embedder if embedder is not None else HashingVectorizer()
+        self.threshold = threshold
+        self.bits = bits
+        self.tables = tables
+        self.seed = seed
+        self.texts = TextStore()
+        self._planes: np.ndarray | None = None
+        self._weights = 1 << np.arange(bits, dtype=np.int64)
+        self._vectors: np.ndarray | None = None
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(tables)]
+        # Vector and bucket keys of the prepared batch, or of the last text
+        # looked up, since a lookup is usually followed by adding the text
+        self._embedded: dict[str, tuple[np.ndarray, list[int]]] = {}
+
+    def _project(self, vectors: "np.ndarray") -> list[list[int]]:
+        """Compute the bucket key of every row of vectors in every table."""
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            planes = rng.standard_normal((self.tables * self.bits, vectors.shape[1]))
+            self._planes = planes.astype(np.float32)
+        signs = (vectors @ self._planes.T > 0).reshape(len(vectors), self.tables, self.bits)
+        return (signs @ self._weights).tolist()
+
+    def prepare(self, texts: Sequence[str]) -> None:
+        """Embed a batch of texts with one embedder call and one projection."""
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return
+        vectors = np.asarray(self.embedder(unique), dtype=np.float32)
+        self._embedded = dict(zip(unique, zip(vectors, self._project(vectors), strict=True)))
+
+    def _embed(self, text: str) -> tuple["np.ndarray", list[int]]:
+        """Return the vector of text and its bucket key in every table."""
+        embedded = self._embedded.get(text)
+        if embedded is None:
+            vectors = np.asarray(self.embedder([text]), dtype=np.float32)
+            embedded = vectors[0], self._project(vectors)[0]
+            self._embedded = {text: embedded}
+        return embedded
+
+    def _neighbors(self, text: str) -> tuple[list[int], "np.ndarray"]:
+        """Return candidate positions sharing a bucket with text, with their cosines."""
+        vector, keys = self._embed(text)
+        positions: set[int] = set()
+        for bucket, key in zip(self._buckets, keys, strict=True):
+            positions.update(bucket.get(key, ()))
+        if not positions:
+            return [], np.empty(0, dtype=np.float32)
+        ordered = sorted(positions)
+        return ordered, self._vectors[ordered] @ vector  # type: ignore[index]
+
+    def candidates(self, text: str) -> Iterable[str]:
+        """Return stored texts whose cosine similarity reaches the threshold."""
+        positions, scores = self._neighbors(text)
+        return [
+            self.texts[p]
+            for p, score in zip(positions, scores, strict=True)
+            if score >= self.threshold
+        ]
+
+    def find_duplicate(
+        self, text: str, threshold: float, similarity: Callable[[str, str], float]
+    ) -> str | None:
+        """Find the stored text closest to text if it is within the cosine threshold.
+
+        The threshold and similarity arguments are ignored in favor of the
+        index's own cosine threshold. Every cosine computed counts in ``scored``.
+        """
+        positions, scores = self._neighbors(text)
+        self.scored += len(positions)
+        if not scores.size:
+            return None
+        best = int(scores.argmax())
+        return self.texts[positions[best]] if scores[best] >= self.threshold else None
+
+    def add(self, text: str) -> None:
+        """Store text, its vector, and its bucket keys."""
+        vector, keys = self._embed(text)
+        position = len(self.texts)
+        if self._vectors is None:
+            self._vectors = np.empty((INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+        elif position == len(self._vectors):
+            grown = np.empty((2 * position, self._vectors.shape[1]), dtype=np.float32)
+            grown[:position] = self._vectors
+            self._vectors = grown
+        self._vectors[position] = vector
+        self.texts.append(text)
+        for bucket, key in zip(self._buckets, keys, strict=True):
+            bucket.setdefault(key, []).append(position)
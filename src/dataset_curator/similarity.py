@@ -0,0 +1,547 @@
+"""Similarity indexes used to look up near-duplicate candidates during deduplication."""
+
+import random
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from itertools import chain
+from typing import Any, Protocol, overload
+
+DEFAULT_NUM_PERM: int = 64
+DEFAULT_BANDS: int = 16
+DEFAULT_SHINGLE_SIZE: int = 5
+DEFAULT_SEED: int = 1
+MERSENNE_PRIME: int = (1 << 61) - 1
+BAND_KEY_MULTIPLIER: int = 1_000_003
+DEFAULT_NGRAM_SIZE: int = 8
+
+
+class BandLookup(Protocol):
+    """Read access to persisted LSH buckets."""
+
+    def lookup(self, band: int, key: int) -> Iterable[int]:
+        """Return the positions stored under key in a band."""
+        ...
+
+    def entries(self, band: int) -> Iterable[tuple[int, int]]:
+        """Return every (key, position) pair of a band."""
+        ...
+
+
+class LengthLookup(Protocol):
+    """Read access to a persisted table of text lengths."""
+
+    def window(self, shortest: int, longest: int) -> Iterable[int]:
+        """Return the positions of texts whose length lies in [shortest, longest]."""
+        ...
+
+    def entries(self) -> Iterable[tuple[int, int]]:
+        """Return every (length, position) pair, sorted."""
+        ...
+
+
+class TextStore(Sequence[str]):
+    """Append-only text sequence layered on top of read-only history.
+
+    History (e.g. texts memory-mapped from a saved index) keeps the first
+    positions; texts added afterwards follow it.
+    """
+
+    def __init__(self, history: Sequence[str] = ()) -> None:
+        """Initialize the store.
+
+        Args:
+            history: Texts accepted in earlier runs.
+        """
+        self.history = history
+        self.added: list[str] = []
+
+    def __len__(self) -> int:
+        """Return the number of stored texts."""
+        return len(self.history) + len(self.added)
+
+    @overload
+    def __getitem__(self, position: int) -> str: ...
+
+    @overload
+    def __getitem__(self, position: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, position: int | slice) -> str | Sequence[str]:
+        """Return the text stored at a position."""
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        offset = len(self.history)
+        return self.history[position] if position < offset else self.added[position - offset]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over history, then added texts."""
+        return chain(self.history, self.added)
+
+    def append(self, text: str) -> None:
+        """Store a new text after everything already stored."""
+        self.added.append(text)
+
+
+class SimilarityIndex(ABC):
+    """Stores accepted texts and finds the ones a new text may duplicate."""
+
+    # Candidates scored by the index's own measure instead of the similarity
+    # passed to find_duplicate, which counts its own calls
+    scored: int = 0
+
+    @abstractmethod
+    def candidates(self, text: str) -> Iterable[str]:
+        """Return previously added texts that may be similar to text.
+
+        Args:
+            text: Normalized text to look up.
+
+        Returns:
+            Candidate texts in insertion order.
+        """
+
+    @abstractmethod
+    def add(self, text: str) -> None:
+        """Add an accepted text to the index.
+
+        Args:
+            text: Normalized text to store.
+        """
+
+    def find_duplicate(
+        self, text: str, threshold: float, similarity: Callable[[str, str], float]
+    ) -> str | None:
+        """Find the first candidate that reaches the similarity threshold.
+
+        Indexes with their own search strategy override this method;
+        ``find_match`` is derived from it.
+
+        Args:
+            text: Normalized text to look up.
+            threshold: Similarity ratio at or above which texts are duplicates.
+            similarity: Function computing the exact similarity of two texts.
+
+        Returns:
+            The stored text that text duplicates, or None.
+        """
+        for candidate in self.candidates(text):
+            if similarity(text, candidate) >= threshold:
+                return candidate
+        return None
+
+    def find_match(
+        self, text: str, threshold: float, similarity: Callable[[str, str], float]
+    ) -> bool:
+        """Check whether any candidate reaches the similarity threshold.
+
+        Args:
+            text: Normalized text to look up.
+            threshold: Similarity ratio at or above which texts are duplicates.
+            similarity: Function computing the exact similarity of two texts.
+
+        Returns:
+            True if text duplicates a previously added text.
+        """
+        return self.find_duplicate(text, threshold, similarity) is not None
+
+    def prepare(self, texts: Sequence[str]) -> None:
+        """Precompute per-text data for a batch of texts about to be looked up.
+
+        Indexes that can process many texts at once more cheaply than one
+        at a time override this; lookups of other texts still work.
+
+        Args:
+            texts: Normalized texts, in the order they will be looked up.
+        """
+
+    def sketch(self, text: str) -> bytes:
+        """Serialize the per-text data a lookup derives from text, for caching.
+
+        Indexes whose lookups hash text into a signature return it, so a
+        pipeline cache can store it and skip the computation on reruns;
+        others have nothing worth caching.
+
+        Args:
+            text: Normalized text.
+
+        Returns:
+            Opaque bytes to pass to ``prime``, or empty bytes.
+        """
+        return b""
+
+    def prime(self, text: str, sketch: bytes) -> None:
+        """Reuse a cached sketch for the next lookup and addition of text.
+
+        Args:
+            text: Normalized text about to be looked up.
+            sketch: Result of ``sketch(text)`` from an identically configured index.
+        """
+
+    def params(self) -> dict[str, Any]:
+        """Describe the configuration a persisted index must match.
+
+        Raises:
+            TypeError: If the index cannot be persisted.
+        """
+        raise TypeError(f"{type(self).__name__} does not support persistence")
+
+    def attach_history(
+        self,
+        texts: Sequence[str],
+        bands: BandLookup | None = None,
+        lengths: LengthLookup | None = None,
+    ) -> None:
+        """Seed an empty index with texts accepted in earlier runs.
+
+        Args:
+            texts: Historical texts, in acceptance order.
+            bands: Persisted LSH buckets, for indexes that use them.
+            lengths: Persisted text lengths, for indexes that use them.
+
+        Raises:
+            TypeError: If the index cannot be persisted.
+        """
+        raise TypeError(f"{type(self).__name__} does not support persistence")
+
+
+class ExhaustiveIndex(SimilarityIndex):
+    """Index that offers every stored text as a candidate (exact pairwise scan)."""
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.texts = TextStore()
+
+    def candidates(self, text: str) -> Iterable[str]:
+        """Return every stored text."""
+        return self.texts
+
+    def add(self, text: str) -> None:
+        """Append text to the stored texts."""
+        self.texts.append(text)
+
+    def params(self) -> dict[str, Any]:
+        """Return the (empty) configuration of the index."""
+        return {}
+
+    def attach_history(
+        self,
+        texts: Sequence[str],
+        bands: BandLookup | None = None,
+        lengths: LengthLookup | None = None,
+    ) -> None:
+        """Seed the index with historical texts."""
+        self.texts = TextStore(texts)
+
+
+class PrefilterIndex(SimilarityIndex):
+    """Exact search that skips texts which provably cannot reach the threshold.
+
+    The bounds assume the similarity is ``difflib.SequenceMatcher(None, a,
+    b).ratio()``, i.e. ``2 * M / T`` where M is the number of matched
+    characters and T the combined length. Upper bounds on M rule texts out
+    before the full ratio is computed:
+
+    * length: M <= min(len(a), len(b)), so only texts whose length lies in
+      a window around the query's are considered (``real_quick_ratio``);
+    * characters: M is at most the size of the multiset intersection of
+      the two texts (``quick_ratio``);
+    * n-grams (opt-in): the matched characters form at most T - 2M + 1
+      blocks, so a matching text shares a common substring of length
+      M / (T - 2M + 1). When that is at least ngram_size, only texts
+      sharing an n-gram with the query are considered, found through an
+      inverted index.
+
+    The n-gram index holds a posting for every distinct n-gram of every
+    stored text, many times the memory of the texts themselves, and its
+    bound only applies to long texts at high thresholds, so it is off by
+    default. Enable it with ``ngram_size`` (e.g. ``DEFAULT_NGRAM_SIZE``)
+    when memory is not a concern.
+
+    Every text that could match is still verified with the exact ratio, so
+    results are identical to ``ExhaustiveIndex``. Use ``ExhaustiveIndex``
+    with a deduplicator whose similarity is not the SequenceMatcher ratio.
+    """
+
+    def __init__(self, ngram_size: int | None = None) -> None:
+        """Initialize an empty index.
+
+        Args:
+            ngram_size: Length of the character n-grams in the inverted
+                index, or None to prune by length and characters only.
+
+        Raises:
+            ValueError: If ngram_size is less than 1.
+        """
+        if ngram_size is not None and ngram_size < 1:
+            raise ValueError(f"ngram_size must be at least 1, got {ngram_size}")
+        self.ngram_size = ngram_size
+        self.texts = TextStore()
+        self._lengths = array("q")
+        self._by_length: dict[int, array] = {}
+        # Lengths of historical texts, when attached from a saved session
+        self.history_lengths: LengthLookup | None = None
+        # Keyed by the hash of each n-gram; a collision only adds candidates
+        self._postings: dict[int, array] = {}
+
+    def _ngram_hashes(self, text: str) -> set[int]:
+        """Return the hashes of the distinct n-grams of text."""
+        size = self.ngram_size or 0
+        return {hash(text[i : i + size]) for i in range(len(text) - size + 1)}
+
+    def _index(self, text: str, position: int) -> None:
+        """Register the text stored at a position."""
+        self._by_length.setdefault(len(text), array("q")).append(position)
+        if self.ngram_size is None:
+            return
+        self._lengths.append(len(text))
+        for key in self._ngram_hashes(text):
+            self._postings.setdefault(key, array("q")).append(position)
+
+    def candidates(self, text: str) -> Iterable[str]:
+        """Return every stored text; bounds are only applied in ``find_duplicate``."""
+        return self.texts
+
+    def add(self, text: str) -> None:
+        """Store text and index it by length (and n-grams, if enabled)."""
+        self._index(text, len(self.texts))
+        self.texts.append(text)
+
+    def find_duplicate(
+        self, text: str, threshold: float, similarity: Callable[[str, str], float]
+    ) -> str | None:
+        """Find the first stored text within the bounds that reaches the threshold."""
+        if not 0 < threshold <= 1:
+            return super().find_duplicate(text, threshold, similarity)
+
+        n = len(text)
+        # Widened by one on each side to absorb floating-point rounding
+        shortest = int(n * threshold / (2 - threshold))
+        longest = int(n * (2 - threshold) / threshold) + 1
+        # Shortest common block any match must contain, over the length window
+        matched = threshold * (n + shortest) / 2
+        blocks = (n + longest) * (1 - threshold) + 1
+        if self.ngram_size is not None and matched / blocks - 1e-9 > self.ngram_size - 1:
+            positions: set[int] = set()
+            for key in self._ngram_hashes(text):
+                positions.update(self._postings.get(key, ()))
+            lengths = self._lengths
+            window = [p for p in positions if shortest <= lengths[p] <= longest]
+            window.sort()
+        else:
+            by_length = self._by_length
+            window = [
+                p for length in range(shortest, longest + 1) for p in by_length.get(length, ())
+            ]
+            if self.history_lengths is not None:
+                window.extend(self.history_lengths.window(shortest, longest))
+            window.sort()
+
+        counts = Counter(text)
+        for position in window:
+            candidate = self.texts[position]
+            total = n + len(candidate)
+            common = (counts & Counter(candidate)).total()
+            # Same arithmetic as SequenceMatcher.ratio, so the bound never rounds below it
+            if total and 2.0 * common / total < threshold:
+                continue
+            if similarity(text, candidate) >= threshold:
+                return candidate
+        return None
+
+    def length_entries(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the (length, position) pairs held in memory.
+
+        Yields:
+            Pairs of every text indexed in memory; texts whose lengths come
+            from ``history_lengths`` are not included.
+        """
+        for length, positions in self._by_length.items():
+            for position in positions:
+                yield length, position
+
+    def params(self) -> dict[str, Any]:
+        """Return the n-gram size of the index."""
+        return {"ngram_size": self.ngram_size}
+
+    def attach_history(
+        self,
+        texts: Sequence[str],
+        bands: BandLookup | None = None,
+        lengths: LengthLookup | None = None,
+    ) -> None:
+        """Seed the index with historical texts and their persisted lengths.
+
+        With persisted lengths and no n-gram index nothing is read up
+        front. N-gram postings are not persisted, so with ``ngram_size``
+        (or without lengths) every historical text is read once to rebuild
+        the index.
+        """
+        self.texts = TextStore(texts)
+        if self.ngram_size is None and lengths is not None:
+            self.history_lengths = lengths
+            return
+        for position, text in enumerate(texts):
+            self._index(text, position)
+
+
+class MinHashLSHIndex(SimilarityIndex):
+    """MinHash signatures bucketed by banded locality-sensitive hashing.
+
+    Texts are split into character shingles and summarized by a MinHash
+    signature. The signature is cut into bands; two texts become candidates
+    when at least one band matches exactly, so each lookup only touches the
+    buckets it hashes into instead of every stored text.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = DEFAULT_SEED,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            num_perm: Number of hash permutations in each signature.
+            bands: Number of LSH bands; must evenly divide num_perm.
+            shingle_size: Length of the character shingles.
+            seed: Seed for the permutation coefficients.
+
+        Raises:
+            ValueError: If num_perm is not a multiple of bands.
+        """
+        if bands <= 0 or num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = random.Random(seed)
+        self._coefficients = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self.texts = TextStore()
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(bands)]
+        # Buckets of historical texts, when attached from a saved session
+        self.history_bands: BandLookup | None = None
+        self._last_keys: tuple[str, list[int]] | None = None
+
+    def _shingles(self, text: str) -> set[int]:
+        """Hash the character shingles of text."""
+        size = self.shingle_size
+        if len(text) <= size:
+            return {zlib.crc32(text.encode())}
+        return {zlib.crc32(text[i : i + size].encode()) for i in range(len(text) - size + 1)}
+
+    def signature(self, text: str) -> tuple[int, ...]:
+        """Compute the MinHash signature of text.
+
+        Args:
+            text: Normalized text.
+
+        Returns:
+            A tuple of num_perm minimum hash values.
+        """
+        hashes = self._shingles(text)
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._coefficients
+        )
+
+    def band_keys(self, text: str) -> list[int]:
+        """Compute the bucket key of each band of the signature of text.
+
+        Keys are computed arithmetically, so they are stable across processes
+        and Python versions and can be persisted. A lookup is usually
+        followed by adding the same text, so the most recent keys are reused
+        instead of being recomputed.
+
+        Args:
+            text: Normalized text.
+
+        Returns:
+            One 64-bit key per band.
+        """
+        if self._last_keys is not None and self._last_keys[0] == text:
+            return self._last_keys[1]
+        signature = self.signature(text)
+        rows = self.rows
+        keys = []
+        for band in range(self.bands):
+            key = 0
+            for value in signature[band * rows : (band + 1) * rows]:
+                key = (key * BAND_KEY_MULTIPLIER + value) % MERSENNE_PRIME
+            keys.append(key)
+        self._last_keys = (text, keys)
+        return keys
+
+    def sketch(self, text: str) -> bytes:
+        """Serialize the band keys of text."""
+        return array("q", self.band_keys(text)).tobytes()
+
+    def prime(self, text: str, sketch: bytes) -> None:
+        """Use cached band keys of text instead of computing its signature."""
+        if sketch:
+            self._last_keys = (text, array("q", sketch).tolist())
+
+    def candidates(self, text: str) -> Iterable[str]:
+        """Return stored texts sharing at least one band with text."""
+        positions: set[int] = set()
+        history = self.history_bands
+        for band, (bucket, key) in enumerate(zip(self._buckets, self.band_keys(text), strict=True)):
+            positions.update(bucket.get(key, ()))
+            if history is not None:
+                positions.update(history.lookup(band, key))
+        return [self.texts[i] for i in sorted(positions)]
+
+    def add(self, text: str) -> None:
+        """Store text and register it in its band buckets."""
+        position = len(self.texts)
+        self.texts.append(text)
+        for bucket, key in zip(self._buckets, self.band_keys(text), strict=True):
+            bucket.setdefault(key, []).append(position)
+
+    def band_entries(self, band: int) -> Iterator[tuple[int, int]]:
+        """Iterate over the (key, position) pairs of a band held in memory.
+
+        Args:
+            band: Band number.
+
+        Yields:
+            Pairs of texts added since the history was attached; those in
+            ``history_bands`` are not included.
+        """
+        for key, positions in self._buckets[band].items():
+            for position in positions:
+                yield key, position
+
+    def params(self) -> dict[str, Any]:
+        """Return the configuration that determines signatures and band keys."""
+        return {
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "seed": self.seed,
+        }
+
+    def attach_history(
+        self,
+        texts: Sequence[str],
+        bands: BandLookup | None = None,
+        lengths: LengthLookup | None = None,
+    ) -> None:
+        """Seed the index with historical texts and their persisted buckets.
+
+        Raises:
+            ValueError: If bands is missing.
+        """
+        if bands is None:
+            raise ValueError("MinHashLSHIndex history requires persisted band buckets")
+        self.texts = TextStore(texts)
+        self.history_bands = bands
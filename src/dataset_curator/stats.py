@@ -0,0 +1,101 @@
+"""Incremental aggregation of dataset statistics."""
+
+from collections import Counter
+
+from dataset_curator.deduplicator import DedupSession
+from dataset_curator.models import DatasetStats, TrainingExample
+from dataset_curator.records import ExampleRecord, RecordBatch
+
+QUALITY_SCORE_PRECISION: int = 4
+
+
+class StatsAccumulator:
+    """Accumulates DatasetStats one curated example at a time."""
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.total_examples = 0
+        self.quality_sum = 0.0
+        self.sources: Counter[str] = Counter()
+        self.exact_duplicates_removed = 0
+        self.near_duplicates_removed = 0
+        self.low_quality_removed = 0
+        self.estimated_false_drop_rate = 0.0
+
+    def add(self, example: TrainingExample | ExampleRecord) -> None:
+        """Count a curated example.
+
+        Args:
+            example: Scored example or record that passed every pipeline stage.
+        """
+        self.total_examples += 1
+        self.quality_sum += example.quality_score
+        self.sources[example.source] += 1
+
+    def add_batch(self, batch: RecordBatch) -> None:
+        """Count every row of a scored batch.
+
+        Each column is aggregated in one pass. Scores are summed in row order,
+        so the result is identical to calling ``add`` once per row.
+
+        Args:
+            batch: Scored batch whose rows passed every pipeline stage.
+        """
+        self.total_examples += len(batch)
+        self.quality_sum = sum(batch.scores, self.quality_sum)
+        self.sources.update(batch.sources)
+
+    def record_duplicates(self, session: DedupSession) -> None:
+        """Copy the duplicate counters of a deduplication session.
+
+        Args:
+            session: Session whose removals should be reported.
+        """
+        self.exact_duplicates_removed = session.exact_removed
+        self.near_duplicates_removed = session.near_removed
+        self.estimated_false_drop_rate = session.estimated_false_drop_rate
+
+    def record_rejected(self, count: int) -> None:
+        """Count examples rejected for scoring below the quality floor.
+
+        Args:
+            count: Number of newly rejected examples.
+        """
+        self.low_quality_removed += count
+
+    def merge(self, stats: DatasetStats) -> None:
+        """Add the statistics of a separately curated dataset, e.g. another shard.
+
+        Duplicates are only counted within each dataset, not across them, and
+        the larger estimated false-drop rate is kept.
+
+        Args:
+            stats: Statistics to add to the running totals.
+        """
+        self.total_examples += stats.total_examples
+        self.quality_sum += stats.avg_quality * stats.total_examples
+        self.sources.update(stats.sources)
+        self.exact_duplicates_removed += stats.exact_duplicates_removed
+        self.near_duplicates_removed += stats.near_duplicates_removed
+        self.low_quality_removed += stats.low_quality_removed
+        self.estimated_false_drop_rate = max(
+            self.estimated_false_drop_rate, stats.estimated_false_drop_rate
+        )
+
+    def to_stats(self) -> DatasetStats:
+        """Build the statistics for everything counted so far.
+
+        Returns:
+            A DatasetStats snapshot.
+        """
+        avg_quality = self.quality_sum / self.total_examples if self.total_examples else 0.0
+        return DatasetStats(
+            total_examples=self.total_examples,
+            avg_quality=round(avg_quality, QUALITY_SCORE_PRECISION),
+            sources=dict(self.sources),
+            duplicates_removed=self.exact_duplicates_removed + self.near_duplicates_removed,
+            exact_duplicates_removed=self.exact_duplicates_removed,
+            near_duplicates_removed=self.near_duplicates_removed,
+            low_quality_removed=self.low_quality_removed,
+            estimated_false_drop_rate=self.estimated_false_drop_rate,
+        )
@@ -0,0 +1,94 @@
+"""Tests for the benchmarks package."""
+
+import pytest
+
+from benchmarks.corpus import NEWLINE_RUN, CorpusSpec, generate_corpus
+from benchmarks.runner import compare, format_report, run_benchmarks, run_stage
+
+
+class TestGenerateCorpus:
+    def test_deterministic(self):
+        spec = CorpusSpec(size=50, seed=3)
+        assert generate_corpus(spec) == generate_corpus(spec)
+
+    def test_seed_changes_corpus(self):
+        assert generate_corpus(CorpusSpec(size=50, seed=1)) != generate_corpus(
+            CorpusSpec(size=50, seed=2)
+        )
+
+    def test_size_and_length_bounds(self):
+        spec = CorpusSpec(size=300, exact_duplicate_rate=0, near_duplicate_rate=0)
+        corpus = generate_corpus(spec)
+        assert len(corpus) == 300
+        assert all(spec.min_length <= len(raw.content) <= spec.max_length for raw in corpus)
+
+    def test_exact_duplicate_rate(self):
+        spec = CorpusSpec(size=1000, exact_duplicate_rate=0.5, near_duplicate_rate=0)
+        normalized = [raw.content.strip().lower() for raw in generate_corpus(spec)]
+        assert 400 < len(normalized) - len(set(normalized)) < 600
+
+    def test_unicode_and_newline_heavy(self):
+        spec = CorpusSpec(size=100, unicode_rate=1.0, newline_rate=1.0, mean_length=500)
+        corpus = generate_corpus(spec)
+        assert any(not raw.content.isascii() for raw in corpus)
+        assert any(NEWLINE_RUN in raw.content for raw in corpus)
+
+
+class TestRunner:
+    def test_run_stage(self):
+        raws = generate_corpus(CorpusSpec(size=20))
+        result = run_stage("clean_batch", raws, repeat=1, isolate=False)
+        assert result.items == 20
+        assert result.seconds > 0
+        assert result.peak_rss_kb > 0
+
+    def test_run_stage_isolated(self):
+        raws = generate_corpus(CorpusSpec(size=20))
+        result = run_stage("to_jsonl", raws, repeat=1)
+        assert result.items == 20
+
+    def test_run_stage_rejects_unknown(self):
+        with pytest.raises(ValueError, match="Unknown stage"):
+            run_stage("nope", [])
+        with pytest.raises(ValueError, match="Unknown index"):
+            run_stage("deduplicate", [], index="nope")
+
+    def test_run_benchmarks_report(self):
+        report = run_benchmarks(CorpusSpec(size=10), index="minhash", repeat=1, isolate=False)
+        assert list(report["stages"]) == [
+            "clean_batch",
+            "to_chat_batch",
+            "deduplicate",
+            "to_jsonl",
+            "pipeline.run",
+        ]
+        assert "pipeline.run" in format_report(report)
+
+
+class TestCompare:
+    def _report(self, throughput, rss):
+        return {
+            "spec": {"size": 1},
+            "index": "exhaustive",
+            "stages": {"s": {"items_per_second": throughput, "peak_rss_kb": rss}},
+        }
+
+    def test_within_tolerance(self):
+        assert compare(self._report(90, 110), self._report(100, 100), tolerance=0.2) == []
+
+    def test_slower(self):
+        regressions = compare(self._report(70, 100), self._report(100, 100), tolerance=0.2)
+        assert len(regressions) == 1
+        assert "items/s" in regressions[0]
+
+    def test_more_memory(self):
+        regressions = compare(self._report(100, 130), self._report(100, 100), tolerance=0.2)
+        assert len(regressions) == 1
+        assert "peak RSS" in regressions[0]
+
+    def test_spec_mismatch(self):
+        baseline = self._report(100, 100)
+        baseline["spec"] = {"size": 2}
+        assert compare(self._report(100, 100), baseline) == [
+            "corpus spec or index differs from the baseline"
+        ]
@@ -0,0 +1,105 @@
+"""Tests for dataset_curator.bloom."""
+
+import os
+import stat
+
+import pytest
+
+from dataset_curator.bloom import BloomFilter, optimal_parameters
+from dataset_curator.deduplicator import content_hash
+
+
+def _digests(count: int, prefix: str = "text") -> list[bytes]:
+    return [content_hash(f"{prefix} {i}") for i in range(count)]
+
+
+class TestOptimalParameters:
+    def test_textbook_sizing(self):
+        bits, hashes = optimal_parameters(1000, 0.01)
+        assert 9585 <= bits <= 9587
+        assert hashes == 7
+
+    @pytest.mark.parametrize(("capacity", "error_rate"), [(0, 0.01), (10, 0.0), (10, 1.0)])
+    def test_invalid(self, capacity, error_rate):
+        with pytest.raises(ValueError):
+            optimal_parameters(capacity, error_rate)
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(500)
+        digests = _digests(500)
+        assert not any(bloom.add(digest) for digest in digests)
+        assert all(digest in bloom for digest in digests)
+        assert all(bloom.add(digest) for digest in digests)
+        assert bloom.count == 500
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(2000, error_rate=0.01)
+        for digest in _digests(2000):
+            bloom.add(digest)
+        false_positives = sum(digest in bloom for digest in _digests(5000, prefix="other"))
+        assert false_positives / 5000 < 0.02
+        assert 0.005 < bloom.false_positive_rate() < 0.02
+
+    def test_fixed_memory(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        size = bloom.size_bytes
+        for digest in _digests(5000):
+            bloom.add(digest)
+        assert bloom.size_bytes == size
+        assert bloom.false_positive_rate() > 0.01
+
+    def test_rejects_short_digest(self):
+        with pytest.raises(ValueError):
+            BloomFilter(10).add(b"short")
+
+    def test_save_and_load(self, tmp_path):
+        bloom = BloomFilter(100)
+        digests = _digests(100)
+        for digest in digests[:50]:
+            bloom.add(digest)
+        path = tmp_path / "seen.bloom"
+        bloom.save(path)
+
+        loaded = BloomFilter.load(path)
+        assert (loaded.count, loaded.bits_set) == (bloom.count, bloom.bits_set)
+        assert all(digest in loaded for digest in digests[:50])
+        # Additions are copy-on-write until saved again
+        before = path.read_bytes()
+        loaded.add(digests[50])
+        assert path.read_bytes() == before
+        loaded.save(path)
+        assert digests[50] in BloomFilter.load(path)
+
+    def test_save_respects_umask(self, tmp_path):
+        path = tmp_path / "seen.bloom"
+        previous = os.umask(0o027)
+        try:
+            BloomFilter(100).save(path)
+        finally:
+            os.umask(previous)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o640
+        assert os.listdir(tmp_path) == ["seen.bloom"]
+
+    def test_close_releases_map(self, tmp_path):
+        path = tmp_path / "seen.bloom"
+        BloomFilter(100).save(path)
+        loaded = BloomFilter.load(path)
+        mapping = loaded._mmap
+        loaded.close()
+        assert mapping.closed
+        loaded.close()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "seen.bloom"
+        path.write_bytes(b"not a bloom filter, just some bytes")
+        with pytest.raises(ValueError, match="not a Bloom filter"):
+            BloomFilter.load(path)
+
+    def test_load_rejects_truncated_file(self, tmp_path):
+        path = tmp_path / "seen.bloom"
+        BloomFilter(100).save(path)
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(ValueError, match="truncated"):
+            BloomFilter.load(path)
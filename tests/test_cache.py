@@ -0,0 +1,184 @@
+"""Tests for dataset_curator.cache."""
+
+import sqlite3
+from functools import partial
+
+import pytest
+
+from dataset_curator.cache import CacheEntry, CleanCache
+from dataset_curator.cleaner import DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.similarity import MinHashLSHIndex
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CleanCache(tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+
+def _entry(text: str) -> CacheEntry:
+    return CacheEntry(cleaned=text, valid=True, fingerprint=text.encode())
+
+
+class TestCleanCache:
+    def test_key_depends_on_namespace(self):
+        assert CleanCache.key("a", "text") != CleanCache.key("b", "text")
+        assert CleanCache.key("a", "text") == CleanCache.key("a", "text")
+
+    def test_round_trip(self, cache):
+        cache.put_many([(b"k1", _entry("one"))])
+        assert cache.get_many([b"k1", b"k2"]) == [_entry("one"), None]
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_persists_across_instances(self, tmp_path):
+        first = CleanCache(tmp_path / "cache.db")
+        first.put_many([(b"k", _entry("kept"))])
+        first.close()
+        second = CleanCache(tmp_path / "cache.db")
+        assert second.get_many([b"k"]) == [_entry("kept")]
+        second.close()
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = CleanCache(tmp_path / "cache.db", max_entries=2)
+        cache.put_many([(b"a", _entry("a"))])
+        cache.put_many([(b"b", _entry("b"))])
+        cache.get_many([b"a"])
+        cache.put_many([(b"c", _entry("c"))])
+        assert len(cache) == 2
+        assert cache.get_many([b"a", b"b", b"c"]) == [_entry("a"), None, _entry("c")]
+        cache.close()
+
+    def test_replacing_entry_keeps_count(self, tmp_path):
+        cache = CleanCache(tmp_path / "cache.db", max_entries=2)
+        cache.put_many([(b"a", _entry("a")), (b"b", _entry("b"))])
+        cache.put_many([(b"a", _entry("new"))])
+        assert cache.get_many([b"a", b"b"]) == [_entry("new"), _entry("b")]
+        cache.close()
+
+    def test_writes_do_not_count_rows(self, tmp_path, monkeypatch):
+        cache = CleanCache(tmp_path / "cache.db", max_entries=2)
+        monkeypatch.setattr(CleanCache, "__len__", lambda self: pytest.fail("counted rows"))
+        for key in (b"a", b"b", b"c"):
+            cache.put_many([(key, _entry(key.decode()))])
+        monkeypatch.undo()
+        assert len(cache) == 2
+        cache.close()
+
+    def test_lookups_do_not_write(self, cache):
+        cache.put_many([(b"k", _entry("k"))])
+        changes = cache._conn.total_changes
+        cache.get_many([b"k"])
+        assert cache._conn.total_changes == changes
+        cache.flush()
+        assert cache._conn.total_changes == changes + 1
+
+    def test_recent_use_survives_reopening(self, tmp_path):
+        cache = CleanCache(tmp_path / "cache.db", max_entries=2)
+        cache.put_many([(b"a", _entry("a"))])
+        cache.put_many([(b"b", _entry("b"))])
+        cache.get_many([b"a"])
+        cache.close()
+        cache = CleanCache(tmp_path / "cache.db", max_entries=2)
+        cache.put_many([(b"c", _entry("c"))])
+        assert cache.get_many([b"a", b"b"]) == [_entry("a"), None]
+        cache.close()
+
+    def test_round_trip_sketch(self, cache):
+        entry = CacheEntry(cleaned="one", valid=True, fingerprint=b"f", sketch=b"\x01\x02")
+        cache.put_many([(b"k", entry)])
+        assert cache.get_many([b"k"]) == [entry]
+
+    def test_rebuilds_older_schema(self, tmp_path):
+        path = tmp_path / "cache.db"
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE entries (key BLOB PRIMARY KEY, cleaned TEXT NOT NULL,"
+            " valid INTEGER NOT NULL, fingerprint BLOB NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        conn.execute("INSERT INTO entries VALUES (x'01', 'old', 1, x'02', 1)")
+        conn.commit()
+        conn.close()
+        cache = CleanCache(path)
+        assert len(cache) == 0
+        cache.put_many([(b"k", _entry("new"))])
+        assert cache.get_many([b"k"]) == [_entry("new")]
+        cache.close()
+
+    def test_invalid_max_entries(self, tmp_path):
+        with pytest.raises(ValueError):
+            CleanCache(tmp_path / "cache.db", max_entries=0)
+
+
+class TestPipelineCache:
+    def test_rerun_hits_cache_with_same_results(self, cache):
+        raws = [
+            RawExample(source="wiki", content="What is machine learning and how does it work?"),
+            RawExample(source="api", content="What is machine learning and how does it work?"),
+            RawExample(source="wiki", content="hi"),
+            RawExample(source="api", content="Explain deep learning in simple terms please."),
+        ]
+        plain = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator())
+        cached = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), cache=cache)
+        expected = plain.run(raws)
+        assert cached.run(raws) == expected
+        assert cache.hits == 0
+        assert len(cache) == 3
+        assert cached.run(raws) == expected
+        assert cache.hits == 4
+        assert list(cached.run_stream(raws)) == expected[0]
+
+    def test_rerun_reuses_index_sketches(self, cache, monkeypatch):
+        raws = [
+            RawExample(source="s", content="What is machine learning and how does it work?"),
+            RawExample(source="s", content="What is machine learning and how does it work"),
+            RawExample(source="s", content="Explain deep learning in simple terms please."),
+        ]
+
+        def pipeline():
+            dedup = Deduplicator(threshold=0.9, index_factory=MinHashLSHIndex)
+            return CurationPipeline(DataCleaner(), FormatConverter(), dedup, cache=cache)
+
+        expected = pipeline().run(raws)
+        assert len(expected[0]) == 2
+        monkeypatch.setattr(
+            MinHashLSHIndex, "signature", lambda self, text: pytest.fail("signature computed")
+        )
+        assert pipeline().run(raws) == expected
+        assert list(pipeline().run_stream(raws)) == expected[0]
+
+    def test_index_configuration_uses_separate_entries(self, cache):
+        raws = [RawExample(source="wiki", content="What is machine learning?")]
+        for seed in (1, 2):
+            dedup = Deduplicator(index_factory=partial(MinHashLSHIndex, seed=seed))
+            CurationPipeline(DataCleaner(), FormatConverter(), dedup, cache=cache).run(raws)
+        assert cache.hits == 0
+
+    def test_length_limits_use_separate_entries(self, cache):
+        raws = [RawExample(source="wiki", content="What is machine learning?")]
+        default = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), cache=cache)
+        strict = CurationPipeline(
+            DataCleaner(), FormatConverter(), Deduplicator(), cache=cache, max_length=10
+        )
+        assert len(default.run(raws)[0]) == 1
+        assert strict.run(raws)[0] == []
+        assert cache.hits == 0
+
+    def test_run_stream_looks_up_whole_chunks(self, cache, monkeypatch):
+        topics = ["python", "gardening", "tax law", "chess", "cooking", "opera", "sailing"]
+        raws = [RawExample(source="s", content=f"Tell me all about {t}") for t in topics]
+        pipeline = CurationPipeline(
+            DataCleaner(), FormatConverter(), Deduplicator(), cache=cache, chunk_size=4
+        )
+        lookups = []
+        original = cache.get_many
+        monkeypatch.setattr(
+            cache, "get_many", lambda keys: lookups.append(len(keys)) or original(keys)
+        )
+        assert len(list(pipeline.run_stream(raws))) == 7
+        assert lookups == [4, 3]
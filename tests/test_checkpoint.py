@@ -0,0 +1,51 @@
+"""Tests for dataset_curator.checkpoint."""
+
+import json
+
+import pytest
+
+from dataset_curator.checkpoint import (
+    CHECKPOINT_NAME,
+    dedup_file_name,
+    load_checkpoint,
+    save_checkpoint,
+)
+from dataset_curator.models import DatasetStats, PipelineCheckpoint
+
+
+def _checkpoint(generation: int = 1) -> PipelineCheckpoint:
+    return PipelineCheckpoint(
+        config="config",
+        generation=generation,
+        input_offset=100,
+        output_position=2048,
+        dedup_file=dedup_file_name(generation),
+        dedup_counters={"exact_removed": 3, "near_removed": 1, "comparisons": 40},
+        stats=DatasetStats(total_examples=96, avg_quality=0.5, sources={"wiki": 96}),
+        quality_sum=48.0,
+    )
+
+
+class TestCheckpoint:
+    def test_missing_checkpoint(self, tmp_path):
+        assert load_checkpoint(tmp_path) is None
+
+    def test_round_trip(self, tmp_path):
+        save_checkpoint(tmp_path, _checkpoint())
+        assert load_checkpoint(tmp_path) == _checkpoint()
+
+    def test_replaces_previous_checkpoint(self, tmp_path):
+        save_checkpoint(tmp_path, _checkpoint(1))
+        save_checkpoint(tmp_path, _checkpoint(2))
+        assert load_checkpoint(tmp_path).generation == 2
+        assert [p.name for p in tmp_path.iterdir()] == [CHECKPOINT_NAME]
+
+    def test_rejects_unknown_version(self, tmp_path):
+        save_checkpoint(tmp_path, _checkpoint())
+        path = tmp_path / CHECKPOINT_NAME
+        path.write_text(json.dumps({**json.loads(path.read_text()), "version": 99}))
+        with pytest.raises(ValueError, match="unsupported checkpoint version"):
+            load_checkpoint(tmp_path)
+
+    def test_dedup_file_names_sort_by_generation(self):
+        assert dedup_file_name(2) < dedup_file_name(10)
@@ -1,9 +1,15 @@
 """Tests for dataset_curator.cleaner."""
 
+from types import SimpleNamespace
+
 import pytest
+from dataset_curator import cleaner as cleaner_module
 from dataset_curator.cleaner import DataCleaner
 
 
+_FAILING_UNICODEDATA = SimpleNamespace(normalize=lambda form, text: pytest.fail("normalized"))
+
+
 @pytest.fixture
 def cleaner():
     return DataCleaner()
@@ -64,3 +70,49 @@ class TestCleanBatch:
 
     def test_all_invalid(self, cleaner):
         assert cleaner.clean_batch(["a", "b", "c"]) == []
+
+
+class TestCleanAndValidate:
+    SAMPLES = (
+        "  hello world  ",
+        "ab",
+        "a\n\n\n\n\nb with some padding",
+        "ＡＢＣ fullwidth letters",
+        "café au lait, s'il vous plaît",
+        "¨ leading diaeresis text",
+        "　　ideographic spaces around　",
+        "ᾀ" * 6,
+        "",
+        "x" * 10001,
+    )
+
+    def test_matches_clean_then_is_valid(self, cleaner):
+        expected = [
+            cleaned if cleaner.is_valid(cleaned) else None
+            for cleaned in map(cleaner.clean, self.SAMPLES)
+        ]
+        assert cleaner.clean_and_validate(self.SAMPLES) == expected
+
+    def test_custom_bounds(self, cleaner):
+        assert cleaner.clean_and_validate(["abc", "abcdef"], min_length=2, max_length=4) == [
+            "abc",
+            None,
+        ]
+
+    def test_ascii_skips_normalization(self, cleaner, monkeypatch):
+        monkeypatch.setattr(cleaner_module, "unicodedata", _FAILING_UNICODEDATA)
+        assert cleaner.clean_and_validate(["plain ascii text"]) == ["plain ascii text"]
+        assert cleaner.clean("plain ascii text") == "plain ascii text"
+
+    def test_rejects_very_long_text_before_normalizing(self, cleaner, monkeypatch):
+        monkeypatch.setattr(cleaner_module, "unicodedata", _FAILING_UNICODEDATA)
+        assert cleaner.clean_and_validate(["é" * 50_000], max_length=100) == [None]
+
+    def test_long_raw_text_with_padding_is_kept(self, cleaner):
+        text = " " * 50_000 + "café au lait" + "\n" * 50_000
+        assert cleaner.clean_and_validate([text], max_length=100) == ["café au lait"]
+
+    def test_contraction_within_limit_is_normalized(self, cleaner):
+        # 4 code points compose into one, so 400 of them can still be valid
+        text = "ᾂ" * 100
+        assert cleaner.clean_and_validate([text], max_length=100) == ["ᾂ" * 100]
@@ -0,0 +1,196 @@
+"""Tests for dataset_curator.cli."""
+
+import json
+import os
+import stat
+
+import pytest
+
+from dataset_curator import cli
+from dataset_curator.cli import MANIFEST_NAME, expand_inputs, main, shard_output_name
+
+TOPICS = ["python", "quantum physics", "cooking", "gardening", "tax law", "chess"]
+
+
+def _write_input(path, offset: int = 0, count: int = 12) -> None:
+    lines = [
+        json.dumps({"source": f"s{i % 2}", "content": f"Tell me everything about {TOPICS[i % 6]}"})
+        for i in range(offset, offset + count)
+    ]
+    lines.append(json.dumps({"source": "s0", "content": "tiny"}))
+    path.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    directory = tmp_path / "raw"
+    directory.mkdir()
+    for i in range(3):
+        _write_input(directory / f"part-{i}.jsonl", offset=i)
+    return directory
+
+
+def _curated(output_dir) -> dict[str, list[dict]]:
+    return {
+        name: [json.loads(line) for line in (output_dir / name).read_text().splitlines()]
+        for name in sorted(os.listdir(output_dir))
+        if name != MANIFEST_NAME
+    }
+
+
+class TestExpandInputs:
+    def test_sorted_unique(self, inputs):
+        pattern = str(inputs / "*.jsonl")
+        paths = expand_inputs([pattern, str(inputs / "part-1.jsonl")])
+        assert [os.path.basename(p) for p in paths] == [
+            "part-0.jsonl",
+            "part-1.jsonl",
+            "part-2.jsonl",
+        ]
+
+    def test_no_match(self, tmp_path):
+        with pytest.raises(ValueError, match="No input files"):
+            expand_inputs([str(tmp_path / "*.jsonl")])
+
+
+class TestShardOutputName:
+    def test_keeps_stem_and_compression(self):
+        name = shard_output_name("raw/part-0.jsonl.gz", "xz")
+        assert name.startswith("part-0-")
+        assert name.endswith(".jsonl.xz")
+
+    def test_same_base_name_in_other_directory(self):
+        assert shard_output_name("a/x.jsonl", None) != shard_output_name("b/x.jsonl", None)
+
+
+class TestMain:
+    def test_curates_every_shard(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        assert (
+            main([str(inputs / "*.jsonl"), "-o", str(output), "--system-prompt", "Be nice."]) == 0
+        )
+        curated = _curated(output)
+        assert len(curated) == 3
+        for records in curated.values():
+            assert len(records) == 6
+            assert records[0]["messages"][0] == {"role": "system", "content": "Be nice."}
+        captured = capsys.readouterr()
+        assert json.loads(captured.out)["total_examples"] == 18
+        assert "3 shards curated, 0 skipped" in captured.err
+        assert "examples/s" in captured.err
+
+    def test_outputs_are_world_readable_under_umask(self, inputs, tmp_path):
+        output = tmp_path / "out"
+        previous = os.umask(0o022)
+        try:
+            main([str(inputs / "*.jsonl"), "-o", str(output)])
+        finally:
+            os.umask(previous)
+        assert {stat.S_IMODE(path.stat().st_mode) for path in output.iterdir()} == {0o644}
+
+    def test_options(self, inputs, tmp_path):
+        output = tmp_path / "out"
+        args = [str(inputs / "part-0.jsonl"), "-o", str(output), "--max-length", "30"]
+        main([*args, "--compression", "gzip", "--min-length", "1"])
+        (name,) = [n for n in os.listdir(output) if n != MANIFEST_NAME]
+        assert name.endswith(".jsonl.gz")
+
+    def test_quality_floor(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        args = [str(inputs / "part-0.jsonl"), "-o", str(output), "--scorer", "language"]
+        main([*args, "--scorer", "length", "--min-quality", "0.065"])
+        stats = json.loads(capsys.readouterr().out)
+        assert stats["low_quality_removed"] == 4
+        assert stats["total_examples"] == 2
+
+    def test_bloom_dedup(self, inputs, tmp_path, capsys):
+        args = [str(inputs / "part-0.jsonl"), "-o", str(tmp_path / "out")]
+        main([*args, "--bloom-capacity", "1000", "--bloom-error-rate", "0.01"])
+        stats = json.loads(capsys.readouterr().out)
+        assert stats["total_examples"] == 6
+        assert stats["exact_duplicates_removed"] == 6
+        assert 0.0 < stats["estimated_false_drop_rate"] < 0.01
+
+    def test_parallel_matches_serial(self, inputs, tmp_path):
+        main([str(inputs / "*.jsonl"), "-o", str(tmp_path / "serial")])
+        main([str(inputs / "*.jsonl"), "-o", str(tmp_path / "parallel"), "--workers", "2"])
+        assert _curated(tmp_path / "serial") == _curated(tmp_path / "parallel")
+
+    def test_resume_skips_completed_shards(self, inputs, tmp_path, capsys, monkeypatch):
+        output = tmp_path / "out"
+        original = cli.curate_shard
+        calls = []
+
+        def interrupted(input_path, output_path, options):
+            if calls:
+                raise KeyboardInterrupt
+            calls.append(input_path)
+            return original(input_path, output_path, options)
+
+        monkeypatch.setattr(cli, "curate_shard", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            main([str(inputs / "*.jsonl"), "-o", str(output)])
+        assert len(_curated(output)) == 1
+        manifest = json.loads((output / MANIFEST_NAME).read_text())
+        assert [shard["input"] for shard in manifest["shards"]] == calls
+
+        monkeypatch.setattr(cli, "curate_shard", original)
+        capsys.readouterr()
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        captured = capsys.readouterr()
+        assert "2 shards curated, 1 skipped" in captured.err
+        assert json.loads(captured.out)["total_examples"] == 18
+        assert len(_curated(output)) == 3
+
+    def test_totals_cover_only_named_inputs(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        capsys.readouterr()
+        main([str(inputs / "part-0.jsonl"), "-o", str(output)])
+        captured = capsys.readouterr()
+        assert "0 shards curated, 1 skipped" in captured.err
+        assert json.loads(captured.out)["total_examples"] == 6
+
+    def test_changed_input_is_curated_again(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        _write_input(inputs / "part-1.jsonl", count=20)
+        capsys.readouterr()
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        assert "1 shards curated, 2 skipped" in capsys.readouterr().err
+
+    def test_changed_options_start_over(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        capsys.readouterr()
+        main([str(inputs / "*.jsonl"), "-o", str(output), "--threshold", "0.8"])
+        assert "3 shards curated, 0 skipped" in capsys.readouterr().err
+
+    def test_restart(self, inputs, tmp_path, capsys):
+        output = tmp_path / "out"
+        main([str(inputs / "*.jsonl"), "-o", str(output)])
+        capsys.readouterr()
+        main([str(inputs / "*.jsonl"), "-o", str(output), "--restart"])
+        assert "3 shards curated, 0 skipped" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            ["--workers", "0"],
+            ["--threshold", "0"],
+            ["--threshold", "1.5"],
+            ["--threshold", "nan"],
+            ["--min-length", "50", "--max-length", "10"],
+            ["--min-quality", "2"],
+            ["--scorer", "missing"],
+            ["--bloom-capacity", "0"],
+            ["--bloom-error-rate", "1"],
+        ],
+    )
+    def test_invalid_arguments(self, inputs, tmp_path, extra):
+        with pytest.raises(SystemExit):
+            main([str(inputs / "*.jsonl"), "-o", str(tmp_path / "out"), *extra])
+
+    def test_missing_inputs(self, tmp_path):
+        with pytest.raises(SystemExit):
+            main([str(tmp_path / "*.jsonl"), "-o", str(tmp_path / "out")])
@@ -1,6 +1,11 @@
 """Tests for dataset_curator.converter."""
 
+import gzip
+import io
 import json
+import lzma
+import os
+import stat
 
 import pytest
 from dataset_curator.converter import FormatConverter
@@ -36,6 +41,16 @@ class TestToChatFormat:
         assert "system" not in roles
 
 
+class TestToRecord:
+    def test_basic_conversion(self, converter):
+        raw = RawExample(source="wiki", content="What is Python?")
+        record = converter.to_record(raw, system_prompt="Be brief.")
+        assert record.source == "wiki"
+        assert record.content == "What is Python?"
+        assert record.system_prompt == "Be brief."
+        assert record.to_training_example() == converter.to_chat_format(raw, "Be brief.")
+
+
 class TestToChatBatch:
     def test_converts_multiple(self, converter):
         raws = [
@@ -80,3 +95,73 @@ class TestToJsonl:
 
     def test_empty_list(self, converter):
         assert converter.to_jsonl([]) == ""
+
+
+class TestWriteJsonl:
+    @pytest.fixture
+    def examples(self):
+        msgs = [
+            ChatMessage(role="user", content="héllo"),
+            ChatMessage(role="assistant", content=""),
+        ]
+        return [TrainingExample(messages=msgs, source=s) for s in ("a", "b", "c")]
+
+    def test_matches_to_jsonl(self, converter, examples, tmp_path):
+        path = tmp_path / "out.jsonl"
+        result = converter.write_jsonl(iter(examples), path)
+        content = path.read_text(encoding="utf-8")
+        assert content == converter.to_jsonl(examples) + "\n"
+        assert result.lines_written == 3
+        assert result.bytes_written == len(content.encode())
+
+    def test_gzip_inferred_from_suffix(self, converter, examples, tmp_path):
+        path = tmp_path / "out.jsonl.gz"
+        converter.write_jsonl(examples, path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            assert len(f.read().splitlines()) == 3
+
+    def test_explicit_compression(self, converter, examples, tmp_path):
+        path = tmp_path / "out.jsonl"
+        converter.write_jsonl(examples, path, compression="xz")
+        assert len(lzma.decompress(path.read_bytes()).splitlines()) == 3
+
+    def test_writes_to_text_file_object(self, converter, examples):
+        buffer = io.StringIO()
+        result = converter.write_jsonl(examples, buffer)
+        assert buffer.getvalue().count("\n") == 3
+        assert result.bytes_written == len(buffer.getvalue().encode())
+
+    def test_writes_to_binary_file_object(self, converter, examples):
+        buffer = io.BytesIO()
+        result = converter.write_jsonl(examples, buffer)
+        assert result.bytes_written == len(buffer.getvalue())
+
+    def test_atomic_write_leaves_no_partial_file(self, converter, examples, tmp_path):
+        path = tmp_path / "out.jsonl"
+
+        def failing():
+            yield examples[0]
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            converter.write_jsonl(failing(), path)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_atomic_write_respects_umask(self, converter, examples, tmp_path):
+        previous = os.umask(0o027)
+        try:
+            converter.write_jsonl(examples, tmp_path / "atomic.jsonl")
+            converter.write_jsonl(examples, tmp_path / "direct.jsonl", atomic=False)
+        finally:
+            os.umask(previous)
+        modes = {stat.S_IMODE(path.stat().st_mode) for path in tmp_path.iterdir()}
+        assert modes == {0o640}
+
+    def test_atomic_write_leaves_umask_alone(self, converter, examples, tmp_path, monkeypatch):
+        monkeypatch.setattr(os, "umask", lambda mask: pytest.fail("umask changed"))
+        converter.write_jsonl(examples, tmp_path / "out.jsonl")
+        assert len((tmp_path / "out.jsonl").read_text().splitlines()) == len(examples)
+
+    def test_unknown_compression(self, converter, examples, tmp_path):
+        with pytest.raises(ValueError):
+            converter.write_jsonl(examples, tmp_path / "out.jsonl", compression="rar")
@@ -0,0 +1,169 @@
+"""Tests for dataset_curator.dedup_store."""
+
+from functools import partial
+
+import pytest
+
+from dataset_curator.cleaner import DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.dedup_store import MappedTexts
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.similarity import ExhaustiveIndex, MinHashLSHIndex, PrefilterIndex
+
+FIRST_BATCH = [
+    "what is python programming?",
+    "explain quantum computing in simple terms",
+    "how does a car engine work?",
+]
+
+
+@pytest.fixture(params=["prefilter", "prefilter-ngram", "exhaustive", "minhash"])
+def dedup(request):
+    if request.param == "prefilter-ngram":
+        return Deduplicator(threshold=0.95, index_factory=partial(PrefilterIndex, ngram_size=4))
+    if request.param == "minhash":
+        return Deduplicator(threshold=0.95, index_factory=MinHashLSHIndex)
+    if request.param == "exhaustive":
+        return Deduplicator(threshold=0.95, index_factory=ExhaustiveIndex)
+    return Deduplicator(threshold=0.95)
+
+
+@pytest.fixture
+def saved(dedup, tmp_path):
+    session = dedup.session()
+    for text in FIRST_BATCH + [FIRST_BATCH[0]]:
+        session.check_text(text)
+    path = tmp_path / "index.bin"
+    session.save(path)
+    return path
+
+
+class TestLoadSession:
+    def test_rejects_historical_exact_duplicates(self, dedup, saved):
+        session = dedup.load_session(saved)
+        assert session.check_text("how does a car engine work?") is False
+        assert session.exact_removed == 1
+
+    def test_rejects_historical_near_duplicates(self, dedup, saved):
+        session = dedup.load_session(saved)
+        assert session.check_text("what is python programming") is False
+        assert session.near_removed == 1
+
+    def test_accepts_new_texts(self, dedup, saved):
+        session = dedup.load_session(saved)
+        assert session.check_text("describe the water cycle to a child") is True
+
+    def test_append_and_resave(self, dedup, saved):
+        session = dedup.load_session(saved)
+        session.check_text("describe the water cycle to a child")
+        session.save(saved)
+        reloaded = dedup.load_session(saved)
+        assert reloaded.check_text("describe the water cycle to a child") is False
+        assert reloaded.check_text("what is python programming?") is False
+        assert reloaded.check_text("a brand new question about gardening") is True
+
+    def test_repeated_appends_match_a_single_save(self, dedup, saved, tmp_path):
+        batches = [
+            ["describe the water cycle to a child", "what is python programming"],
+            ["name three primary colors", "how does a car engine work?", "tell me a joke"],
+        ]
+        for batch in batches:
+            session = dedup.load_session(saved)
+            for text in batch:
+                session.check_text(text)
+            session.save(saved)
+
+        fresh = dedup.session()
+        for text in FIRST_BATCH + [text for batch in batches for text in batch]:
+            fresh.check_text(text)
+        path = tmp_path / "fresh.bin"
+        fresh.save(path)
+        assert saved.read_bytes() == path.read_bytes()
+
+    def test_save_streams_history_without_decoding(self, dedup, saved, monkeypatch):
+        session = dedup.load_session(saved)
+        session.check_text("describe the water cycle to a child")
+        decoded = []
+        original = MappedTexts.__getitem__
+
+        def counting(self, index):
+            decoded.append(index)
+            return original(self, index)
+
+        monkeypatch.setattr(MappedTexts, "__getitem__", counting)
+        session.save(saved)
+        assert decoded == []
+        assert list(dedup.load_session(saved).index.texts) == [
+            *FIRST_BATCH,
+            "describe the water cycle to a child",
+        ]
+
+    def test_prefilter_load_reads_no_texts(self, tmp_path, monkeypatch):
+        dedup = Deduplicator(threshold=0.95)
+        session = dedup.session()
+        for text in FIRST_BATCH:
+            session.check_text(text)
+        session.save(tmp_path / "index.bin")
+        decoded = []
+        original = MappedTexts.__getitem__
+
+        def counting(self, index):
+            decoded.append(index)
+            return original(self, index)
+
+        monkeypatch.setattr(MappedTexts, "__getitem__", counting)
+        session = dedup.load_session(tmp_path / "index.bin")
+        assert decoded == []
+        assert session.check_text("what is python programming") is False
+        assert decoded == [0]
+
+    def test_history_texts_are_mapped(self, dedup, saved):
+        session = dedup.load_session(saved)
+        assert list(session.index.texts) == FIRST_BATCH
+
+    def test_empty_session_round_trip(self, dedup, tmp_path):
+        path = tmp_path / "empty.bin"
+        dedup.session().save(path)
+        assert dedup.load_session(path).check_text("anything at all") is True
+
+    def test_close_releases_map(self, dedup, saved):
+        session = dedup.load_session(saved)
+        mapping = session._history_map
+        session.close()
+        assert mapping.closed
+        session.close()
+
+    def test_close_fresh_session_does_nothing(self, dedup):
+        with dedup.session() as session:
+            session.check_text("anything at all")
+        assert session.check_text("anything at all") is False
+
+    def test_mismatched_index_configuration(self, saved):
+        other = Deduplicator(index_factory=lambda: MinHashLSHIndex(seed=42))
+        with pytest.raises(ValueError):
+            other.load_session(saved)
+
+    def test_not_an_index_file(self, dedup, tmp_path):
+        path = tmp_path / "bogus.bin"
+        path.write_bytes(b"not an index file at all")
+        with pytest.raises(ValueError):
+            dedup.load_session(path)
+
+
+class TestPipelineIntegration:
+    def test_second_batch_skips_historical_examples(self, dedup, tmp_path):
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), dedup)
+        first = [RawExample(source="day1", content=c) for c in FIRST_BATCH]
+        session = dedup.session()
+        list(pipeline.run_stream(first, session=session))
+        path = tmp_path / "index.bin"
+        session.save(path)
+
+        second = [
+            RawExample(source="day2", content="What is Python programming?"),
+            RawExample(source="day2", content="Describe the water cycle to a child."),
+        ]
+        curated = list(pipeline.run_stream(second, session=dedup.load_session(path)))
+        assert [ex.messages[0].content for ex in curated] == [second[1].content]
@@ -1,8 +1,9 @@
 """Tests for dataset_curator.deduplicator."""
 
 import pytest
-from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.deduplicator import BloomDedupSession, Deduplicator, content_hash
 from dataset_curator.models import ChatMessage, TrainingExample
+from dataset_curator.similarity import ExhaustiveIndex
 
 
 def _make_example(content: str, source: str = "test") -> TrainingExample:
@@ -95,3 +96,228 @@ class TestDeduplicate:
         unique, removed = dedup_low.deduplicate(examples)
         # With a low threshold, these might be considered duplicates
         assert removed >= 0  # depends on similarity score
+
+
+class TestDedupSession:
+    def test_exact_repeats_counted_separately(self, dedup):
+        session = dedup.session()
+        assert session.check(_make_example("What is Python programming?")) is True
+        assert session.check(_make_example("  what is python PROGRAMMING?  ")) is False
+        assert session.check(_make_example("What is Python programming")) is False
+        assert session.exact_removed == 1
+        assert session.near_removed == 1
+        assert session.removed == 2
+
+    def test_exact_repeat_skips_similarity(self, dedup, monkeypatch):
+        session = dedup.session()
+        session.check_text("hello world")
+        monkeypatch.setattr(dedup, "_similarity", lambda a, b: pytest.fail("compared"))
+        assert session.check_text("hello world") is False
+
+    def test_unreachable_threshold_keeps_exact_repeats(self):
+        dedup = Deduplicator(threshold=1.5)
+        examples = [_make_example("hello world"), _make_example("hello world")]
+        assert dedup.deduplicate(examples) == (examples, 0)
+        session = dedup.session()
+        assert session.check_text("hello world") is True
+        assert session.check_text("hello world") is True
+        assert session.exact_removed == 0
+
+    def test_counts_comparisons(self):
+        session = Deduplicator(index_factory=ExhaustiveIndex).session()
+        session.check_text("first text")
+        session.check_text("second text")
+        session.check_text("first text")  # exact repeat, not compared
+        session.check_text("third text")
+        assert session.comparisons == 3
+
+    def test_last_match(self, dedup):
+        session = dedup.session()
+        session.check_text("what is python programming?")
+        assert session.last_match is None
+        assert session.check_text("what is python programming") is False
+        assert session.last_match == "what is python programming?"
+        session.check_text("what is python programming")  # exact repeat
+        assert session.last_match is None
+
+    def test_counters_round_trip(self, dedup):
+        session = dedup.session()
+        for text in ["first text", "first text", "first text!"]:
+            session.check_text(text)
+        resumed = dedup.session()
+        resumed.restore_counters(session.counters())
+        assert resumed.counters() == session.counters()
+        assert (resumed.exact_removed, resumed.near_removed) == (1, 1)
+
+    def test_restore_rejects_unknown_counter(self, dedup):
+        with pytest.raises(ValueError, match="Unknown session counters"):
+            dedup.session().restore_counters({"index": 1})
+
+    def test_content_hash_is_stable(self):
+        assert content_hash("abc") == content_hash("abc")
+        assert content_hash("abc") != content_hash("abd")
+
+
+class TestCluster:
+    def test_groups_exact_and_near_duplicates(self, dedup):
+        examples = [
+            _make_example("What is Python programming?"),
+            _make_example("How do I bake bread?"),
+            _make_example("what is python programming?"),
+            _make_example("What is Python programming"),
+            _make_example("What is Python programming"),
+        ]
+        kept, clusters = dedup.cluster(examples)
+        assert kept == examples[:2]
+        assert [c.model_dump() for c in clusters] == [
+            {"representative": 0, "members": [0, 2, 3, 4]}
+        ]
+
+    def test_matches_deduplicate_by_default(self, dedup):
+        texts = ["alpha beta gamma", "alpha beta gamm", "delta", "alpha beta gamma", "delta!"]
+        examples = [_make_example(text) for text in texts]
+        kept, clusters = dedup.cluster(examples)
+        assert kept == dedup.deduplicate(examples)[0]
+        assert len(examples) - len(kept) == sum(len(c.members) - 1 for c in clusters)
+
+    def test_key_selects_representative(self, dedup):
+        examples = [
+            _make_example("What is Python programming"),
+            _make_example("Unrelated question"),
+            _make_example("What is Python programming?"),
+        ]
+        examples[2].quality_score = 0.9
+        kept, clusters = dedup.cluster(examples, key=lambda e: e.quality_score)
+        assert kept == [examples[1], examples[2]]
+        assert clusters[0].representative == 2
+        assert clusters[0].members == [0, 2]
+
+    def test_ties_keep_earliest(self, dedup):
+        examples = [_make_example("same text"), _make_example("same text")]
+        kept, clusters = dedup.cluster(examples, key=lambda e: 1)
+        assert kept == [examples[0]]
+        assert clusters[0].representative == 0
+
+    def test_links_chains_through_union_find(self):
+        dedup = Deduplicator(threshold=0.9, index_factory=ExhaustiveIndex)
+        examples = [_make_example(t) for t in ["abcdefghij", "abcdefghiX", "abcdefghiX"]]
+        _, clusters = dedup.cluster(examples)
+        assert clusters[0].members == [0, 1, 2]
+
+    def test_length_key(self, dedup):
+        examples = [_make_example("Explain recursion"), _make_example("Explain recursion.")]
+        kept, _ = dedup.cluster(examples, key=lambda e: len(e.messages[0].content))
+        assert kept == [examples[1]]
+
+    def test_no_duplicates(self, dedup):
+        examples = [_make_example("first"), _make_example("second question")]
+        assert dedup.cluster(examples) == (examples, [])
+
+    def test_empty_list(self, dedup):
+        assert dedup.cluster([]) == ([], [])
+
+
+class TestBloomDedup:
+    def test_session_type(self):
+        assert isinstance(Deduplicator(bloom_capacity=100).session(), BloomDedupSession)
+        assert not isinstance(Deduplicator().session(), BloomDedupSession)
+
+    def test_removes_exact_repeats_only(self):
+        dedup = Deduplicator(bloom_capacity=100)
+        examples = [
+            _make_example("What is Python programming?"),
+            _make_example("  what is python PROGRAMMING?  "),
+            _make_example("What is Python programming"),
+        ]
+        unique, removed = dedup.deduplicate(examples)
+        assert unique == [examples[0], examples[2]]
+        assert removed == 1
+
+    def test_estimated_false_drop_rate(self):
+        session = Deduplicator(bloom_capacity=10, bloom_error_rate=0.1).session()
+        assert session.estimated_false_drop_rate == 0.0
+        for i in range(50):
+            session.check_text(f"text number {i}")
+        assert 0.0 < session.estimated_false_drop_rate < 1.0
+        assert Deduplicator().session().estimated_false_drop_rate == 0.0
+
+    def test_counters_include_false_drop_estimate(self):
+        dedup = Deduplicator(bloom_capacity=10)
+        session = dedup.session()
+        for i in range(20):
+            session.check_text(f"text {i}")
+        resumed = dedup.session()
+        resumed.restore_counters(session.counters())
+        assert resumed.checks == 20
+        assert resumed.estimated_false_drop_rate == session.estimated_false_drop_rate > 0
+
+    def test_save_and_load_session(self, tmp_path):
+        dedup = Deduplicator(bloom_capacity=100)
+        session = dedup.session()
+        session.check_text("first text")
+        path = tmp_path / "seen.bloom"
+        session.save(path)
+        resumed = dedup.load_session(path)
+        assert resumed.check_text("first text") is False
+        assert resumed.check_text("second text") is True
+
+    @pytest.mark.parametrize(("capacity", "error_rate"), [(0, 0.01), (10, 1.5)])
+    def test_invalid_parameters(self, capacity, error_rate):
+        with pytest.raises(ValueError):
+            Deduplicator(bloom_capacity=capacity, bloom_error_rate=error_rate)
+
+    def test_session_needs_capacity(self):
+        with pytest.raises(ValueError, match="bloom_capacity"):
+            BloomDedupSession(Deduplicator())
+
+
+class TestFeatures:
+    def test_computed_together(self, dedup):
+        features = dedup.features(_make_example("  Hello World "))
+        assert features.normalized == "hello world"
+        assert features.digest == content_hash("hello world")
+
+    def test_joins_user_messages(self, dedup):
+        example = TrainingExample(
+            messages=[
+                ChatMessage(role="user", content="first"),
+                ChatMessage(role="assistant", content="reply"),
+                ChatMessage(role="user", content="second"),
+            ],
+            source="s",
+        )
+        assert dedup.features(example).normalized == "first second"
+
+
+class TestDeduplicateParallel:
+    def test_matches_sequential(self, dedup):
+        contents = [f"Question number {i % 10} about topic {i % 4}" for i in range(60)]
+        contents += ["What is Python programming?", "What is Python programming"]
+        examples = [_make_example(c) for c in contents]
+        expected = dedup.deduplicate(examples)
+        assert dedup.deduplicate_parallel(examples, workers=2, partitions=5) == expected
+
+    @pytest.mark.parametrize("seed", range(16))
+    def test_non_transitive_chain_matches_sequential(self, dedup, seed):
+        # A~B and B~C reach the threshold, A~C does not: sequentially C is kept
+        texts = [
+            "the quick brown fox jumps over",
+            "the quick brown fox jumps ovex",
+            "the quick brawn fox jumps ovex",
+        ]
+        examples = [_make_example(text) for text in texts]
+        expected = dedup.deduplicate(examples)
+        assert len(expected[0]) == 2
+        assert dedup.deduplicate_parallel(examples, workers=2, partitions=2, seed=seed) == expected
+
+    def test_first_occurrence_wins(self, dedup):
+        examples = [
+            _make_example("Explain quantum computing", source="first"),
+            _make_example("Explain quantum computing.", source="second"),
+        ]
+        unique, removed = dedup.deduplicate_parallel(examples, workers=2, partitions=8)
+        assert [e.source for e in unique] == ["first"]
+        assert removed == 1
+
+    def test_empty_list(self, dedup):
+        assert dedup.deduplicate_parallel([]) == ([], 0)
@@ -0,0 +1,65 @@
+"""Tests for the lazy exports of the dataset_curator package."""
+
+import subprocess
+import sys
+
+import pytest
+
+import dataset_curator
+
+# Cumulative microseconds `import dataset_curator` may take under -X importtime;
+# eager submodule imports (pydantic models, difflib, numpy) take several times this.
+IMPORT_TIME_BUDGET_US = 100_000
+HEAVY_MODULES = ("pydantic", "difflib", "numpy", "sqlite3", "dataset_curator.models")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True
+    )
+
+
+class TestLazyExports:
+    @pytest.mark.parametrize("name", dataset_curator.__all__)
+    def test_public_names_resolve(self, name):
+        value = getattr(dataset_curator, name)
+        assert value.__name__ == name
+        assert value.__module__.startswith("dataset_curator.")
+
+    def test_all_names_are_mapped(self):
+        assert sorted(dataset_curator._EXPORTS) == sorted(dataset_curator.__all__)
+
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+            dataset_curator.Missing  # noqa: B018
+
+    def test_dir_lists_public_names(self):
+        assert set(dataset_curator.__all__) <= set(dir(dataset_curator))
+
+    def test_import_does_not_load_submodules(self):
+        code = (
+            "import sys, dataset_curator\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert _run(code).stdout.strip() == ""
+
+    def test_first_access_loads_only_its_submodule(self):
+        code = (
+            "import sys, dataset_curator\n"
+            "dataset_curator.DataCleaner\n"
+            "print('dataset_curator.pipeline' in sys.modules)"
+        )
+        assert _run(code).stdout.strip() == "False"
+
+
+class TestImportTime:
+    def test_within_budget(self):
+        stderr = _run("import dataset_curator", "-X", "importtime").stderr
+        cumulative = {}
+        for line in stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total)
+        assert cumulative["dataset_curator"] < IMPORT_TIME_BUDGET_US
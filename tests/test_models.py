@@ -1,7 +1,13 @@
 """Tests for dataset_curator.models."""
 
 import pytest
-from dataset_curator.models import ChatMessage, DatasetStats, RawExample, TrainingExample
+from dataset_curator.models import (
+    ChatMessage,
+    DatasetStats,
+    RawExample,
+    StageMetrics,
+    TrainingExample,
+)
 
 
 class TestRawExample:
@@ -74,3 +80,12 @@ class TestDatasetStats:
             duplicates_removed=10,
         )
         assert stats.duplicates_removed == 10
+
+
+class TestStageMetrics:
+    def test_throughput(self):
+        metrics = StageMetrics(stage="clean", seconds=2.0, items_in=100, items_out=90)
+        assert metrics.throughput == 50.0
+
+    def test_throughput_without_time(self):
+        assert StageMetrics(stage="dedup").throughput == 0.0
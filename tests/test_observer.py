@@ -0,0 +1,81 @@
+"""Tests for dataset_curator.observer."""
+
+import pytest
+
+from dataset_curator.cleaner import DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample, StageMetrics
+from dataset_curator.observer import STAGES, MetricsCollector, PipelineObserver
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.similarity import ExhaustiveIndex
+
+RAWS = [
+    RawExample(source="wiki", content="What is machine learning and how does it work?"),
+    RawExample(source="wiki", content="Explain deep learning in simple terms please."),
+    RawExample(source="api", content="What is machine learning and how does it work?"),
+    RawExample(source="api", content="Hi"),  # too short
+    RawExample(source="web", content="How do transformers use attention over tokens?"),
+]
+
+
+def _pipeline(observer, **kwargs):
+    # Exhaustive search, so every earlier unique text is compared
+    deduplicator = Deduplicator(index_factory=ExhaustiveIndex)
+    return CurationPipeline(
+        DataCleaner(), FormatConverter(), deduplicator, observer=observer, **kwargs
+    )
+
+
+class TestMetricsCollector:
+    def test_sums_stage_metrics(self):
+        collector = MetricsCollector()
+        collector.on_stage(StageMetrics(stage="dedup", seconds=1.0, items_in=4, comparisons=2))
+        collector.on_stage(StageMetrics(stage="dedup", seconds=0.5, items_in=2, comparisons=1))
+        dedup = collector.stages["dedup"]
+        assert dedup.seconds == 1.5
+        assert dedup.items_in == 6
+        assert collector.comparisons == 3
+
+    def test_report_lists_every_stage(self):
+        report = MetricsCollector().report()
+        for stage in STAGES:
+            assert stage in report
+        assert "similarity comparisons: 0" in report
+
+
+class TestPipelineInstrumentation:
+    @pytest.mark.parametrize("run", ["run", "run_stream"])
+    def test_stage_counts(self, run):
+        collector = MetricsCollector()
+        pipeline = _pipeline(collector)
+        if run == "run":
+            examples, _ = pipeline.run(RAWS)
+        else:
+            examples = list(pipeline.run_stream(RAWS))
+        stages = collector.stages
+        assert (stages["clean"].items_in, stages["clean"].items_out) == (5, 4)
+        assert (stages["convert"].items_in, stages["convert"].items_out) == (4, 4)
+        assert (stages["dedup"].items_in, stages["dedup"].items_out) == (4, 3)
+        assert stages["score"].items_out == len(examples) == 3
+        assert (stages["stats"].items_in, stages["stats"].items_out) == (3, 3)
+        assert all(m.seconds >= 0 for m in stages.values())
+        assert stages["dedup"].seconds > 0
+        # 3 unique texts checked against 0, 1, and 2 earlier ones; the exact repeat is hashed
+        assert collector.comparisons == 3
+
+    def test_workers(self):
+        collector = MetricsCollector()
+        _pipeline(collector, workers=2, chunk_size=2).run(RAWS)
+        assert collector.stages["clean"].items_in == 5
+        assert collector.stages["dedup"].items_out == 3
+
+    def test_base_observer_is_noop(self):
+        examples, stats = _pipeline(PipelineObserver()).run(RAWS)
+        assert stats.total_examples == len(examples) == 3
+
+    def test_without_observer_results_match(self):
+        plain, plain_stats = _pipeline(None).run(RAWS)
+        observed, observed_stats = _pipeline(MetricsCollector()).run(RAWS)
+        assert plain == observed
+        assert plain_stats == observed_stats
@@ -0,0 +1,160 @@
+"""Tests for dataset_curator.packed."""
+
+import os
+import stat
+
+import pytest
+
+from dataset_curator.converter import FormatConverter
+from dataset_curator.models import ChatMessage, TrainingExample
+from dataset_curator.packed import MAGIC, PackedDataset, write_packed
+
+
+def _example(i: int, system: bool = False) -> TrainingExample:
+    messages = [
+        ChatMessage(role="user", content=f"question number {i}"),
+        ChatMessage(role="assistant", content=f"question number {i}"),
+    ]
+    if system:
+        messages.insert(0, ChatMessage(role="system", content="be helpful"))
+    return TrainingExample(messages=messages, quality_score=i / 10, source=f"src{i % 3}")
+
+
+@pytest.fixture
+def examples():
+    return [_example(i, system=i % 2 == 0) for i in range(10)]
+
+
+@pytest.fixture
+def packed(examples, tmp_path):
+    path = tmp_path / "data.pack"
+    write_packed(iter(examples), path)
+    with PackedDataset(path) as dataset:
+        yield dataset
+
+
+class TestWritePacked:
+    def test_returns_count(self, examples, tmp_path):
+        assert write_packed(examples, tmp_path / "data.pack") == 10
+
+    def test_starts_with_magic(self, examples, tmp_path):
+        path = tmp_path / "data.pack"
+        write_packed(examples, path)
+        assert path.read_bytes().startswith(MAGIC)
+
+    def test_atomic_write_leaves_no_partial_file(self, examples, tmp_path):
+        path = tmp_path / "data.pack"
+
+        def failing():
+            yield examples[0]
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_packed(failing(), path)
+        assert os.listdir(tmp_path) == []
+
+    def test_file_mode_respects_umask(self, examples, tmp_path):
+        path = tmp_path / "data.pack"
+        previous = os.umask(0o022)
+        try:
+            write_packed(examples, path)
+        finally:
+            os.umask(previous)
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "empty.pack"
+        assert write_packed([], path) == 0
+        with PackedDataset(path) as dataset:
+            assert len(dataset) == 0
+            assert list(dataset) == []
+
+
+class TestPackedDataset:
+    def test_round_trip(self, packed, examples):
+        assert len(packed) == len(examples)
+        assert list(packed) == examples
+
+    def test_random_access(self, packed, examples):
+        assert packed[7] == examples[7]
+        assert packed[-1] == examples[-1]
+
+    def test_slice(self, packed, examples):
+        assert packed[2:8:3] == examples[2:8:3]
+
+    def test_out_of_range(self, packed):
+        with pytest.raises(IndexError):
+            packed[10]
+        with pytest.raises(IndexError):
+            packed[-11]
+
+    def test_unicode_content(self, tmp_path):
+        example = TrainingExample(
+            messages=[
+                ChatMessage(role="user", content="héllo wörld 你好 🚀"),
+                ChatMessage(role="assistant", content="héllo wörld 你好 🚀"),
+            ],
+            quality_score=0.5,
+            source="ünï",
+        )
+        path = tmp_path / "data.pack"
+        write_packed([example], path)
+        with PackedDataset(path) as dataset:
+            assert dataset[0] == example
+
+    def test_record_bytes_is_zero_copy_view(self, packed):
+        record = packed.record_bytes(3)
+        assert isinstance(record, memoryview)
+        assert record.readonly
+        assert b"question number 3" in record.tobytes()
+        record.release()
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "data.pack"
+        path.write_bytes(b"not a packed dataset at all")
+        with pytest.raises(ValueError, match="not a packed dataset"):
+            PackedDataset(path)
+
+    def test_rejects_truncated_file(self, tmp_path):
+        path = tmp_path / "data.pack"
+        path.write_bytes(MAGIC)
+        with pytest.raises(ValueError, match="not a packed dataset"):
+            PackedDataset(path)
+
+    def test_rejects_unknown_version(self, examples, tmp_path):
+        path = tmp_path / "data.pack"
+        write_packed(examples, path)
+        data = bytearray(path.read_bytes())
+        data[len(MAGIC)] = 99
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="version 99"):
+            PackedDataset(path)
+
+
+class TestConverterPacked:
+    def test_jsonl_round_trip(self, examples, tmp_path):
+        converter = FormatConverter()
+        jsonl = tmp_path / "data.jsonl.gz"
+        converter.write_jsonl(examples, jsonl)
+        assert converter.jsonl_to_packed(jsonl, tmp_path / "data.pack") == 10
+        result = converter.packed_to_jsonl(tmp_path / "data.pack", tmp_path / "out.jsonl")
+        assert result.lines_written == 10
+        assert (tmp_path / "out.jsonl").read_text() == converter.to_jsonl(examples) + "\n"
+
+    def test_read_packed(self, examples, tmp_path):
+        converter = FormatConverter()
+        converter.write_packed(examples, tmp_path / "data.pack")
+        with converter.read_packed(tmp_path / "data.pack") as dataset:
+            assert dataset[4] == examples[4]
+
+    def test_read_jsonl_skips_blank_lines(self, examples, tmp_path):
+        converter = FormatConverter()
+        path = tmp_path / "data.jsonl"
+        path.write_text(converter.to_jsonl(examples[:2]) + "\n\n")
+        assert list(converter.read_jsonl(path)) == examples[:2]
+
+    def test_read_jsonl_invalid_record(self, tmp_path):
+        path = tmp_path / "data.jsonl"
+        path.write_text('{"messages": "hello"}\n')
+        with pytest.raises(ValueError, match=":1: invalid record"):
+            list(FormatConverter().read_jsonl(path))
@@ -1,11 +1,19 @@
 """Tests for dataset_curator.pipeline."""
 
+import asyncio
+import io
+import itertools
+import os
+
 import pytest
+from dataset_curator.checkpoint import dedup_file_name, load_checkpoint
 from dataset_curator.cleaner import DataCleaner
 from dataset_curator.converter import FormatConverter
 from dataset_curator.deduplicator import Deduplicator
 from dataset_curator.models import DatasetStats, RawExample, TrainingExample
 from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.scoring import LanguageScorer, LengthScorer, ScoringEngine
+from dataset_curator.stats import StatsAccumulator
 
 
 @pytest.fixture
@@ -22,7 +30,9 @@ class TestPipelineRun:
         raws = [
             RawExample(source="wiki", content="What is machine learning and how does it work?"),
             RawExample(source="wiki", content="Explain deep learning in simple terms please."),
-            RawExample(source="api", content="What is machine learning and how does it work?"),  # dup
+            RawExample(
+                source="api", content="What is machine learning and how does it work?"
+            ),  # dup
         ]
         examples, stats = pipeline.run(raws)
         assert isinstance(stats, DatasetStats)
@@ -72,3 +82,412 @@ class TestPipelineRun:
         ]
         examples, stats = pipeline.run(raws)
         assert 0.0 <= stats.avg_quality <= 1.0
+
+    def test_stats_split_exact_and_near_duplicates(self, pipeline):
+        raws = [
+            RawExample(source="wiki", content="What is machine learning and how does it work?"),
+            RawExample(source="wiki", content="What is machine learning and how does it work?"),
+            RawExample(source="wiki", content="What is machine learning and how does it work"),
+        ]
+        _, stats = pipeline.run(raws)
+        assert stats.exact_duplicates_removed == 1
+        assert stats.near_duplicates_removed == 1
+        assert stats.duplicates_removed == 2
+
+
+class TestPipelineRunStream:
+    def test_accepts_generator_and_yields_lazily(self, pipeline):
+        consumed = []
+
+        def source():
+            for i in range(3):
+                consumed.append(i)
+                yield RawExample(source="gen", content=f"Generated example number {i} " * 3)
+
+        stream = pipeline.run_stream(source())
+        first = next(stream)
+        assert isinstance(first, TrainingExample)
+        assert consumed == [0]
+
+    def test_matches_run(self, pipeline):
+        raws = [
+            RawExample(source="wiki", content="What is machine learning and how does it work?"),
+            RawExample(source="api", content="What is machine learning and how does it work?"),
+            RawExample(source="wiki", content="hi"),
+            RawExample(source="api", content="Explain deep learning in simple terms please."),
+        ]
+        expected, expected_stats = pipeline.run(raws)
+        stats = StatsAccumulator()
+        streamed = list(pipeline.run_stream(iter(raws), stats=stats))
+        assert streamed == expected
+        assert stats.to_stats() == expected_stats
+
+    def test_returns_stats_when_exhausted(self, pipeline):
+        stream = pipeline.run_stream(iter([]))
+        with pytest.raises(StopIteration) as exc_info:
+            next(stream)
+        assert exc_info.value.value.total_examples == 0
+
+
+class TestPipelineWorkers:
+    def test_parallel_matches_serial(self, pipeline):
+        raws = [
+            RawExample(source=f"s{i % 3}", content=f"Example number {i % 7} with enough text")
+            for i in range(40)
+        ]
+        raws.append(RawExample(source="s0", content="tiny"))
+        parallel = CurationPipeline(
+            cleaner=DataCleaner(),
+            converter=FormatConverter(),
+            deduplicator=Deduplicator(threshold=0.95),
+            workers=2,
+            chunk_size=3,
+        )
+        assert parallel.run(raws) == pipeline.run(raws)
+
+    def test_invalid_workers(self):
+        with pytest.raises(ValueError):
+            CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), workers=0)
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), chunk_size=0)
+
+    def test_length_limits(self):
+        raws = [
+            RawExample(source="s", content="short one"),
+            RawExample(source="s", content="a somewhat longer example text"),
+        ]
+        pipeline = CurationPipeline(
+            DataCleaner(), FormatConverter(), Deduplicator(), min_length=5, max_length=20
+        )
+        examples, _ = pipeline.run(raws)
+        assert [e.messages[0].content for e in examples] == ["short one"]
+
+    def test_invalid_length_limits(self):
+        with pytest.raises(ValueError, match="min_length"):
+            CurationPipeline(
+                DataCleaner(), FormatConverter(), Deduplicator(), min_length=10, max_length=5
+            )
+
+
+TOPICS = ["python", "quantum physics", "cooking", "gardening", "tax law"]
+
+
+class _CountingDeduplicator(Deduplicator):
+    def __init__(self):
+        super().__init__(threshold=0.95)
+        self.normalized = 0
+
+    def _normalize(self, text):
+        self.normalized += 1
+        return super()._normalize(text)
+
+
+class TestFeatureReuse:
+    RAWS = tuple(
+        RawExample(source="s", content=f"Tell me about {TOPICS[i % 5]}") for i in range(10)
+    )
+
+    def test_run_normalizes_each_example_once(self):
+        deduplicator = _CountingDeduplicator()
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), deduplicator)
+        examples, stats = pipeline.run(list(self.RAWS))
+        assert len(examples) == 5
+        assert stats.exact_duplicates_removed == 5
+        assert deduplicator.normalized == len(self.RAWS)
+
+    def test_run_stream_normalizes_each_example_once(self):
+        deduplicator = _CountingDeduplicator()
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), deduplicator)
+        assert len(list(pipeline.run_stream(self.RAWS))) == 5
+        assert deduplicator.normalized == len(self.RAWS)
+
+    def test_run_batches_normalizes_each_example_once(self):
+        deduplicator = _CountingDeduplicator()
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), deduplicator)
+        batches = list(pipeline.run_batches([list(self.RAWS[:4]), list(self.RAWS[4:])]))
+        assert sum(map(len, batches)) == 5
+        assert deduplicator.normalized == len(self.RAWS)
+
+
+class TestScoring:
+    RAWS = (
+        RawExample(source="s", content="Tell me about the history of the printing press."),
+        RawExample(source="s", content="1234 5678 9012 3456 7890 1234"),
+        RawExample(source="s", content="Explain how photosynthesis works in green plants."),
+    )
+
+    def test_floor_rejects_low_quality(self):
+        engine = ScoringEngine([LengthScorer(), LanguageScorer()], floor=0.05)
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), scorer=engine)
+        examples, stats = pipeline.run(list(self.RAWS))
+        assert [e.messages[0].content for e in examples] == [
+            self.RAWS[0].content,
+            self.RAWS[2].content,
+        ]
+        assert stats.low_quality_removed == 1
+        assert stats.total_examples == 2
+
+    def test_run_batches_matches_run(self):
+        engine = ScoringEngine([LengthScorer(), LanguageScorer()], floor=0.05)
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), scorer=engine)
+        stats = StatsAccumulator()
+        batches = list(
+            pipeline.run_batches([list(self.RAWS[:2]), list(self.RAWS[2:])], stats=stats)
+        )
+        examples, expected = pipeline.run(list(self.RAWS))
+        assert [e for batch in batches for e in batch] == examples
+        assert stats.to_stats() == expected
+
+    def test_default_scores_by_length(self, pipeline):
+        examples, _ = pipeline.run(list(self.RAWS))
+        assert [e.quality_score for e in examples] == [len(raw.content) / 500 for raw in self.RAWS]
+
+
+class TestPipelineRunBatches:
+    def test_matches_run_stream(self, pipeline):
+        topics = ["python", "quantum physics", "cooking", "gardening", "tax law", "chess"]
+        raws = [
+            RawExample(source=f"s{i % 3}", content=f"Tell me everything about {topics[i % 6]}")
+            for i in range(20)
+        ]
+        stream_stats = StatsAccumulator()
+        expected = list(pipeline.run_stream(raws, stats=stream_stats))
+        batch_stats = StatsAccumulator()
+        batches = list(pipeline.run_batches([raws[:8], raws[8:], []], stats=batch_stats))
+        assert [len(b) for b in batches] == [6, 0, 0]
+        assert [ex for batch in batches for ex in batch] == expected
+        assert batch_stats.to_stats() == stream_stats.to_stats()
+
+    def test_scores_each_batch(self, pipeline):
+        raws = [
+            RawExample(source="a", content="x" * 250),
+            RawExample(source="b", content="y" * 900),
+        ]
+        (batch,) = pipeline.run_batches([raws])
+        assert [ex.quality_score for ex in batch] == [0.5, 1.0]
+
+
+TOPICS = ["python", "quantum physics", "cooking", "gardening", "tax law", "chess"]
+ASYNC_RAWS = [
+    RawExample(source=f"s{i % 3}", content=f"Tell me everything about {TOPICS[i % 6]}")
+    for i in range(20)
+] + [RawExample(source="s0", content="tiny")]
+
+
+async def _aiter(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+async def _collect(pipeline, raws, **kwargs):
+    return [batch async for batch in pipeline.run_async(raws, **kwargs)]
+
+
+class TestPipelineRunAsync:
+    def _pipeline(self, **kwargs):
+        return CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator(), **kwargs)
+
+    def test_matches_run_batches(self):
+        pipeline = self._pipeline(chunk_size=4)
+        expected_stats = StatsAccumulator()
+        chunks = [ASYNC_RAWS[i : i + 4] for i in range(0, len(ASYNC_RAWS), 4)]
+        expected = list(pipeline.run_batches(chunks, stats=expected_stats))
+        stats = StatsAccumulator()
+        batches = asyncio.run(_collect(pipeline, _aiter(ASYNC_RAWS), stats=stats))
+        assert batches == expected
+        assert stats.to_stats() == expected_stats.to_stats()
+
+    def test_accepts_regular_iterable(self):
+        pipeline = self._pipeline(chunk_size=4)
+        batches = asyncio.run(_collect(pipeline, ASYNC_RAWS))
+        assert [ex for batch in batches for ex in batch] == pipeline.run(ASYNC_RAWS)[0]
+
+    def test_workers(self):
+        pipeline = self._pipeline(workers=2, chunk_size=3)
+        batches = asyncio.run(_collect(pipeline, _aiter(ASYNC_RAWS)))
+        assert [ex for batch in batches for ex in batch] == pipeline.run(ASYNC_RAWS)[0]
+
+    def test_backpressure_bounds_read_ahead(self):
+        pulled = itertools.count()
+
+        async def endless():
+            for i in itertools.count():
+                next(pulled)
+                await asyncio.sleep(0)
+                yield RawExample(source="s", content=f"Endless example number {i} here")
+
+        async def consume_slowly():
+            stream = self._pipeline(chunk_size=2).run_async(endless(), queue_size=1)
+            await anext(stream)
+            await asyncio.sleep(0.2)
+            await stream.aclose()
+            return next(pulled)
+
+        # A few chunks per stage at most, however long the consumer pauses
+        assert asyncio.run(consume_slowly()) <= 20
+
+    def test_source_errors_propagate(self):
+        async def failing():
+            yield RawExample(source="s", content="A perfectly valid example text")
+            raise RuntimeError("source failed")
+
+        with pytest.raises(RuntimeError, match="source failed"):
+            asyncio.run(_collect(self._pipeline(chunk_size=1), failing()))
+
+    def test_invalid_queue_size(self):
+        with pytest.raises(ValueError):
+            asyncio.run(_collect(self._pipeline(), [], queue_size=0))
+
+
+CHECKPOINT_RAWS = [
+    *ASYNC_RAWS,
+    *(RawExample(source="s1", content=f"Tell me everything about {t}!") for t in TOPICS),
+    *(
+        RawExample(source=f"s{i}", content=f"Question {i}: how does {TOPICS[i % 6]} work")
+        for i in range(9)
+    ),
+]
+
+
+def _crashing(raws, after):
+    yield from raws[:after]
+    raise RuntimeError("crashed")
+
+
+class TestPipelineRunCheckpointed:
+    def _pipeline(self, deduplicator=None):
+        deduplicator = deduplicator if deduplicator is not None else Deduplicator()
+        return CurationPipeline(DataCleaner(), FormatConverter(), deduplicator, chunk_size=4)
+
+    def _expected(self, pipeline):
+        examples, stats = pipeline.run(CHECKPOINT_RAWS)
+        buffer = io.BytesIO()
+        pipeline.converter.write_jsonl(examples, buffer)
+        return buffer.getvalue(), stats
+
+    def test_matches_run(self, tmp_path):
+        pipeline = self._pipeline()
+        output = tmp_path / "out.jsonl"
+        stats = pipeline.run_checkpointed(CHECKPOINT_RAWS, output, tmp_path / "ckpt", interval=5)
+        assert (output.read_bytes(), stats) == self._expected(pipeline)
+        checkpoint = load_checkpoint(tmp_path / "ckpt")
+        assert checkpoint.input_offset == len(CHECKPOINT_RAWS)
+        assert checkpoint.output_position == output.stat().st_size
+        assert sorted(os.listdir(tmp_path / "ckpt")) == ["checkpoint.json", checkpoint.dedup_file]
+
+    def test_resumes_after_crash(self, tmp_path):
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+        with pytest.raises(RuntimeError, match="crashed"):
+            self._pipeline(_CountingDeduplicator()).run_checkpointed(
+                _crashing(CHECKPOINT_RAWS, 27), output, directory, interval=8
+            )
+        checkpoint = load_checkpoint(directory)
+        assert checkpoint.input_offset == 24
+        # Lines written after the checkpoint are discarded on resume
+        with open(output, "ab") as f:
+            f.write(b'{"partial": ')
+
+        deduplicator = _CountingDeduplicator()
+        pipeline = self._pipeline(deduplicator)
+        stats = pipeline.run_checkpointed(CHECKPOINT_RAWS, output, directory, interval=8)
+        assert (output.read_bytes(), stats) == self._expected(self._pipeline())
+        # Examples before the checkpoint are skipped, not reprocessed
+        assert deduplicator.normalized == len(CHECKPOINT_RAWS) - checkpoint.input_offset
+
+    def test_resumes_bloom_dedup(self, tmp_path):
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+
+        def pipeline():
+            return self._pipeline(Deduplicator(bloom_capacity=1000))
+
+        with pytest.raises(RuntimeError):
+            pipeline().run_checkpointed(
+                _crashing(CHECKPOINT_RAWS, 15), output, directory, interval=4
+            )
+        stats = pipeline().run_checkpointed(CHECKPOINT_RAWS, output, directory, interval=4)
+        assert (output.read_bytes(), stats) == self._expected(pipeline())
+
+    @pytest.mark.parametrize("bloom_capacity", [None, 1000])
+    def test_session_is_durable_before_checkpoint(self, tmp_path, monkeypatch, bloom_capacity):
+        events = []
+        fsync, replace, remove = os.fsync, os.replace, os.remove
+
+        def syncing(fd):
+            events.append("fsync")
+            fsync(fd)
+
+        def replacing(src, dst):
+            events.append(f"replace {os.path.basename(dst)}")
+            replace(src, dst)
+
+        def removing(path):
+            events.append(f"remove {os.path.basename(path)}")
+            remove(path)
+
+        monkeypatch.setattr(os, "fsync", syncing)
+        monkeypatch.setattr(os, "replace", replacing)
+        monkeypatch.setattr(os, "remove", removing)
+        directory = tmp_path / "ckpt"
+        self._pipeline(Deduplicator(bloom_capacity=bloom_capacity)).run_checkpointed(
+            CHECKPOINT_RAWS, tmp_path / "out.jsonl", directory, interval=8
+        )
+
+        expected = []
+        for generation in range(1, load_checkpoint(directory).generation + 1):
+            # Output, then session file and directory, then checkpoint file and directory
+            expected += ["fsync", "fsync", f"replace {dedup_file_name(generation)}", "fsync"]
+            expected += ["fsync", "replace checkpoint.json", "fsync"]
+            if generation > 1:
+                expected.append(f"remove {dedup_file_name(generation - 1)}")
+        assert events == expected
+
+    @pytest.mark.parametrize("bloom_capacity", [None, 1000])
+    def test_closes_loaded_session(self, tmp_path, monkeypatch, bloom_capacity):
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+        pipeline = self._pipeline(Deduplicator(bloom_capacity=bloom_capacity))
+        with pytest.raises(RuntimeError):
+            pipeline.run_checkpointed(_crashing(CHECKPOINT_RAWS, 15), output, directory, interval=4)
+        sessions = []
+        load_session = Deduplicator.load_session
+
+        def loading(self, path):
+            sessions.append(load_session(self, path))
+            return sessions[-1]
+
+        monkeypatch.setattr(Deduplicator, "load_session", loading)
+        pipeline.run_checkpointed(CHECKPOINT_RAWS, output, directory, interval=4)
+        (session,) = sessions
+        if bloom_capacity is None:
+            assert session._history_map is None
+        else:
+            assert session.seen._mmap is None
+
+    def test_finished_run_writes_nothing(self, tmp_path):
+        pipeline = self._pipeline()
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+        stats = pipeline.run_checkpointed(CHECKPOINT_RAWS, output, directory)
+        content = output.read_bytes()
+        generation = load_checkpoint(directory).generation
+        assert pipeline.run_checkpointed(CHECKPOINT_RAWS, output, directory) == stats
+        assert output.read_bytes() == content
+        assert load_checkpoint(directory).generation == generation
+
+    def test_rejects_different_configuration(self, tmp_path):
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+        self._pipeline().run_checkpointed(CHECKPOINT_RAWS, output, directory)
+        with pytest.raises(ValueError, match="different pipeline configuration"):
+            self._pipeline().run_checkpointed(CHECKPOINT_RAWS, output, directory, "Be brief.")
+
+    def test_rejects_truncated_output(self, tmp_path):
+        output, directory = tmp_path / "out.jsonl", tmp_path / "ckpt"
+        self._pipeline().run_checkpointed(CHECKPOINT_RAWS, output, directory)
+        output.write_bytes(b"")
+        with pytest.raises(ValueError, match="shorter than its checkpoint"):
+            self._pipeline().run_checkpointed(CHECKPOINT_RAWS, output, directory)
+
+    def test_invalid_interval(self, tmp_path):
+        with pytest.raises(ValueError):
+            self._pipeline().run_checkpointed([], tmp_path / "out.jsonl", tmp_path, interval=0)
@@ -0,0 +1,94 @@
+"""Tests for dataset_curator.reader."""
+
+import gzip
+import json
+
+import pytest
+
+from dataset_curator.cleaner import DataCleaner
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample
+from dataset_curator.pipeline import CurationPipeline
+from dataset_curator.reader import JsonlReader
+
+
+def _write(path, records):
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n", encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def records():
+    return [
+        {"source": "wiki", "content": "What is machine learning?", "metadata": {"id": 1}},
+        {"source": "api", "content": "Explain deep learning in simple terms."},
+        {"content": "A record without a source field."},
+    ]
+
+
+class TestRead:
+    def test_reads_records(self, tmp_path, records):
+        examples = list(JsonlReader().read(_write(tmp_path / "d.jsonl", records)))
+        assert [e.source for e in examples] == ["wiki", "api", ""]
+        assert examples[0].metadata == {"id": 1}
+        assert examples[1].metadata == {}
+        assert all(isinstance(e, RawExample) for e in examples)
+
+    def test_custom_field_names(self, tmp_path):
+        path = _write(tmp_path / "d.jsonl", [{"origin": "x", "text": "hello", "lang": "en"}])
+        reader = JsonlReader(source_field="origin", content_field="text", metadata_field=None)
+        (example,) = reader.read(path)
+        assert example.source == "x"
+        assert example.content == "hello"
+        assert example.metadata == {"lang": "en"}
+
+    def test_default_source(self, tmp_path, records):
+        reader = JsonlReader(source_field=None, default_source="dump")
+        examples = list(reader.read(_write(tmp_path / "d.jsonl", records)))
+        assert {e.source for e in examples} == {"dump"}
+
+    def test_reads_gzip(self, tmp_path, records):
+        path = tmp_path / "d.jsonl.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(r) for r in records))
+        assert len(list(JsonlReader().read(path))) == 3
+
+    def test_skips_blank_lines(self, tmp_path):
+        path = tmp_path / "d.jsonl"
+        path.write_text('{"content": "a"}\n\n   \n{"content": "b"}', encoding="utf-8")
+        assert [e.content for e in JsonlReader().read(path)] == ["a", "b"]
+
+    def test_without_validation(self, tmp_path, records):
+        examples = list(JsonlReader(validate=False).read(_write(tmp_path / "d.jsonl", records)))
+        assert examples[0].content == "What is machine learning?"
+
+    def test_invalid_json_reports_line(self, tmp_path):
+        path = tmp_path / "d.jsonl"
+        path.write_text('{"content": "a"}\nnot json\n', encoding="utf-8")
+        with pytest.raises(ValueError, match=":2:"):
+            list(JsonlReader().read(path))
+
+    def test_missing_content_field(self, tmp_path):
+        path = _write(tmp_path / "d.jsonl", [{"source": "x"}])
+        with pytest.raises(ValueError):
+            list(JsonlReader().read(path))
+
+
+class TestReadBatches:
+    def test_batches(self, tmp_path):
+        path = _write(tmp_path / "d.jsonl", [{"content": str(i)} for i in range(5)])
+        batches = list(JsonlReader(batch_size=2).read_batches(path))
+        assert [len(b) for b in batches] == [2, 2, 1]
+
+    def test_invalid_batch_size(self):
+        with pytest.raises(ValueError):
+            JsonlReader(batch_size=0)
+
+
+class TestPipelineIntegration:
+    def test_feeds_run_stream(self, tmp_path, records):
+        path = _write(tmp_path / "d.jsonl", records)
+        pipeline = CurationPipeline(DataCleaner(), FormatConverter(), Deduplicator())
+        curated = list(pipeline.run_stream(JsonlReader().read(path)))
+        assert len(curated) == 3
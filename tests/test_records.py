@@ -0,0 +1,77 @@
+"""Tests for dataset_curator.records."""
+
+from array import array
+
+import pytest
+
+from dataset_curator.converter import FormatConverter
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import RawExample, TrainingExample
+from dataset_curator.records import ExampleRecord
+
+
+class TestExampleRecord:
+    def test_uses_slots(self):
+        record = ExampleRecord(source="s", content="c")
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.extra = 1
+
+    def test_defaults(self):
+        record = ExampleRecord(source="s", content="c")
+        assert record.system_prompt == ""
+        assert record.quality_score == 0.0
+
+    @pytest.mark.parametrize("system_prompt", ["", "You are helpful."])
+    def test_matches_to_chat_format(self, system_prompt):
+        raw = RawExample(source="wiki", content="What is Python?")
+        expected = FormatConverter().to_chat_format(raw, system_prompt)
+        result = ExampleRecord("wiki", "What is Python?", system_prompt).to_training_example()
+        assert isinstance(result, TrainingExample)
+        assert result == expected
+        assert result.model_dump() == expected.model_dump()
+
+    def test_carries_quality_score(self):
+        record = ExampleRecord(source="s", content="c", quality_score=0.7)
+        assert record.to_training_example().quality_score == 0.7
+
+    def test_deduplicator_reads_record_content(self):
+        session = Deduplicator().session()
+        assert session.check(ExampleRecord(source="a", content="Hello World")) is True
+        assert session.check(ExampleRecord(source="b", content="hello world ")) is False
+
+
+class TestRecordBatch:
+    @pytest.fixture
+    def batch(self):
+        return FormatConverter().to_record_batch(
+            [RawExample(source="a", content="one"), RawExample(source="b", content="three")],
+            system_prompt="sys",
+        )
+
+    def test_columns(self, batch):
+        assert len(batch) == 2
+        assert batch.sources == ["a", "b"]
+        assert batch.contents == ["one", "three"]
+
+    def test_select(self, batch):
+        batch.normalized = ["one", "three"]
+        batch.fingerprints = [b"1", b"3"]
+        selected = batch.select([False, True])
+        assert selected.contents == ["three"]
+        assert selected.normalized == ["three"]
+        assert selected.fingerprints == [b"3"]
+        assert selected.system_prompt == "sys"
+
+    def test_records_carry_scores(self, batch):
+        batch.scores = array("d", [0.25, 0.5])
+        records = list(batch.records())
+        assert records[1] == ExampleRecord("b", "three", "sys", 0.5)
+
+    def test_records_default_scores(self, batch):
+        assert [r.quality_score for r in batch.records()] == [0.0, 0.0]
+
+    def test_to_training_examples(self, batch):
+        examples = batch.to_training_examples()
+        assert [e.source for e in examples] == ["a", "b"]
+        assert examples[0].messages[0].role == "system"
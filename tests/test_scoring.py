@@ -0,0 +1,157 @@
+"""Tests for dataset_curator.scoring."""
+
+import pytest
+
+from dataset_curator.scoring import (
+    SCORERS,
+    CharacterEntropyScorer,
+    LanguageScorer,
+    LengthScorer,
+    NgramPerplexityScorer,
+    QualityScorer,
+    RepetitionScorer,
+    ScoringEngine,
+    create_scorer,
+    register_scorer,
+)
+
+PROSE = "The quick brown fox jumps over the lazy dog near the quiet river bank."
+
+
+class _RecordingScorer(QualityScorer):
+    def __init__(self, name, cost, score):
+        self.name = name
+        self.cost = cost
+        self.score = score
+        self.seen = []
+
+    def score_batch(self, texts):
+        self.seen.append(list(texts))
+        return [self.score(text) for text in texts]
+
+
+class TestQualityScorer:
+    def test_score_batch_is_abstract(self):
+        with pytest.raises(TypeError):
+            QualityScorer()
+
+
+class TestLengthScorer:
+    def test_matches_legacy_heuristic(self):
+        assert LengthScorer().score_batch(["x" * 50, "x" * 500, "x" * 900]) == [0.1, 1.0, 1.0]
+
+    def test_invalid_normalization_length(self):
+        with pytest.raises(ValueError):
+            LengthScorer(0)
+
+
+class TestRepetitionScorer:
+    def test_distinct_text_scores_one(self):
+        assert RepetitionScorer().score_batch([PROSE]) == [1.0]
+
+    def test_repeated_text_scores_low(self):
+        (score,) = RepetitionScorer().score_batch(["buy now " * 20])
+        assert score < 0.1
+
+    def test_short_text(self):
+        assert RepetitionScorer().score_batch(["hi there"]) == [1.0]
+
+
+class TestCharacterEntropyScorer:
+    def test_prose_scores_high(self):
+        assert CharacterEntropyScorer().score_batch([PROSE])[0] > 0.8
+
+    def test_single_class_scores_zero(self):
+        assert CharacterEntropyScorer().score_batch(["1234567890", ""]) == [0.0, 0.0]
+
+
+class TestLanguageScorer:
+    def test_prose_scores_one(self):
+        assert LanguageScorer().score_batch([PROSE]) == [1.0]
+
+    def test_numbers_and_empty(self):
+        assert LanguageScorer().score_batch(["12 345 6789", ""]) == [0.0, 0.0]
+
+    def test_odd_word_lengths_penalized(self):
+        assert LanguageScorer().score_batch(["a b c d e"]) == [0.5]
+
+
+class TestNgramPerplexityScorer:
+    @pytest.fixture
+    def scorer(self):
+        return NgramPerplexityScorer([PROSE, "The lazy dog sleeps by the river all day long."])
+
+    def test_reference_like_text_scores_higher(self, scorer):
+        natural, noise = scorer.score_batch(["The dog jumps over the fox.", "zqxj vkwp qqqz"])
+        assert natural > noise
+        assert 0.0 < noise < natural <= 1.0
+
+    def test_perplexity_of_empty_text(self, scorer):
+        assert scorer.perplexity("") == 1.0
+
+    def test_empty_reference(self):
+        with pytest.raises(ValueError):
+            NgramPerplexityScorer([""])
+
+
+class TestRegistry:
+    def test_builtin_scorers(self):
+        assert set(SCORERS) == {"length", "repetition", "entropy", "language"}
+        assert isinstance(create_scorer("entropy"), CharacterEntropyScorer)
+
+    def test_unknown_scorer(self):
+        with pytest.raises(ValueError, match="Unknown scorer"):
+            create_scorer("missing")
+
+    def test_register(self, monkeypatch):
+        monkeypatch.setitem(SCORERS, "length", SCORERS["length"])
+        register_scorer("constant", lambda: _RecordingScorer("constant", 0.0, lambda t: 0.5))
+        try:
+            assert create_scorer("constant").score_batch(["a"]) == [0.5]
+            with pytest.raises(ValueError, match="already registered"):
+                register_scorer("constant", LengthScorer)
+        finally:
+            del SCORERS["constant"]
+
+
+class TestScoringEngine:
+    def test_default_is_length(self):
+        assert ScoringEngine().score_batch(["x" * 250]) == [0.5]
+
+    def test_orders_by_cost(self):
+        expensive = _RecordingScorer("expensive", 10.0, lambda t: 1.0)
+        cheap = _RecordingScorer("cheap", 1.0, lambda t: 1.0)
+        engine = ScoringEngine([expensive, cheap])
+        assert engine.scorers == [cheap, expensive]
+
+    def test_combines_by_product(self):
+        engine = ScoringEngine(
+            [
+                _RecordingScorer("a", 1.0, lambda t: 0.5),
+                _RecordingScorer("b", 2.0, lambda t: 0.5),
+            ]
+        )
+        assert engine.score_batch(["x"]) == [0.25]
+
+    def test_rejected_texts_skip_expensive_scorers(self):
+        cheap = _RecordingScorer("cheap", 1.0, lambda t: 0.1 if t == "bad" else 1.0)
+        expensive = _RecordingScorer("expensive", 10.0, lambda t: 0.9)
+        engine = ScoringEngine([expensive, cheap], floor=0.5)
+        assert engine.score_batch(["good", "bad", "fine"]) == [0.9, None, 0.9]
+        assert cheap.seen == [["good", "bad", "fine"]]
+        assert expensive.seen == [["good", "fine"]]
+
+    def test_all_rejected_stops_early(self):
+        expensive = _RecordingScorer("expensive", 10.0, lambda t: 1.0)
+        engine = ScoringEngine([LengthScorer(), expensive], floor=0.5)
+        assert engine.score_batch(["short"]) == [None]
+        assert expensive.seen == []
+
+    @pytest.mark.parametrize("floor", [-0.1, 1.5])
+    def test_invalid_floor(self, floor):
+        with pytest.raises(ValueError):
+            ScoringEngine(floor=floor)
+
+    def test_no_scorers(self):
+        with pytest.raises(ValueError):
+            ScoringEngine([])
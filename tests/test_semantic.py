@@ -0,0 +1,152 @@
+"""Tests for dataset_curator.semantic."""
+
+import pytest
+
+from dataset_curator import semantic
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import ChatMessage, TrainingExample
+from dataset_curator.semantic import HashingVectorizer, SemanticIndex
+
+np = pytest.importorskip("numpy")
+
+
+def _make_example(content: str) -> TrainingExample:
+    return TrainingExample(messages=[ChatMessage(role="user", content=content)])
+
+
+class TestHashingVectorizer:
+    def test_shape_and_unit_norm(self):
+        vectors = HashingVectorizer(dim=64)(["hello world", "another text here"])
+        assert vectors.shape == (2, 64)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+
+    def test_deterministic(self):
+        texts = ["the same text"]
+        assert np.array_equal(HashingVectorizer()(texts), HashingVectorizer()(texts))
+
+    def test_word_order_does_not_matter(self):
+        a, b = HashingVectorizer()(["reverse a list in python", "in python reverse a list"])
+        assert a @ b == pytest.approx(1.0)
+
+    def test_empty_text_is_zero_vector(self):
+        assert not HashingVectorizer()(["  !!  "]).any()
+
+    def test_rejects_invalid_dim(self):
+        with pytest.raises(ValueError):
+            HashingVectorizer(dim=0)
+
+
+class TestSemanticIndex:
+    def test_finds_paraphrase(self):
+        index = SemanticIndex()
+        index.add("how do i reverse a list in python?")
+        assert index.find_match("in python, how do i reverse a list", 0.95, pytest.fail)
+        assert list(index.candidates("in python, how do i reverse a list")) == [
+            "how do i reverse a list in python?"
+        ]
+
+    def test_unrelated_text_is_not_a_match(self):
+        index = SemanticIndex()
+        index.add("how do i reverse a list in python?")
+        assert not index.find_match("what is the capital of france", 0.95, pytest.fail)
+
+    def test_empty_index(self):
+        assert not SemanticIndex().find_match("anything", 0.95, pytest.fail)
+
+    def test_find_duplicate_returns_closest_text(self):
+        index = SemanticIndex()
+        index.add("what is the capital of france")
+        index.add("how do i reverse a list in python?")
+        match = index.find_duplicate("in python, how do i reverse a list", 0.95, pytest.fail)
+        assert match == "how do i reverse a list in python?"
+
+    def test_custom_embedder(self):
+        def embedder(texts):
+            return np.array([[1.0, 0.0] if "cat" in t else [0.0, 1.0] for t in texts])
+
+        index = SemanticIndex(embedder=embedder, threshold=0.99)
+        index.add("a cat sat")
+        assert index.find_match("the cat ran", 0.95, pytest.fail)
+        assert not index.find_match("a dog sat", 0.95, pytest.fail)
+
+    def test_grows_past_initial_capacity(self, monkeypatch):
+        monkeypatch.setattr(semantic, "INITIAL_CAPACITY", 2)
+        index = SemanticIndex()
+        texts = [f"document number {word}" for word in ("alpha", "beta", "gamma", "delta")]
+        for text in texts:
+            index.add(text)
+        assert index.find_match("number delta document", 0.95, pytest.fail)
+
+    def test_lookup_only_scores_bucket_neighbors(self):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((2000, 32))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        lookup = {f"t{i}": v for i, v in enumerate(vectors)}
+        index = SemanticIndex(embedder=lambda texts: np.array([lookup[t] for t in texts]))
+        for key in lookup:
+            index.add(key)
+        positions, _ = index._neighbors("t0")
+        assert 0 in positions
+        assert len(positions) < len(lookup) // 4
+
+    def test_prepare_embeds_batch_in_one_call(self):
+        batches = []
+        embedder = HashingVectorizer()
+
+        def recording(texts):
+            batches.append(list(texts))
+            return embedder(texts)
+
+        texts = ["how do i reverse a list in python?", "what is the capital of france"]
+        index = SemanticIndex(embedder=recording)
+        index.prepare([*texts, texts[0]])
+        for text in texts:
+            if not index.find_match(text, 0.95, pytest.fail):
+                index.add(text)
+        assert batches == [texts]
+        assert list(index.texts) == texts
+
+    def test_prepared_lookup_matches_unprepared(self):
+        texts = ["how do i reverse a list in python?", "in python, how do i reverse a list"]
+        prepared, plain = SemanticIndex(), SemanticIndex()
+        prepared.prepare(texts)
+        for index in (prepared, plain):
+            index.add(texts[0])
+        assert prepared._embedded[texts[0]][1] == plain._embed(texts[0])[1]
+        assert prepared.find_duplicate(texts[1], 0.95, pytest.fail) == texts[0]
+
+    def test_find_duplicate_counts_scored_candidates(self):
+        index = SemanticIndex()
+        index.add("how do i reverse a list in python?")
+        index.find_duplicate("in python, how do i reverse a list", 0.95, pytest.fail)
+        assert index.scored == 1
+
+    def test_rejects_invalid_tables(self):
+        with pytest.raises(ValueError):
+            SemanticIndex(tables=0)
+
+    def test_requires_numpy(self, monkeypatch):
+        monkeypatch.setattr(semantic, "np", None)
+        with pytest.raises(ImportError, match="semantic"):
+            SemanticIndex()
+
+
+class TestDeduplicatorWithSemanticIndex:
+    def test_removes_paraphrased_duplicates(self):
+        contents = [
+            "How do I reverse a list in Python?",
+            "In Python, how do I reverse a list?",
+            "What is the capital of France?",
+        ]
+        examples = [_make_example(c) for c in contents]
+        unique, removed = Deduplicator(index_factory=SemanticIndex).deduplicate(examples)
+        assert removed == 1
+        assert [e.messages[0].content for e in unique] == [contents[0], contents[2]]
+        # Character-level similarity keeps the paraphrase
+        assert Deduplicator().deduplicate(examples)[1] == 0
+
+    def test_session_counts_cosine_comparisons(self):
+        session = Deduplicator(index_factory=SemanticIndex).session()
+        session.check_text("how do i reverse a list in python?")
+        assert session.check_text("in python, how do i reverse a list") is False
+        assert session.comparisons == 1
@@ -0,0 +1,199 @@
+"""Tests for dataset_curator.similarity."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import ChatMessage, TrainingExample
+from dataset_curator.similarity import (
+    DEFAULT_NGRAM_SIZE,
+    ExhaustiveIndex,
+    MinHashLSHIndex,
+    PrefilterIndex,
+)
+
+
+def _make_example(content: str) -> TrainingExample:
+    return TrainingExample(messages=[ChatMessage(role="user", content=content)])
+
+
+@pytest.fixture
+def lsh():
+    return MinHashLSHIndex()
+
+
+class TestExhaustiveIndex:
+    def test_returns_all_texts_in_order(self):
+        index = ExhaustiveIndex()
+        index.add("first")
+        index.add("second")
+        assert list(index.candidates("anything")) == ["first", "second"]
+
+    def test_find_match_uses_threshold(self):
+        index = ExhaustiveIndex()
+        index.add("hello")
+        assert index.find_match("hello", 0.95, lambda a, b: 1.0) is True
+        assert index.find_match("hello", 0.95, lambda a, b: 0.5) is False
+
+    def test_find_duplicate_returns_first_match(self):
+        index = ExhaustiveIndex()
+        index.add("first")
+        index.add("second")
+        assert index.find_duplicate("x", 0.95, lambda a, b: float(b == "second")) == "second"
+        assert index.find_duplicate("x", 0.95, lambda a, b: 0.0) is None
+
+
+def _ratio(a: str, b: str) -> float:
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _random_texts(count: int, seed: int = 0) -> list[str]:
+    """Random texts of mixed lengths, many of them edited copies of earlier ones."""
+    rng = random.Random(seed)
+    words = ["data", "model", "the", "python", "learning", "of", "a", "value", "é", "数据"]
+    texts: list[str] = []
+    for _ in range(count):
+        if texts and rng.random() < 0.5:
+            text = list(rng.choice(texts))
+            for _ in range(rng.randrange(4)):
+                if text:
+                    text[rng.randrange(len(text))] = rng.choice("abcxyz ")
+            texts.append("".join(text) + rng.choice(["", "!", " again"]))
+        else:
+            length = rng.choice([1, 3, 20, 60])
+            texts.append(" ".join(rng.choice(words) for _ in range(length)))
+    return texts
+
+
+class TestPrefilterIndex:
+    @pytest.mark.parametrize("ngram_size", [None, 4, DEFAULT_NGRAM_SIZE])
+    @pytest.mark.parametrize("threshold", [0.0, 0.3, 0.6, 0.8, 0.9, 0.95, 0.99, 1.0, 1.5])
+    def test_matches_exhaustive(self, threshold, ngram_size):
+        prefilter, exhaustive = PrefilterIndex(ngram_size), ExhaustiveIndex()
+        for text in _random_texts(80, seed=int(threshold * 100)):
+            expected = exhaustive.find_match(text, threshold, _ratio)
+            assert prefilter.find_match(text, threshold, _ratio) is expected
+            if not expected:
+                exhaustive.add(text)
+                prefilter.add(text)
+        assert list(prefilter.texts) == list(exhaustive.texts)
+
+    def test_find_duplicate_returns_matched_text(self):
+        index = PrefilterIndex()
+        index.add("what is python programming")
+        index.add("how do i bake bread")
+        match = index.find_duplicate("what is python programmin", 0.9, _ratio)
+        assert match == "what is python programming"
+        assert index.find_duplicate("an unrelated question", 0.9, _ratio) is None
+
+    def test_small_ngram_size(self):
+        prefilter, exhaustive = PrefilterIndex(ngram_size=2), ExhaustiveIndex()
+        for text in _random_texts(100, seed=7):
+            assert prefilter.find_match(text, 0.9, _ratio) is exhaustive.find_match(
+                text, 0.9, _ratio
+            )
+            prefilter.add(text)
+            exhaustive.add(text)
+
+    def test_prunes_comparisons(self):
+        calls = []
+
+        def counting(a, b):
+            calls.append((a, b))
+            return _ratio(a, b)
+
+        index = PrefilterIndex()
+        index.add("what is python programming?")
+        index.add("explain quantum computing in simple terms")
+        index.add("a" * 200)
+        assert index.find_match("what is python programming", 0.95, counting) is True
+        assert calls == [("what is python programming", "what is python programming?")]
+
+    def test_empty_texts(self):
+        index = PrefilterIndex()
+        assert index.find_match("", 0.95, _ratio) is False
+        index.add("")
+        assert index.find_match("", 0.95, _ratio) is True
+        assert index.find_match("x", 0.95, _ratio) is False
+
+    def test_ngram_postings_are_opt_in(self):
+        default, ngram = PrefilterIndex(), PrefilterIndex(ngram_size=4)
+        for text in _random_texts(20, seed=5):
+            default.add(text)
+            ngram.add(text)
+        assert not default._postings
+        assert not default._lengths
+        assert ngram._postings
+        assert all(isinstance(key, int) for key in ngram._postings)
+
+    def test_rejects_invalid_ngram_size(self):
+        with pytest.raises(ValueError):
+            PrefilterIndex(ngram_size=0)
+
+    def test_deduplicator_default_matches_exhaustive(self):
+        examples = [_make_example(text) for text in _random_texts(120, seed=3)]
+        expected = Deduplicator(index_factory=ExhaustiveIndex).deduplicate(examples)
+        assert Deduplicator().deduplicate(examples) == expected
+
+
+class TestMinHashLSHIndex:
+    def test_signature_is_deterministic(self, lsh):
+        other = MinHashLSHIndex()
+        assert lsh.signature("some text to hash") == other.signature("some text to hash")
+
+    def test_signature_length(self, lsh):
+        assert len(lsh.signature("abcdefghij")) == lsh.num_perm
+
+    def test_primed_sketch_replaces_signature(self, lsh, monkeypatch):
+        sketch = MinHashLSHIndex().sketch("what is python programming?")
+        lsh.add("what is python programming?")
+        monkeypatch.setattr(lsh, "signature", lambda text: pytest.fail("signature computed"))
+        lsh.prime("what is python programming", sketch)
+        assert list(lsh.candidates("what is python programming")) == [
+            "what is python programming?"
+        ]
+
+    def test_sketch_is_empty_for_other_indexes(self):
+        assert PrefilterIndex().sketch("some text") == b""
+
+    def test_identical_text_is_candidate(self, lsh):
+        lsh.add("what is python programming?")
+        assert list(lsh.candidates("what is python programming?")) == [
+            "what is python programming?"
+        ]
+
+    def test_near_duplicate_is_candidate(self, lsh):
+        lsh.add("explain the difference between a list and a tuple in python")
+        assert lsh.candidates("explain the difference between a list and a tuple in python!")
+
+    def test_unrelated_text_is_not_candidate(self, lsh):
+        lsh.add("what is python programming?")
+        assert list(lsh.candidates("describe the water cycle to a child")) == []
+
+    def test_short_text(self, lsh):
+        lsh.add("hi")
+        assert list(lsh.candidates("hi")) == ["hi"]
+
+    def test_bands_must_divide_num_perm(self):
+        with pytest.raises(ValueError):
+            MinHashLSHIndex(num_perm=10, bands=3)
+
+
+class TestDeduplicatorWithLSH:
+    def test_matches_exhaustive_results(self):
+        contents = [
+            "What is Python programming?",
+            "What is Python programming",
+            "Explain quantum computing",
+            "Explain quantum computing.",
+            "How does a car engine work?",
+        ]
+        examples = [_make_example(c) for c in contents]
+        exhaustive = Deduplicator(threshold=0.95)
+        minhash = Deduplicator(threshold=0.95, index_factory=MinHashLSHIndex)
+        expected, expected_removed = exhaustive.deduplicate(examples)
+        unique, removed = minhash.deduplicate(examples)
+        assert unique == expected
+        assert removed == expected_removed == 2
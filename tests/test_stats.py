@@ -0,0 +1,104 @@
+"""Tests for dataset_curator.stats."""
+
+from array import array
+
+from dataset_curator.deduplicator import Deduplicator
+from dataset_curator.models import ChatMessage, DatasetStats, TrainingExample
+from dataset_curator.records import RecordBatch
+from dataset_curator.stats import StatsAccumulator
+
+
+def _make_example(content: str, source: str, score: float) -> TrainingExample:
+    return TrainingExample(
+        messages=[ChatMessage(role="user", content=content)],
+        source=source,
+        quality_score=score,
+    )
+
+
+class TestStatsAccumulator:
+    def test_empty(self):
+        stats = StatsAccumulator().to_stats()
+        assert stats.total_examples == 0
+        assert stats.avg_quality == 0.0
+        assert stats.sources == {}
+        assert stats.duplicates_removed == 0
+
+    def test_counts_examples(self):
+        acc = StatsAccumulator()
+        acc.add(_make_example("a", "wiki", 0.5))
+        acc.add(_make_example("b", "wiki", 1.0))
+        acc.add(_make_example("c", "api", 0.0))
+        stats = acc.to_stats()
+        assert stats.total_examples == 3
+        assert stats.avg_quality == 0.5
+        assert stats.sources == {"wiki": 2, "api": 1}
+
+    def test_rounds_average(self):
+        acc = StatsAccumulator()
+        for score in (0.1, 0.2, 0.2):
+            acc.add(_make_example("x", "s", score))
+        assert acc.to_stats().avg_quality == 0.1667
+
+    def test_add_batch_matches_add(self):
+        batch = RecordBatch(
+            sources=["wiki", "api", "wiki"],
+            contents=["a", "b", "c"],
+            scores=array("d", [0.1, 0.7, 0.3]),
+        )
+        by_row = StatsAccumulator()
+        for record in batch.records():
+            by_row.add(record)
+        by_batch = StatsAccumulator()
+        by_batch.add_batch(batch)
+        assert by_batch.quality_sum == by_row.quality_sum
+        assert by_batch.to_stats() == by_row.to_stats()
+
+    def test_records_duplicates(self):
+        session = Deduplicator().session()
+        for text in ("hello world", "hello world", "hello world!"):
+            session.check_text(text)
+        acc = StatsAccumulator()
+        acc.record_duplicates(session)
+        stats = acc.to_stats()
+        assert stats.exact_duplicates_removed == 1
+        assert stats.near_duplicates_removed == 1
+        assert stats.duplicates_removed == 2
+
+    def test_merge_adds_datasets(self):
+        acc = StatsAccumulator()
+        acc.add(_make_example("a", "wiki", 1.0))
+        acc.merge(
+            DatasetStats(
+                total_examples=3,
+                avg_quality=0.5,
+                sources={"wiki": 1, "api": 2},
+                duplicates_removed=3,
+                exact_duplicates_removed=1,
+                near_duplicates_removed=2,
+            )
+        )
+        stats = acc.to_stats()
+        assert stats.total_examples == 4
+        assert stats.avg_quality == 0.625
+        assert stats.sources == {"wiki": 2, "api": 2}
+        assert stats.exact_duplicates_removed == 1
+        assert stats.near_duplicates_removed == 2
+
+    def test_merge_keeps_largest_false_drop_rate(self):
+        acc = StatsAccumulator()
+        for rate in (0.01, 0.03, 0.02):
+            acc.merge(
+                DatasetStats(
+                    total_examples=1, avg_quality=1.0, sources={}, estimated_false_drop_rate=rate
+                )
+            )
+        assert acc.to_stats().estimated_false_drop_rate == 0.03
+
+    def test_records_false_drop_rate(self):
+        session = Deduplicator(bloom_capacity=5, bloom_error_rate=0.2).session()
+        for i in range(20):
+            session.check_text(f"text {i}")
+        acc = StatsAccumulator()
+        acc.record_duplicates(session)
+        assert acc.to_stats().estimated_false_drop_rate == session.estimated_false_drop_rate > 0